@@ -1,12 +1,47 @@
-from app import create_app, socketio
-import archive.socket_events  # This is important to register the event handlers
+import os
 
-app = create_app()
+# "development" runs the threaded Werkzeug server with debug and packet logging;
+# "production" runs on a green-thread worker (gevent or eventlet) with packet logging off.
+# BINGO_ASYNC_MODE forces a worker type ("threading", "gevent" or "eventlet").
+SERVER_MODE = os.getenv("BINGO_SERVER_MODE", "development")
+ASYNC_MODE = os.getenv("BINGO_ASYNC_MODE", "auto" if SERVER_MODE == "production" else "threading")
+# Green-thread servers must patch the standard library before anything else is imported
+if ASYNC_MODE in ("auto", "gevent"):
+    try:
+        from gevent import monkey
 
-# Print all registered routes for debugging
-with app.app_context():
+        monkey.patch_all()
+        ASYNC_MODE = "gevent"
+    except ImportError:
+        ASYNC_MODE = "auto" if ASYNC_MODE == "auto" else "threading"
+if ASYNC_MODE in ("auto", "eventlet"):
+    try:
+        import eventlet
+
+        eventlet.monkey_patch()
+        ASYNC_MODE = "eventlet"
+    except ImportError:
+        ASYNC_MODE = "threading"
+
+from app import create_app
+from app.socket_handler import socketio
+
+try:
+    import archive.socket_events  # This is important to register the event handlers
+except ImportError:
+    pass  # Handlers live in app/socket_handler.py; the archive module is optional
+
+app = create_app(server_mode=SERVER_MODE, async_mode=ASYNC_MODE)
+
+# Print all registered routes for debugging (BINGO_PRINT_ROUTES=1)
+if os.getenv("BINGO_PRINT_ROUTES") == "1":
     for rule in app.url_map.iter_rules():
         print(f"{rule.endpoint}: {rule.rule}")
 
 if __name__ == "__main__":
-    socketio.run(app, host="0.0.0.0", port=1313, debug=True)
+    host = os.getenv("BINGO_HOST", "0.0.0.0")
+    port = int(os.getenv("BINGO_PORT", "1313"))
+    if SERVER_MODE == "production":
+        socketio.run(app, host=host, port=port, debug=False, allow_unsafe_werkzeug=ASYNC_MODE == "threading")
+    else:
+        socketio.run(app, host=host, port=port, debug=True, allow_unsafe_werkzeug=True)
@@ -1,46 +1,63 @@
-from flask import Flask
-from flask_cors import CORS
-from dotenv import load_dotenv
 import os
-import logging
-from logging.handlers import RotatingFileHandler
-from app.routes import register_blueprints
-from app.socket_handler import socketio, init_socketio
 
 
-def create_app():
-    """Create and configure the Flask application."""
+def create_app(server_mode="development", async_mode="threading"):
+    """Create and configure the Flask application.
+
+    In "production" mode Socket.IO runs on ``async_mode`` (normally gevent or
+    eventlet) with per-packet logging switched off. Flask and the blueprints
+    are imported here, not when the package is, so tools such as
+    ``python -m app.batch`` can use the game modules without the web stack.
+    """
+    from flask import Flask
+    from flask_cors import CORS
+    from dotenv import load_dotenv
+    from app.routes import register_blueprints, init_request_logging
+    from app.socket_handler import init_socketio
+    from app.autosave import checkpointer
+    from app.sound_library import sound_library
+    from app.warmup import start_warm_up
+    from app.metrics_routes import init_request_metrics
+    from app.log_pipeline import configure_logging
+    from app.json_codec import init_compression
+    from app.json_provider import CompactJSONProvider
+    from app.static_assets import static_assets
+
     load_dotenv()
 
-    app = Flask(__name__, static_folder="../static", template_folder="../templates")
+    app = Flask(__name__, static_folder=None, template_folder="../templates")
     app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "fallback_secret_key")
     CORS(app)
+    # jsonify and request.get_json use the compact (orjson when installed) encoder
+    app.json = CompactJSONProvider(app)
+
+    # Records go through a queue to a background writer (logs/music_bingo.log)
+    configure_logging(server_mode)
+    app.logger.info("Music Bingo startup")
 
-    # Configure logging
-    if not app.debug:
-        if not os.path.exists("logs"):
-            os.makedirs("logs")
-        file_handler = RotatingFileHandler(
-            "logs/music_bingo.log", maxBytes=10240, backupCount=10
-        )
-        file_handler.setFormatter(
-            logging.Formatter(
-                "%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]"
-            )
-        )
-        file_handler.setLevel(logging.INFO)
-        app.logger.addHandler(file_handler)
-        app.logger.setLevel(logging.INFO)
-        app.logger.info("Music Bingo startup")
-
-        # Add debug logging if needed
-        app.logger.setLevel(logging.DEBUG)
-        app.logger.debug("Application started in debug mode.")
+    # Outside production, edits to static files are picked up without a restart
+    static_assets.reload = server_mode != "production"
 
     # Register all blueprints via centralized registration
     register_blueprints(app)
 
+    # Per-route latency and status counts for /metrics
+    init_request_metrics(app)
+    # One structured access record per request; sampled headers and bodies at DEBUG
+    init_request_logging(app)
+    # gzip/brotli for JSON and text responses above COMPRESSION_THRESHOLD
+    init_compression(app)
+
     # Initialize SocketIO with the app
-    init_socketio(app)
+    init_socketio(app, async_mode=async_mode, packet_logging=server_mode != "production")
+
+    # Periodic autosave checkpoints (AUTOSAVE_INTERVAL=0 turns them off)
+    checkpointer.start()
+
+    # Watch the sounds directory for changes
+    sound_library.start()
+
+    # Load the state and prime caches in the background so the first requests are fast
+    start_warm_up(app)
 
     return app
@@ -0,0 +1,48 @@
+import hmac
+import os
+from flask import Blueprint, jsonify, request, current_app
+from app.helpers import handle_error
+from app.profiler import profiler, MAX_PROFILE_SECONDS, DEFAULT_INTERVAL_MS, MIN_INTERVAL_MS
+
+bp = Blueprint("admin", __name__)
+
+# Admin endpoints need this token in the X-Admin-Token header; without one they only answer direct localhost requests
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+LOCAL_ADDRESSES = ("127.0.0.1", "::1")
+# Set by a reverse proxy; behind one every request comes from localhost
+FORWARDED_HEADERS = ("Forwarded", "X-Forwarded-For", "X-Real-IP")
+
+
+@bp.before_request
+def require_admin():
+    if ADMIN_TOKEN:
+        if not hmac.compare_digest(request.headers.get("X-Admin-Token", "").encode(), ADMIN_TOKEN.encode()):
+            return jsonify({"error": "Admin token required"}), 403
+    elif request.remote_addr not in LOCAL_ADDRESSES or any(h in request.headers for h in FORWARDED_HEADERS):
+        return jsonify({"error": "Admin endpoints are only available locally unless ADMIN_TOKEN is set"}), 403
+
+
+@bp.route("/api/profile", methods=["POST"])
+def api_profile():
+    """Sample all thread stacks for ``seconds`` and return them as folded stacks for a flamegraph.
+
+    ``interval`` is the sampling interval in milliseconds. The request
+    returns once sampling is done; pipe the body into flamegraph.pl or open
+    it in speedscope.
+    """
+    try:
+        seconds = request.args.get("seconds", 10, type=float)
+        interval = request.args.get("interval", DEFAULT_INTERVAL_MS, type=float)
+        if not 0 < seconds <= MAX_PROFILE_SECONDS:
+            return jsonify({"error": f"seconds must be between 0 and {MAX_PROFILE_SECONDS}"}), 400
+        if interval < MIN_INTERVAL_MS:
+            return jsonify({"error": f"interval must be at least {MIN_INTERVAL_MS} ms"}), 400
+        current_app.logger.info(f"Profiling for {seconds}s every {interval}ms")
+        result = profiler.profile(seconds, interval)
+        if result is None:
+            return jsonify({"error": "A profile is already running"}), 409
+        response = current_app.response_class(profiler.folded(result["stacks"]), mimetype="text/plain")
+        response.headers["X-Profile-Samples"] = str(result["samples"])
+        return response
+    except Exception as e:
+        return handle_error(e)
@@ -1,6 +1,5 @@
 from flask import Blueprint, session, redirect, url_for, request, current_app
-from spotipy.oauth2 import SpotifyOAuth
-import os
+from app.spotify import get_spotify_oauth
 
 bp = Blueprint("auth", __name__)
 
@@ -17,14 +16,7 @@ def home():
 
 @bp.route("/login")
 def login():
-    sp_oauth = SpotifyOAuth(
-        client_id=os.getenv("SPOTIFY_CLIENT_ID"),
-        client_secret=os.getenv("SPOTIFY_CLIENT_SECRET"),
-        redirect_uri=os.getenv(
-            "SPOTIFY_REDIRECT_URI", "http://localhost:1313/auth/callback"
-        ),
-        scope="playlist-read-private user-read-playback-state user-modify-playback-state user-read-currently-playing",
-    )
+    sp_oauth = get_spotify_oauth()
     auth_url = sp_oauth.get_authorize_url()
     current_app.logger.info(f"Spotify OAuth URL: {auth_url}")
     return redirect(auth_url)
@@ -40,14 +32,7 @@ def callback():
         return f"<h1>Spotify Authentication Failed</h1><p>Error: {error}</p>", 400
 
     if code:
-        sp_oauth = SpotifyOAuth(
-            client_id=os.getenv("SPOTIFY_CLIENT_ID"),
-            client_secret=os.getenv("SPOTIFY_CLIENT_SECRET"),
-            redirect_uri=os.getenv(
-                "SPOTIFY_REDIRECT_URI", "http://localhost:1313/auth/callback"
-            ),
-            scope="playlist-read-private user-read-playback-state user-modify-playback-state user-read-currently-playing",
-        )
+        sp_oauth = get_spotify_oauth()
         try:
             token_info = sp_oauth.get_access_token(code)
             session["token_info"] = token_info
@@ -0,0 +1,116 @@
+import logging
+import os
+import time
+from datetime import datetime
+from threading import Event, Lock, Thread
+from app.state import game_state
+from app.saved_games import SavedGameStore, SAVED_GAMES_DIR
+
+# Write a checkpoint after this many plays...
+AUTOSAVE_EVERY_PLAYS = int(os.getenv("AUTOSAVE_EVERY_PLAYS", "5"))
+# ...or this many seconds after the last one if anything changed; 0 turns autosave off
+AUTOSAVE_INTERVAL = float(os.getenv("AUTOSAVE_INTERVAL", "60"))
+# Retention: every checkpoint among the newest KEEP_RECENT, then one per hour for KEEP_HOURS hours
+CHECKPOINT_KEEP_RECENT = int(os.getenv("CHECKPOINT_KEEP_RECENT", "10"))
+CHECKPOINT_KEEP_HOURS = int(os.getenv("CHECKPOINT_KEEP_HOURS", "24"))
+CHECKPOINT_DIR = os.path.join(SAVED_GAMES_DIR, "checkpoints")
+
+logger = logging.getLogger(__name__)
+
+
+def checkpoints_to_drop(checkpoints, now, keep_recent=CHECKPOINT_KEEP_RECENT, keep_hours=CHECKPOINT_KEEP_HOURS):
+    """File names to delete from ``checkpoints`` (newest first) under the retention policy."""
+    drop, hours_kept = [], set()
+    for checkpoint in checkpoints[keep_recent:]:
+        taken = datetime.fromisoformat(checkpoint["timestamp"])
+        age_hours = int((now - taken).total_seconds() // 3600)
+        hour = taken.strftime("%Y%m%d%H")
+        if age_hours < keep_hours and hour not in hours_kept:
+            hours_kept.add(hour)
+        else:
+            drop.append(checkpoint["filename"])
+    return drop
+
+
+class Checkpointer:
+    """Writes autosave checkpoints from a background thread.
+
+    The thread sleeps on the state's version condition and wakes when the
+    state changes or the interval runs out. A checkpoint copies the state
+    under the lock; compressing and writing it happen after the lock is
+    released, so plays are never held up by disk I/O.
+    """
+
+    def __init__(self, directory=CHECKPOINT_DIR, every_plays=AUTOSAVE_EVERY_PLAYS, interval=AUTOSAVE_INTERVAL):
+        self.store = SavedGameStore(directory)
+        self.every_plays = every_plays
+        self.interval = interval
+        self.saved_version = None
+        self.saved_plays = 0
+        self.saved_at = time.monotonic()
+        self.stop_event = Event()
+        self.lock = Lock()
+        self.thread = None
+
+    def start(self):
+        with self.lock:
+            if self.thread is None and self.interval > 0:
+                self.thread = Thread(target=self._run, name="bingo-autosave", daemon=True)
+                self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _run(self):
+        # Read here rather than in start() so the saved state is not loaded on the startup path
+        self.saved_version = game_state.version
+        self.saved_plays = game_state.read_state(lambda state: len(state.get("played_tracks", [])))
+        seen_version = self.saved_version
+        while not self.stop_event.is_set():
+            remaining = max(0.1, self.interval - (time.monotonic() - self.saved_at))
+            seen_version = game_state.wait_for_change(seen_version, remaining)
+            if seen_version == self.saved_version:
+                self.saved_at = time.monotonic()
+                continue
+            plays = game_state.read_state(lambda state: len(state.get("played_tracks", [])))
+            due = time.monotonic() - self.saved_at >= self.interval
+            if due or abs(plays - self.saved_plays) >= self.every_plays:
+                try:
+                    self.checkpoint()
+                except Exception:
+                    logger.exception("Error writing autosave checkpoint")
+
+    def checkpoint(self):
+        """Write a checkpoint of the current state now; returns its file name."""
+        with self.lock:
+            snapshot = game_state.get_state()
+            plays = len(snapshot.get("played_tracks", []))
+            now = datetime.now()
+            filename = self.store.save(
+                "Checkpoint",
+                f"{plays} tracks played, {len(snapshot.get('cards', {}))} cards",
+                snapshot,
+                filename=f"checkpoint_{now.strftime('%Y%m%d_%H%M%S_%f')}.bingo",
+            )
+            self.saved_version = snapshot.get("version")
+            self.saved_plays = plays
+            self.saved_at = time.monotonic()
+            drop = checkpoints_to_drop(self.store.list_games(), now)
+            if drop:
+                self.store.delete(drop)
+            return filename
+
+    def list_checkpoints(self):
+        return self.store.list_games()
+
+    def load(self, filename=None):
+        """Header and state of a checkpoint (the newest by default), or None."""
+        if filename is None:
+            checkpoints = self.store.list_games()
+            if not checkpoints:
+                return None
+            filename = checkpoints[0]["filename"]
+        return self.store.load(filename)
+
+
+checkpointer = Checkpointer()
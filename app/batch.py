@@ -0,0 +1,177 @@
+"""Generate a card set and its print files without the web server.
+
+    python -m app.batch tracks.json --cards 400 --name "Kerstborrel" --output-dir print/kerst
+    python -m app.batch playlist_export.json --cards 900 --cards-per-file 50 --base-url https://bingo.example.com
+
+The track file is a JSON list of tracks (``id``, ``name``, ``artist``), an
+object with that list under ``tracks``, a cached Spotify playlist export
+(playlist items, or pages of them, as the playlist API returns them), or a
+game state, whose played and unplayed tracks are used. Tracks and cards are
+drawn with the same rules as the dashboard. The PDFs are rendered in
+parallel, one file per ``--cards-per-file`` cards, and the game is written
+as a saved game that *Load* under Game Management restores. No Spotify
+login, session or running server is needed.
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.json_codec import load_file
+from app.saved_games import SAVED_GAMES_DIR, SavedGameStore
+from app.tracks import track_from_playlist_item
+from app.utils import DEFAULT_GAME_STATE, GAME_TRACKS, MAX_CARDS, build_cards, select_game_tracks
+
+# Cards per PDF file; smaller files spread better over the workers
+CARDS_PER_FILE = 50
+
+
+def playlist_entries(data):
+    """The track-like entries of any supported track file, in order."""
+    if isinstance(data, dict):
+        if "unplayed_tracks" in data or "played_tracks" in data:
+            return data.get("played_tracks", []) + data.get("unplayed_tracks", [])
+        # A Spotify playlist object nests its first page of items under "tracks"
+        return playlist_entries(data.get("tracks", data.get("items", [])))
+    entries = []
+    for entry in data:
+        if "items" in entry:
+            entries.extend(entry["items"])
+        else:
+            entries.append(entry)
+    return entries
+
+
+def read_tracks(path):
+    """Tracks from a track file, without duplicates."""
+    tracks, seen = [], set()
+    for entry in playlist_entries(load_file(path)):
+        track = track_from_playlist_item(entry) if "track" in entry else entry
+        if track is None or track.get("id") in seen:
+            continue
+        if not all(track.get(field) is not None for field in ("id", "name", "artist")):
+            raise ValueError(f"{path}: tracks need an id, name and artist, got {entry!r}")
+        seen.add(track["id"])
+        tracks.append({"id": track["id"], "name": track["name"], "artist": track["artist"]})
+    return tracks
+
+
+def build_game(tracks, num_cards, name, num_game_tracks=GAME_TRACKS, rng=random):
+    """A fresh game state with cards, as the dashboard builds it from a playlist."""
+    selected = select_game_tracks(tracks, num_game_tracks, rng=rng)
+    if len(selected) < 25:
+        raise ValueError(f"A card needs 25 tracks, the file has {len(selected)}")
+    state = copy.deepcopy(DEFAULT_GAME_STATE)
+    # Restoring a save copies its fields over the live state; the live version number must keep counting
+    del state["version"]
+    state["unplayed_tracks"] = selected
+    state["current_playlist"] = name
+    state["num_tracks"] = len(selected)
+    state["cards"] = build_cards(selected, num_cards, rng=rng)
+    return state
+
+
+def split_cards(cards, cards_per_file):
+    """Cards in id order, cut into dicts of at most ``cards_per_file``."""
+    ids = sorted(cards, key=int)
+    return [
+        {card_id: cards[card_id] for card_id in ids[i:i + cards_per_file]}
+        for i in range(0, len(ids), cards_per_file)
+    ]
+
+
+def render_file(cards, path, view_url):
+    """Render one PDF file; runs in a worker process."""
+    from app.pdf_generator import generate_pdf
+
+    start = time.perf_counter()
+    data = generate_pdf(cards, view_url=view_url)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path, len(data), time.perf_counter() - start
+
+
+def render_pdfs(cards, output_dir, cards_per_file=CARDS_PER_FILE, workers=None, view_url=None):
+    """Render all cards into PDF files across ``workers`` processes; returns (path, bytes, seconds) per file."""
+    os.makedirs(output_dir, exist_ok=True)
+    chunks = split_cards(cards, cards_per_file)
+    paths = [
+        os.path.join(output_dir, f"cards_{min(chunk, key=int)}-{max(chunk, key=int)}.pdf")
+        for chunk in chunks
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    if workers <= 1:
+        return [render_file(chunk, path, view_url) for chunk, path in zip(chunks, paths)]
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(render_file, chunks, paths, [view_url] * len(chunks)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("tracks", help="track file: track list, playlist export or game state (JSON)")
+    parser.add_argument("--cards", type=int, required=True, help=f"number of cards, at most {MAX_CARDS}")
+    parser.add_argument("--name", default="Batch game", help="saved game name")
+    parser.add_argument("--description", default="")
+    parser.add_argument("--game-tracks", type=int, default=GAME_TRACKS, help="tracks drawn for the game")
+    parser.add_argument("--output-dir", default="print", help="directory for the PDF files")
+    parser.add_argument("--cards-per-file", type=int, default=CARDS_PER_FILE)
+    parser.add_argument("--workers", type=int, help="render processes (default: one per core)")
+    parser.add_argument("--saved-games-dir", default=SAVED_GAMES_DIR)
+    parser.add_argument("--base-url", default=os.getenv("PUBLIC_BASE_URL"),
+                        help="public server URL for the QR codes (default: PUBLIC_BASE_URL, none when unset)")
+    parser.add_argument("--seed", type=int, help="seed for reproducible cards")
+    parser.add_argument("--no-pdf", action="store_true", help="only write the saved game")
+    args = parser.parse_args()
+    if not 1 <= args.cards <= MAX_CARDS:
+        parser.error(f"--cards must be between 1 and {MAX_CARDS}")
+
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    tracks = read_tracks(args.tracks)
+    read_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        state = build_game(tracks, args.cards, args.name, args.game_tracks, rng=rng)
+    except ValueError as e:
+        print(f"{args.tracks}: {e}", file=sys.stderr)
+        sys.exit(1)
+    generate_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    filename = SavedGameStore(args.saved_games_dir).save(args.name, args.description, state)
+    save_seconds = time.perf_counter() - start
+    stats = {
+        "tracks_available": len(tracks),
+        "tracks_selected": state["num_tracks"],
+        "cards": len(state["cards"]),
+        "read_ms": round(read_seconds * 1000, 1),
+        "generate_ms": round(generate_seconds * 1000, 1),
+        "save_ms": round(save_seconds * 1000, 1),
+        "saved_game": os.path.join(args.saved_games_dir, filename),
+    }
+
+    if not args.no_pdf:
+        view_url = args.base_url.rstrip("/") + "/card/view/{card_id}" if args.base_url else None
+        start = time.perf_counter()
+        files = render_pdfs(state["cards"], args.output_dir, args.cards_per_file, args.workers, view_url)
+        wall_seconds = time.perf_counter() - start
+        stats["pdf"] = {
+            "files": len(files),
+            "workers": min(args.workers or os.cpu_count() or 1, len(files)),
+            "bytes": sum(size for _, size, _ in files),
+            "wall_s": round(wall_seconds, 2),
+            "cards_per_s": round(len(state["cards"]) / wall_seconds, 1),
+            # Render time summed over the files; render_s / (wall_s * workers) is the parallel efficiency
+            "render_s": round(sum(seconds for _, _, seconds in files), 2),
+            "output_dir": args.output_dir,
+        }
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from app.spotify import get_spotify_client, refresh_spotify_token
 from app.utils import generate_bingo_cards
 from app.state import game_state
 from app.helpers import handle_error
+from app.socket_handler import publish_delta, publish_card_changes, publish_play
 
 bp = Blueprint("bingo_logic", __name__)
 
@@ -27,10 +28,13 @@ def load_playlist():
                 for track in tracks if track["track"]
             ]
             state["num_tracks"] = len(state["unplayed_tracks"])
-        updated_state = game_state.update_state(update_state)
+            return state["num_tracks"]
+        _, num_tracks = game_state.mutate(
+            update_state, publish=lambda version, _: publish_delta(version, {"type": "reset"}),
+        )
         return jsonify({
             "message": "Playlist loaded successfully.",
-            "num_tracks": updated_state["num_tracks"],
+            "num_tracks": num_tracks,
         })
     except Exception as e:
         return handle_error(e)
@@ -41,13 +45,20 @@ def generate_cards():
     try:
         data = request.json
         num_cards = int(data.get("num_cards", 1))
-        state = game_state.get_state()
-        if len(state["unplayed_tracks"]) < 25:
+        unplayed_tracks = game_state.read_state(lambda state: state["unplayed_tracks"])
+        if len(unplayed_tracks) < 25:
             return jsonify({"error": "Not enough tracks to generate cards."}), 400
-        cards = generate_bingo_cards(state["unplayed_tracks"], num_cards)
+        cards = generate_bingo_cards(unplayed_tracks, num_cards)
         def update_state(state):
             state["cards"] = cards
-        game_state.update_state(update_state)
+            return len(cards)
+        game_state.mutate(
+            update_state,
+            event=lambda _: {"type": "cards_generated", "cards": cards},
+            publish=lambda version, total_cards: publish_delta(
+                version, {"type": "cards_regenerated", "total_cards": total_cards},
+            ),
+        )
         return jsonify({"message": f"{num_cards} cards generated successfully."})
     except Exception as e:
         return handle_error(e)
@@ -58,14 +69,12 @@ def play_track():
     try:
         sp = get_spotify_client()
         refresh_spotify_token()
-        state = game_state.get_state()
-        if not state["unplayed_tracks"]:
+        # The pool is a random sample of the playlist, so any unplayed track is "next"
+        play = game_state.play_track(publish=publish_play)
+        if not play:
             return jsonify({"error": "No unplayed tracks available."}), 400
-        track = state["unplayed_tracks"][0]
-        def update_state(state):
-            track = state["unplayed_tracks"].pop(0)
-            state["played_tracks"].append(track)
-        game_state.update_state(update_state)
+        track = play["track"]
+        publish_card_changes(play["changed_cards"])
         sp.start_playback(uris=[f"spotify:track:{track['id']}"])
         return jsonify({"message": "Track playing.", "track": track})
     except Exception as e:
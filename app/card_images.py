@@ -0,0 +1,135 @@
+import hashlib
+from collections import OrderedDict
+from io import BytesIO
+from threading import Lock
+from app.card_status import matches_to_bitmask
+
+IMAGE_FORMATS = {
+    "png": ("PNG", "image/png"),
+    "webp": ("WEBP", "image/webp"),
+}
+CELL_SIZE = 150
+HEADER_HEIGHT = 70
+IMAGE_WIDTH = CELL_SIZE * 5
+IMAGE_HEIGHT = HEADER_HEIGHT + CELL_SIZE * 5
+MATCH_COLOR = (144, 238, 144)
+HEADER_COLOR = (128, 128, 128)
+# Rendered images kept in memory; one entry per (card, match state, format)
+MAX_CACHED_IMAGES = 512
+
+
+def _load_font(size, bold=False):
+    from PIL import ImageFont
+
+    name = "DejaVuSans-Bold.ttf" if bold else "DejaVuSans.ttf"
+    try:
+        return ImageFont.truetype(name, size)
+    except OSError:
+        return ImageFont.load_default(size=size)
+
+
+def _wrap(draw, text, font, max_width, max_lines):
+    """Greedy word wrap, truncating with an ellipsis when it does not fit."""
+    lines, current = [], ""
+    for word in text.split():
+        candidate = f"{current} {word}".strip()
+        if draw.textlength(candidate, font=font) <= max_width:
+            current = candidate
+            continue
+        if current:
+            lines.append(current)
+        current = word
+    if current:
+        lines.append(current)
+    if len(lines) > max_lines:
+        lines = lines[:max_lines]
+        lines[-1] = lines[-1].rstrip(".") + "…"
+    return lines
+
+
+def card_fingerprint(card_id, card):
+    """Identify a card's content so regenerated cards never reuse a cached image."""
+    track_ids = ",".join(track["id"] for track in card.get("tracks", []))
+    return hashlib.sha1(f"{card_id}:{track_ids}".encode()).hexdigest()[:16]
+
+
+def card_image_etag(card_id, card, fmt):
+    mask = matches_to_bitmask(card.get("matches", []))
+    return f"{card_fingerprint(card_id, card)}-{mask:07x}-{fmt}"
+
+
+def render_card_image(card_id, card, fmt="png"):
+    """Render a card as a 5x5 grid image with matched cells highlighted."""
+    # Pillow is imported on the first render rather than at startup
+    from PIL import Image, ImageDraw
+
+    pil_format = IMAGE_FORMATS[fmt][0]
+    matches = set(card.get("matches", []))
+    header_font = _load_font(40, bold=True)
+    artist_font = _load_font(15, bold=True)
+    song_font = _load_font(14)
+
+    image = Image.new("RGB", (IMAGE_WIDTH, IMAGE_HEIGHT), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([0, 0, IMAGE_WIDTH, HEADER_HEIGHT], fill=HEADER_COLOR)
+    for col, letter in enumerate("BINGO"):
+        center = (col * CELL_SIZE + CELL_SIZE // 2, HEADER_HEIGHT // 2)
+        draw.text(center, letter, font=header_font, fill="white", anchor="mm")
+
+    for pos, track in enumerate(card["tracks"][:25]):
+        x = (pos % 5) * CELL_SIZE
+        y = HEADER_HEIGHT + (pos // 5) * CELL_SIZE
+        fill = MATCH_COLOR if pos in matches else "white"
+        draw.rectangle([x, y, x + CELL_SIZE, y + CELL_SIZE], fill=fill, outline="black", width=2)
+        lines = [(line, artist_font) for line in _wrap(draw, track["artist"], artist_font, CELL_SIZE - 12, 2)]
+        lines += [(line, song_font) for line in _wrap(draw, track["name"], song_font, CELL_SIZE - 12, 3)]
+        line_height = 19
+        top = y + (CELL_SIZE - line_height * len(lines)) // 2 + line_height // 2
+        for i, (line, font) in enumerate(lines):
+            draw.text((x + CELL_SIZE // 2, top + i * line_height), line, font=font, fill="black", anchor="mm")
+
+    buffer = BytesIO()
+    if pil_format == "PNG":
+        image.save(buffer, format=pil_format, optimize=True)
+    else:
+        image.save(buffer, format=pil_format, lossless=True)
+    return buffer.getvalue()
+
+
+class CardImageCache:
+    """LRU cache of rendered card images keyed by card content, match bitmask and format."""
+
+    def __init__(self, maxsize=MAX_CACHED_IMAGES):
+        self.maxsize = maxsize
+        self.images = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, card_id, card, fmt):
+        """Return ``(image_bytes, etag)``, rendering only on a cache miss."""
+        etag = card_image_etag(card_id, card, fmt)
+        with self.lock:
+            data = self.images.get(etag)
+            if data is not None:
+                self.images.move_to_end(etag)
+                return data, etag
+        data = render_card_image(card_id, card, fmt)
+        with self.lock:
+            self.images[etag] = data
+            while len(self.images) > self.maxsize:
+                self.images.popitem(last=False)
+        return data, etag
+
+
+card_image_cache = CardImageCache()
+
+
+def make_qr_png(url, box_size=4):
+    """Render ``url`` as a QR code PNG."""
+    import qrcode
+
+    qr = qrcode.QRCode(box_size=box_size, border=1)
+    qr.add_data(url)
+    qr.make(fit=True)
+    buffer = BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+    return buffer.getvalue()
@@ -1,95 +1,221 @@
-from flask import Blueprint, jsonify, request, send_file, current_app
+from flask import Blueprint, jsonify, request, send_file, current_app, render_template
 from app.state import game_state
-from app.utils import generate_bingo_cards
-from app.pdf_generator import generate_pdf
-import random
+from app.utils import generate_bingo_cards, build_cards, MAX_CARDS
 from io import BytesIO
 from app.helpers import handle_error
+from app.socket_handler import publish_delta, publish_near_wins
+from app.jobs import job_manager
+from app.card_images import card_image_cache, card_image_etag, IMAGE_FORMATS
+from app.card_status import matches_to_bitmask, near_wins, near_win_leaderboard, NEAR_WIN_LIMIT, MAX_CELLS_TO_BINGO
+import os
 
 bp = Blueprint("card", __name__)
 
-def check_bingo_status(card, played_tracks):
-    """Check if a card has a bingo condition."""
-    matches = card.get("matches", [])
-    for row in range(5):
-        row_positions = range(row * 5, (row + 1) * 5)
-        if all(pos in matches for pos in row_positions):
-            return True
-    for col in range(5):
-        col_positions = range(col, 25, 5)
-        if all(pos in matches for pos in col_positions):
-            return True
-    diagonal1_positions = [0, 6, 12, 18, 24]
-    if all(pos in matches for pos in diagonal1_positions):
-        return True
-    diagonal2_positions = [4, 8, 12, 16, 20]
-    if all(pos in matches for pos in diagonal2_positions):
-        return True
-    return False
+# Fields a card listing can be projected to; mask and away are derived from matches
+CARD_FIELDS = ("tracks", "matches", "mask", "bingo_status", "away")
+# Largest page a client may ask for with ?limit=
+MAX_CARDS_PAGE = 500
+
+def commit_cards(cards):
+    """Replace the cards in the game state."""
+    def set_cards(state):
+        state["cards"] = cards
+        return len(cards)
+    game_state.mutate(
+        set_cards,
+        event=lambda _: {"type": "cards_generated", "cards": cards},
+        publish=lambda version, total_cards: publish_delta(
+            version, {"type": "cards_regenerated", "total_cards": total_cards},
+        ),
+    )
+
+def generate_cards_job(job, tracks, num_cards):
+    """Background job: generate cards and store them in the game state."""
+    cards = build_cards(tracks, num_cards, progress=job.report)
+    job.check_cancelled()
+    commit_cards(cards)
+    return {"message": f"Generated {num_cards} cards", "num_cards": len(cards)}
+
+def card_view_url():
+    """URL template for the phone view of a card, used for the QR codes on printed cards."""
+    base_url = os.getenv("PUBLIC_BASE_URL") or request.host_url
+    return base_url.rstrip("/") + "/card/view/{card_id}"
+
+def generate_pdf_job(job, cards, view_url=None):
+    """Background job: render the cards PDF as a downloadable artifact."""
+    from app.pdf_generator import generate_pdf
+
+    pdf_data = generate_pdf(cards, progress=job.report, view_url=view_url)
+    return {
+        "data": pdf_data,
+        "mimetype": "application/pdf",
+        "filename": "bingo_cards.pdf",
+    }
 
 @bp.route("/api/generate_cards", methods=["POST"])
 def api_generate_cards():
-    """Generate new bingo cards."""
+    """Generate new bingo cards. Pass ``"background": true`` to run it as a job."""
     try:
         data = request.json
         num_cards = int(data.get("num_cards"))
-        state = game_state.get_state()
-        if len(state.get("unplayed_tracks", [])) < 25:
+        tracks = game_state.read_state(lambda state: state.get("unplayed_tracks", []))
+        if len(tracks) < 25:
             return jsonify({"error": "Not enough unplayed tracks"}), 400
-        def create_cards(state):
-            state["cards"] = {}
-            used_ids = set()
-            for _ in range(num_cards):
-                while True:
-                    card_id = str(random.randint(100, 999))
-                    if card_id not in used_ids:
-                        used_ids.add(card_id)
-                        break
-                state["cards"][card_id] = {
-                    "tracks": random.sample(state["unplayed_tracks"], 25),
-                    "bingo_status": "Not checked",
-                    "matches": [],
-                }
-            return state["cards"]
-        new_cards = game_state.update_state(create_cards)
+        if num_cards > MAX_CARDS:
+            return jsonify({"error": f"At most {MAX_CARDS} cards can be generated"}), 400
+        if data.get("background"):
+            job = job_manager.submit(
+                "generate_cards", generate_cards_job, tracks, num_cards,
+                description=f"Generating {num_cards} cards",
+            )
+            return jsonify({"message": "Card generation started", "job": job.to_dict()}), 202
+        new_cards = build_cards(tracks, num_cards)
+        commit_cards(new_cards)
         return jsonify({"message": f"Generated {num_cards} cards", "cards": new_cards})
     except Exception as e:
         return handle_error(e)
 
+def card_sort_key(card_id):
+    """Numeric card ids sort by value, anything else after them by name."""
+    return (0, int(card_id), "") if card_id.isdigit() else (1, 0, card_id)
+
+def project_card(card_id, card, fields):
+    """Only the requested fields of a card; computed fields are derived from its matches."""
+    projected = {}
+    for field in fields:
+        if field == "mask":
+            projected["mask"] = matches_to_bitmask(card.get("matches", []))
+        elif field == "away":
+            projected["away"] = near_wins.cells_to_bingo(card_id)
+        elif field == "bingo_status":
+            projected["bingo_status"] = card.get("bingo_status", "Not checked")
+        elif field in card:
+            projected[field] = card[field]
+    return projected
+
+def list_cards_page(state, fields, cursor=None, limit=None, ids=None, max_away=None, bingo=None):
+    """One page of cards after ``cursor``, filtered and projected; runs under the state lock."""
+    cards = state.get("cards", {})
+    near_wins.sync(cards)
+    card_ids = [card_id for card_id in ids if card_id in cards] if ids is not None else list(cards)
+    if max_away is not None or bingo is not None:
+        def keep(card_id):
+            away = near_wins.cells_to_bingo(card_id)
+            if max_away is not None and away > max_away:
+                return False
+            return bingo is None or (away == 0) == bingo
+        card_ids = [card_id for card_id in card_ids if keep(card_id)]
+    card_ids.sort(key=card_sort_key)
+    start = 0
+    if cursor:
+        after = card_sort_key(cursor)
+        start = next((i for i, card_id in enumerate(card_ids) if card_sort_key(card_id) > after), len(card_ids))
+    end = len(card_ids) if limit is None else start + limit
+    page_ids = card_ids[start:end]
+    return {
+        "version": state.get("version", 0),
+        "cards": {card_id: project_card(card_id, cards[card_id], fields) for card_id in page_ids},
+        "total": len(card_ids),
+        "next_cursor": page_ids[-1] if end < len(card_ids) and page_ids else None,
+    }
+
+def parse_bool(value):
+    return value.lower() in ("1", "true", "yes") if value is not None else None
+
 @bp.route("/api/get_cards", methods=["GET"])
 def api_get_cards():
-    """Get all current bingo cards."""
+    """Get the current bingo cards, optionally paged, filtered and projected.
+
+    Without query parameters every card is returned in full. Otherwise:
+    ``limit`` and ``cursor`` (the ``next_cursor`` of the previous page) page
+    through the cards in id order, ``fields`` picks what each card carries
+    (any of tracks, matches, mask, bingo_status, away; empty for ids only),
+    and ``ids``, ``bingo`` and ``max_away`` filter them. Responses carry an
+    ETag tied to the state version, so If-None-Match gets a 304 when nothing
+    changed.
+    """
     try:
-        state = game_state.get_state()
-        return jsonify({"cards": state.get("cards", {})})
+        etag = f"cards-{game_state.version}"
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+        elif not request.args:
+            state = game_state.get_state()
+            etag = f"cards-{state.get('version', 0)}"
+            response = jsonify({"cards": state.get("cards", {})})
+        else:
+            fields = request.args.get("fields")
+            fields = [f for f in fields.split(",") if f] if fields is not None else list(CARD_FIELDS)
+            unknown = [f for f in fields if f not in CARD_FIELDS]
+            if unknown:
+                return jsonify({"error": f"Unknown fields: {', '.join(unknown)}"}), 400
+            limit = request.args.get("limit", type=int)
+            if limit is not None:
+                limit = max(1, min(limit, MAX_CARDS_PAGE))
+            ids = request.args.get("ids")
+            page = game_state.read_state(lambda state: list_cards_page(
+                state, fields,
+                cursor=request.args.get("cursor"),
+                limit=limit,
+                ids=[i for i in ids.split(",") if i] if ids is not None else None,
+                max_away=request.args.get("max_away", type=int),
+                bingo=parse_bool(request.args.get("bingo")),
+            ))
+            etag = f"cards-{page['version']}"
+            response = jsonify(page)
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route("/api/near_wins", methods=["GET"])
+def api_near_wins():
+    """Cards closest to bingo, nearest first, with the number of cards at each distance."""
+    try:
+        limit = max(1, min(request.args.get("limit", NEAR_WIN_LIMIT, type=int), MAX_CARDS_PAGE))
+        max_away = request.args.get("max_away", 2, type=int)
+        max_away = max(0, min(max_away, MAX_CELLS_TO_BINGO))
+        return jsonify(game_state.read_state(
+            lambda state: dict(near_win_leaderboard(state["cards"], limit, max_away), version=state.get("version", 0))
+        ))
     except Exception as e:
         return handle_error(e)
 
+def publish_card_check(version, result):
+    """``publish`` callback for a card check: the new matches, and a winner when it just got bingo."""
+    changes = [{
+        "type": "card_matches",
+        "card_id": result["card_id"],
+        "matches": result["matches"],
+        "status": result["status"],
+    }]
+    if result["has_bingo"] and result["previous_status"] != "BINGO!":
+        changes.append({"type": "winner", "card_id": result["card_id"]})
+    publish_delta(version, *changes)
+
 @bp.route("/api/check_card/<card_id>", methods=["GET"])
 def api_check_card(card_id):
     """Check a specific card for matches and bingo."""
     try:
-        state = game_state.get_state()
-        if card_id not in state["cards"]:
+        result = game_state.set_card_matches(card_id, publish=publish_card_check)
+        if result is None:
             return jsonify({"error": "Invalid card ID"}), 404
-        def update_card_status(state):
-            card = state["cards"][card_id]
-            played_tracks = state.get("played_tracks", [])
-            matches = []
-            for position, track in enumerate(card["tracks"]):
-                if any(pt["id"] == track["id"] for pt in played_tracks):
-                    matches.append(position)
-            card["matches"] = matches
-            has_bingo = check_bingo_status(card, played_tracks)
-            card["bingo_status"] = "BINGO!" if has_bingo else "No bingo"
-            return {
+        if not result["changed"]:
+            # Nothing to publish: the version did not move, so cached listings stay valid
+            return jsonify({
                 "card_id": card_id,
-                "status": card["bingo_status"],
-                "matches": matches,
-                "has_bingo": has_bingo
-            }
-        result = game_state.update_state(update_card_status)
-        return jsonify(result)
+                "status": result["status"],
+                "matches": result["matches"],
+                "has_bingo": result["has_bingo"],
+            })
+        if result["matches"] != result["previous_matches"]:
+            publish_near_wins()
+        return jsonify({
+            "card_id": card_id,
+            "status": result["status"],
+            "matches": result["matches"],
+            "has_bingo": result["has_bingo"],
+        })
     except Exception as e:
         current_app.logger.error(f"Error checking card {card_id}: {e}")
         return handle_error(e)
@@ -102,7 +228,10 @@ def api_download_cards_pdf():
         cards = state.get("cards", {})
         if not cards:
             return jsonify({"error": "No cards available"}), 404
-        pdf_data = generate_pdf(cards)
+        # reportlab is only imported once a PDF is actually requested
+        from app.pdf_generator import generate_pdf
+
+        pdf_data = generate_pdf(cards, view_url=card_view_url())
         return send_file(
             BytesIO(pdf_data),
             mimetype="application/pdf",
@@ -111,3 +240,54 @@ def api_download_cards_pdf():
         )
     except Exception as e:
         return handle_error(e)
+
+@bp.route("/api/download_cards_pdf", methods=["POST"])
+def api_start_cards_pdf_job():
+    """Start rendering the cards PDF in the background; download it from the jobs API."""
+    try:
+        state = game_state.get_state()
+        cards = state.get("cards", {})
+        if not cards:
+            return jsonify({"error": "No cards available"}), 404
+        job = job_manager.submit(
+            "cards_pdf", generate_pdf_job, cards, view_url=card_view_url(),
+            description=f"Rendering PDF for {len(cards)} cards",
+        )
+        return jsonify({"message": "PDF generation started", "job": job.to_dict()}), 202
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route("/api/card_image/<card_id>", methods=["GET"])
+def api_card_image(card_id):
+    """Serve a rendered image of a card with its matched cells highlighted."""
+    try:
+        fmt = request.args.get("format")
+        if not fmt:
+            fmt = "webp" if "image/webp" in request.headers.get("Accept", "") else "png"
+        fmt = fmt.lower()
+        if fmt not in IMAGE_FORMATS:
+            return jsonify({"error": f"Unsupported image format: {fmt}"}), 400
+        card = game_state.get_card(card_id)
+        if not card:
+            return jsonify({"error": "Invalid card ID"}), 404
+        etag = card_image_etag(card_id, card, fmt)
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+        else:
+            data, etag = card_image_cache.get(card_id, card, fmt)
+            response = current_app.response_class(data, mimetype=IMAGE_FORMATS[fmt][1])
+        response.set_etag(etag)
+        # Always revalidate: the image changes whenever a track on the card is played
+        response.headers["Cache-Control"] = "no-cache"
+        response.headers["Vary"] = "Accept"
+        return response
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route("/view/<card_id>", methods=["GET"])
+def card_view(card_id):
+    """Lightweight phone view of a single card; the target of the QR code on printed cards."""
+    card = game_state.get_card(card_id)
+    if not card:
+        return "<h1>Card not found</h1>", 404
+    return render_template("card_view.html", card_id=card_id)
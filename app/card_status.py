@@ -1,3 +1,19 @@
+# Winning lines for the default "rowcoldiag" mode: 5 rows, 5 columns and both diagonals
+BINGO_PATTERNS = (
+    [tuple(range(row * 5, row * 5 + 5)) for row in range(5)]
+    + [tuple(range(col, 25, 5)) for col in range(5)]
+    + [(0, 6, 12, 18, 24), (4, 8, 12, 16, 20)]
+)
+# Indexes into BINGO_PATTERNS of the lines running through each cell
+CELL_PATTERNS = tuple(
+    tuple(i for i, pattern in enumerate(BINGO_PATTERNS) if pos in pattern) for pos in range(25)
+)
+# Distance from bingo of a card with no matches
+MAX_CELLS_TO_BINGO = 5
+# Default number of cards in the near-win leaderboard
+NEAR_WIN_LIMIT = 10
+
+
 def summarize_card_statuses(cards, played_tracks):
     """Summarize the status of bingo cards, indicating rows, columns, or cards with results."""
     card_summaries = {}
@@ -50,3 +66,154 @@ def validate_card(card_id, cards, played_tracks):
         "has_bingo": has_bingo,
         "status": "BINGO!" if has_bingo else "No bingo",
     }
+
+
+def matches_to_bitmask(matches):
+    """Encode a list of matched positions (0-24) as an integer bitmask."""
+    mask = 0
+    for pos in matches:
+        mask |= 1 << pos
+    return mask
+
+
+def cells_to_bingo(matches):
+    """Fewest unmatched cells on any winning line; 0 means the card has bingo."""
+    matched = set(matches)
+    return min(sum(1 for pos in pattern if pos not in matched) for pattern in BINGO_PATTERNS)
+
+
+class NearWinIndex:
+    """Per-card, per-line hit counters kept current as tracks are marked.
+
+    Cards sit in one bucket per distance from bingo (0-5 cells), in the order
+    they reached it, so the closest cards are read in O(k). A track-to-cells
+    map means marking a track only visits the cards that hold it. The index
+    follows the ``cards`` dict it was built from and rebuilds when the state
+    swaps in a new one (new cards, new round, loaded game). Only use it with
+    the game state lock held.
+    """
+
+    def __init__(self):
+        self.cards = None
+        self.track_cells = {}
+        self.hits = {}
+        self.away = {}
+        self.buckets = [{} for _ in range(MAX_CELLS_TO_BINGO + 1)]
+
+    def sync(self, cards):
+        """Rebuild from ``cards`` unless the index already follows that dict."""
+        if cards is self.cards:
+            return
+        self.cards = cards
+        self.track_cells = {}
+        self.hits = {}
+        self.away = {}
+        self.buckets = [{} for _ in range(MAX_CELLS_TO_BINGO + 1)]
+        for card_id, card in cards.items():
+            for pos, track in enumerate(card["tracks"]):
+                self.track_cells.setdefault(track["id"], []).append((card_id, pos))
+            self._count(card_id, card.get("matches", []))
+
+    def _count(self, card_id, matches):
+        hits = [0] * len(BINGO_PATTERNS)
+        for pos in set(matches):
+            for pattern in CELL_PATTERNS[pos]:
+                hits[pattern] += 1
+        self.hits[card_id] = hits
+        self._place(card_id, MAX_CELLS_TO_BINGO - max(hits))
+
+    def _place(self, card_id, away):
+        previous = self.away.get(card_id)
+        if previous == away:
+            return
+        if previous is not None:
+            del self.buckets[previous][card_id]
+        self.away[card_id] = away
+        self.buckets[away][card_id] = None
+
+    def cells_for_track(self, track_id):
+        """``(card_id, position)`` for every cell holding ``track_id``."""
+        return self.track_cells.get(track_id, ())
+
+    def mark(self, card_id, pos):
+        """Count a newly matched cell; touches only the lines through it."""
+        hits = self.hits[card_id]
+        away = self.away[card_id]
+        for pattern in CELL_PATTERNS[pos]:
+            hits[pattern] += 1
+            away = min(away, MAX_CELLS_TO_BINGO - hits[pattern])
+        self._place(card_id, away)
+
+    def set_matches(self, cards, card_id, matches):
+        """Recount one card whose matches were replaced wholesale."""
+        self.sync(cards)
+        self._count(card_id, matches)
+
+    def cells_to_bingo(self, card_id):
+        return self.away[card_id]
+
+    def closest(self, limit, max_away=MAX_CELLS_TO_BINGO):
+        """Up to ``limit`` cards nearest to bingo, nearest first."""
+        closest = []
+        for away, bucket in enumerate(self.buckets[:max_away + 1]):
+            for card_id in bucket:
+                if len(closest) >= limit:
+                    return closest
+                closest.append({"card_id": card_id, "away": away})
+        return closest
+
+    def counts(self):
+        """Number of cards at each distance from bingo, indexed by distance."""
+        return [len(bucket) for bucket in self.buckets]
+
+
+near_wins = NearWinIndex()
+
+
+def mark_track(cards, track_id, index=None, new_winners=None):
+    """Mark ``track_id`` as matched on every card holding it.
+
+    Returns ``(card_id, {"matches", "status"})`` snapshots for the cards that changed,
+    safe to use after the state lock is released. ``index`` defaults to the
+    shared near-win index of the live game. Cards that reach bingo with this
+    track are appended to ``new_winners`` when a list is given.
+    """
+    if index is None:
+        index = near_wins
+    index.sync(cards)
+    # Card id -> cells to bingo before this track
+    touched = {}
+    for card_id, pos in index.cells_for_track(track_id):
+        matches = cards[card_id].setdefault("matches", [])
+        if pos in matches:
+            continue
+        if card_id not in touched:
+            touched[card_id] = index.cells_to_bingo(card_id)
+        matches.append(pos)
+        index.mark(card_id, pos)
+    changed = []
+    for card_id, away_before in touched.items():
+        card = cards[card_id]
+        card["matches"].sort()
+        has_bingo = index.cells_to_bingo(card_id) == 0
+        card["bingo_status"] = "BINGO!" if has_bingo else "No bingo"
+        changed.append((card_id, {"matches": list(card["matches"]), "status": card["bingo_status"]}))
+        if has_bingo and away_before > 0 and new_winners is not None:
+            new_winners.append(card_id)
+    return changed
+
+
+def near_win_summary(cards):
+    """Winners and how many cards are one or two cells away from bingo."""
+    near_wins.sync(cards)
+    return {
+        "winners": sorted(near_wins.buckets[0]),
+        "one_away": len(near_wins.buckets[1]),
+        "two_away": len(near_wins.buckets[2]),
+    }
+
+
+def near_win_leaderboard(cards, limit=NEAR_WIN_LIMIT, max_away=2):
+    """The cards closest to bingo plus per-distance counts, read from the index."""
+    near_wins.sync(cards)
+    return {"closest": near_wins.closest(limit, max_away), "counts": near_wins.counts()}
@@ -1,10 +1,16 @@
-from flask import Blueprint, render_template, current_app, jsonify
-from app.card_status import summarize_card_statuses
-from app.state import game_state
+from flask import Blueprint, render_template, current_app, jsonify, request
+import os
+from app.card_status import near_win_summary, summarize_card_statuses
+from app.state import game_state, load_playlists, PLAYLISTS_FILE
 from app.helpers import handle_error
+from app.static_assets import dashboard_shell
+from app.static_routes import asset_response
 
 bp = Blueprint("dashboard", __name__)
 
+# Upper bound for ?wait= on the snapshot long-poll, in seconds
+MAX_SNAPSHOT_WAIT = 30
+
 def get_dashboard_data():
     """Get all necessary data for the dashboard."""
     state = game_state.get_state()
@@ -23,11 +29,11 @@ def get_dashboard_data():
 
 @bp.route("/", methods=["GET"])
 def dashboard():
-    """Render the main dashboard."""
+    """The dashboard shell, rendered once and cached; its data comes from /api/snapshot."""
     try:
         current_app.logger.info("Dashboard route accessed")
-        dashboard_data = get_dashboard_data()
-        return render_template("dashboard.html", **dashboard_data)
+        # no-cache: browsers revalidate (a 304) so a release with new asset URLs is picked up
+        return asset_response(dashboard_shell.get(current_app._get_current_object()), "no-cache")
     except Exception as e:
         current_app.logger.error(f"Error rendering dashboard: {e}")
         return render_template("error.html", error_message="Failed to load dashboard. Please try again.")
@@ -58,3 +64,64 @@ def api_dashboard_stats():
         return jsonify(stats)
     except Exception as e:
         return handle_error(e)
+
+def build_snapshot(state):
+    """Exactly what the dashboard renders; runs under the state lock, so it copies nothing big."""
+    cards = state.get("cards", {})
+    played_tracks = state.get("played_tracks", [])
+    unplayed_count = len(state.get("unplayed_tracks", []))
+    return {
+        "version": state.get("version", 0),
+        "current_playlist": state.get("current_playlist"),
+        "bingo_mode": state.get("bingo_mode", "default"),
+        "played_tracks": [{"artist": t["artist"], "name": t["name"]} for t in played_tracks],
+        "cards": {
+            card_id: {"matches": card.get("matches", []), "bingo_status": card.get("bingo_status", "Not checked")}
+            for card_id, card in cards.items()
+        },
+        "winners": near_win_summary(cards)["winners"],
+        "stats": {
+            "total_tracks": unplayed_count + len(played_tracks),
+            "played_tracks": len(played_tracks),
+            "remaining_tracks": unplayed_count,
+            "total_cards": len(cards),
+            "cards_with_matches": sum(1 for card in cards.values() if card.get("matches")),
+            "bingos": sum(1 for card in cards.values() if card.get("bingo_status") == "BINGO!"),
+        },
+    }
+
+def snapshot_etag(version):
+    """The snapshot changes when the game state or the saved playlists change."""
+    try:
+        playlists_mtime = os.stat(PLAYLISTS_FILE).st_mtime_ns
+    except OSError:
+        playlists_mtime = 0
+    return f"{version}-{playlists_mtime}"
+
+@bp.route("/api/snapshot", methods=["GET"])
+def api_snapshot():
+    """Everything the dashboard shows in one response, with ETag and optional long-poll.
+
+    Send the last ETag in If-None-Match to get a 304 when nothing changed.
+    With ``?wait=<seconds>`` the request is held until the state version
+    moves (or the wait runs out) instead of answering 304 straight away.
+    """
+    try:
+        version = game_state.version
+        etag = snapshot_etag(version)
+        wait = min(request.args.get("wait", 0, type=float), MAX_SNAPSHOT_WAIT)
+        if request.if_none_match.contains(etag) and wait > 0:
+            version = game_state.wait_for_change(version, wait)
+            etag = snapshot_etag(version)
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+        else:
+            snapshot = game_state.read_state(build_snapshot)
+            snapshot["playlists"] = load_playlists()
+            etag = snapshot_etag(snapshot["version"])
+            response = jsonify(snapshot)
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+    except Exception as e:
+        return handle_error(e)
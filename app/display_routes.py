@@ -0,0 +1,31 @@
+from flask import Blueprint, current_app, request
+from app.display_stream import display_stream
+from app.helpers import handle_error
+
+bp = Blueprint("display", __name__)
+
+def parse_event_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+@bp.route("/stream", methods=["GET"])
+def stream():
+    """Server-Sent Events for projectors and other read-only displays.
+
+    The first event is a ``snapshot`` of what a display shows (current
+    track, played and remaining counts, winners); after that each change is
+    an ``update`` with only the changed fields, or a new ``snapshot`` after a
+    reset or new cards. Browsers resume with the ``Last-Event-ID`` header on
+    their own; ``?last_event_id=`` does the same for clients that cannot set it.
+    """
+    try:
+        last_event_id = parse_event_id(request.headers.get("Last-Event-ID") or request.args.get("last_event_id"))
+        response = current_app.response_class(display_stream.stream(last_event_id), mimetype="text/event-stream")
+        response.headers["Cache-Control"] = "no-cache"
+        # Keep nginx from buffering the stream
+        response.headers["X-Accel-Buffering"] = "no"
+        return response
+    except Exception as e:
+        return handle_error(e)
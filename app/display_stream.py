@@ -0,0 +1,177 @@
+import logging
+import os
+import time
+from collections import deque
+from threading import Condition, Lock, Thread
+from app.card_status import near_win_summary
+from app.json_codec import dumpb
+from app.metrics import display_events_total, display_stream_connections_total
+from app.state import game_state
+
+# Display events kept for clients that reconnect with Last-Event-ID; older gaps get a snapshot
+DISPLAY_STREAM_BUFFER = int(os.getenv("DISPLAY_STREAM_BUFFER", "256"))
+# Seconds between keep-alive comments on an idle stream; also how soon a closed client is noticed
+DISPLAY_HEARTBEAT = float(os.getenv("DISPLAY_HEARTBEAT", "15"))
+# Milliseconds a disconnected EventSource waits before reconnecting
+DISPLAY_RETRY_MS = 3000
+# Seconds the stream thread waits before retrying after an error
+DISPLAY_ERROR_BACKOFF = 1.0
+
+HEARTBEAT_FRAME = b": ping\n\n"
+RETRY_FRAME = f"retry: {DISPLAY_RETRY_MS}\n\n".encode()
+
+logger = logging.getLogger(__name__)
+
+
+def display_view(state):
+    """What a projector shows; runs under the state lock and reads the winners from the near-win index."""
+    played = state.get("played_tracks", [])
+    last = played[-1] if played else None
+    return {
+        "v": state.get("version", 0),
+        "playlist": state.get("current_playlist"),
+        "track": {"name": last["name"], "artist": last["artist"]} if last else None,
+        "played": len(played),
+        "remaining": len(state.get("unplayed_tracks", [])),
+        "cards": len(state.get("cards", {})),
+        "winners": near_win_summary(state.get("cards", {}))["winners"],
+    }
+
+
+def display_event(previous, view):
+    """The event that takes a display from ``previous`` to ``view``: (type, data), or None if it shows no change.
+
+    Plays and new winners are an ``update`` with only the fields that
+    changed. Anything a display cannot apply on top of what it has (a new
+    playlist, new cards, a reset or a loaded game) is a full ``snapshot``.
+    """
+    if (
+        view["playlist"] != previous["playlist"]
+        or view["cards"] != previous["cards"]
+        or view["played"] < previous["played"]
+        or not set(previous["winners"]) <= set(view["winners"])
+    ):
+        return "snapshot", view
+    update = {"v": view["v"]}
+    for field in ("track", "played", "remaining"):
+        if view[field] != previous[field]:
+            update[field] = view[field]
+    new_winners = sorted(set(view["winners"]) - set(previous["winners"]))
+    if new_winners:
+        update["new_winners"] = new_winners
+    return ("update", update) if len(update) > 1 else None
+
+
+def sse_frame(event_id, event_type, data):
+    return f"id: {event_id}\nevent: {event_type}\ndata: ".encode() + dumpb(data) + b"\n\n"
+
+
+class DisplayStream:
+    """Display events for Server-Sent Events clients, serialized once and shared.
+
+    One background thread follows the game state version. On each change it
+    reads the small display view under the state lock, turns the difference
+    from the previous view into one event and appends it, encoded as a
+    ready-to-send SSE frame, to a bounded buffer. Every connected client
+    writes the same bytes from that buffer, so a change costs one read and
+    one serialization however many displays listen. Event ids are state
+    versions: a client that reconnects with ``Last-Event-ID`` gets the frames
+    it missed, or a snapshot when the buffer no longer reaches back that far.
+    Plays by other worker processes are seen through ``wait_for_change`` like
+    local ones.
+    """
+
+    def __init__(self, buffer_size=DISPLAY_STREAM_BUFFER, heartbeat=DISPLAY_HEARTBEAT):
+        self.heartbeat = heartbeat
+        self.frames = deque(maxlen=buffer_size)
+        # Frames after this version can be replayed from the buffer
+        self.horizon = None
+        self.view = None
+        self.snapshot = None
+        self.changed = Condition()
+        self.lock = Lock()
+        self.thread = None
+
+    def start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = Thread(target=self._run, name="bingo-display-stream", daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        view = None
+        while True:
+            try:
+                if view is not None and game_state.wait_for_change(view["v"], self.heartbeat) == view["v"]:
+                    continue
+                latest = game_state.read_state(display_view)
+                self.publish(latest)
+                # Only move on once published, so a change that failed is read again
+                view = latest
+            except Exception:
+                logger.exception("Error updating the display stream")
+                time.sleep(DISPLAY_ERROR_BACKOFF)
+
+    def publish(self, view):
+        """Make ``view`` current and buffer the event that leads to it."""
+        with self.changed:
+            previous = self.view
+            # Build the frame before changing anything, so a failure leaves the stream as it was
+            event = display_event(previous, view) if previous is not None else None
+            frame = sse_frame(view["v"], *event) if event is not None else None
+            self.view, self.snapshot = view, None
+            if previous is None:
+                self.horizon = view["v"]
+                self.changed.notify_all()
+                return
+            if event is None:
+                return
+            if len(self.frames) == self.frames.maxlen:
+                self.horizon = self.frames[0][0]
+            if event[0] == "snapshot":
+                self.snapshot = frame
+            self.frames.append((view["v"], frame))
+            display_events_total.inc(event[0])
+            self.changed.notify_all()
+
+    def _snapshot_frame(self):
+        if self.snapshot is None:
+            self.snapshot = sse_frame(self.view["v"], "snapshot", self.view)
+        return self.snapshot
+
+    def _frames_after(self, version):
+        """Frames a client at ``version`` has not seen, and the version they bring it to; call with the lock held."""
+        current = self.view["v"]
+        if version is None or not self.horizon <= version <= current:
+            return [self._snapshot_frame()], current
+        # Usually only the newest frame is missing, so walk back from the end
+        pending = []
+        for frame_version, frame in reversed(self.frames):
+            if frame_version <= version:
+                break
+            pending.append(frame)
+        pending.reverse()
+        return pending, current
+
+    def _newest(self):
+        return self.frames[-1][0] if self.frames else self.horizon
+
+    def stream(self, last_event_id=None):
+        """The byte chunks of one client's event stream, starting after ``last_event_id``."""
+        self.start()
+        display_stream_connections_total.inc("opened")
+        try:
+            yield RETRY_FRAME
+            with self.changed:
+                self.changed.wait_for(lambda: self.view is not None)
+                pending, cursor = self._frames_after(last_event_id)
+            while True:
+                yield b"".join(pending) if pending else HEARTBEAT_FRAME
+                with self.changed:
+                    self.changed.wait_for(lambda: self._newest() > cursor, self.heartbeat)
+                    pending, cursor = self._frames_after(cursor)
+        finally:
+            display_stream_connections_total.inc("closed")
+
+
+display_stream = DisplayStream()
@@ -0,0 +1,58 @@
+import os
+import time
+from datetime import datetime
+from app.json_codec import dumps, loads
+
+# One JSON-lines file per server run ("night") is written here
+EVENT_LOG_DIR = os.getenv("EVENT_LOG_DIR", os.path.join("logs", "events"))
+
+# Event types and what they carry besides version and time:
+#   initial_state     state        the state when the log was opened
+#   playlist_loaded   playlist_id, tracks (the selected pool)
+#   cards_generated   cards
+#   track_played      track_id
+#   card_checked      card_id, matches
+#   game_loaded       state        a saved game or checkpoint swapped in
+#   game_reset                     new round
+EVENT_TYPES = (
+    "initial_state", "playlist_loaded", "cards_generated", "track_played",
+    "card_checked", "game_loaded", "game_reset",
+)
+
+
+class EventLog:
+    """Append-only record of every game mutation, one JSON line per event.
+
+    Events are written by the game state with its lock held, right after the
+    version moves, so file order is version order. The first line of each
+    file is the state at the time it was opened, which makes every file
+    replayable on its own.
+    """
+
+    def __init__(self, directory=EVENT_LOG_DIR):
+        self.directory = directory
+        self.path = None
+        self.file = None
+
+    def begin(self, state):
+        """Open the log on first use, starting it with ``state`` as it is before any logged event."""
+        if self.file is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, f"night_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+        self.file = open(self.path, "a", encoding="utf-8")
+        self._write({"type": "initial_state", "version": state.get("version", 0), "time": time.time(), "state": state})
+
+    def record(self, state, event):
+        self.begin(state)
+        self._write(dict(event, version=state.get("version", 0), time=time.time()))
+
+    def _write(self, event):
+        self.file.write(dumps(event) + "\n")
+        self.file.flush()
+
+
+def read_events(path):
+    """Events of a log file in order."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [loads(line) for line in f if line.strip()]
@@ -1,18 +1,12 @@
 from flask import Blueprint, jsonify, request, current_app
-import json
-import os
-from datetime import datetime
 from app.state import game_state
 from app.helpers import handle_error
+from app.socket_handler import publish_delta
+from app.saved_games import saved_games
+from app.autosave import checkpointer
 
 bp = Blueprint("game_management", __name__)
 
-SAVED_GAMES_DIR = "saved_games"
-
-def ensure_saved_games_dir():
-    if not os.path.exists(SAVED_GAMES_DIR):
-        os.makedirs(SAVED_GAMES_DIR)
-
 @bp.route("/api/save_game", methods=["POST"])
 def save_game():
     """Save current game state with a name and description."""
@@ -22,18 +16,8 @@ def save_game():
         description = data.get("description", "")
         if not game_name:
             return jsonify({"error": "Game name is required"}), 400
-        ensure_saved_games_dir()
         current_state = game_state.get_state()
-        save_data = {
-            "name": game_name,
-            "description": description,
-            "timestamp": datetime.now().isoformat(),
-            "game_state": current_state
-        }
-        filename = f"{game_name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        filepath = os.path.join(SAVED_GAMES_DIR, filename)
-        with open(filepath, 'w') as f:
-            json.dump(save_data, f, indent=4)
+        filename = saved_games.save(game_name, description, current_state)
         return jsonify({
             "message": "Game saved successfully",
             "filename": filename
@@ -41,25 +25,32 @@ def save_game():
     except Exception as e:
         return handle_error(e)
 
+def restore_game(loaded_state):
+    """Swap a loaded game state in for the current one and tell every client to resync."""
+    def update_state(state):
+        state.update(loaded_state)
+        return True
+    game_state.mutate(
+        update_state,
+        event=lambda _: {"type": "game_loaded", "state": loaded_state},
+        publish=lambda version, _: publish_delta(version, {"type": "reset"}),
+    )
+
 @bp.route("/api/load_game/<filename>", methods=["POST"])
 def load_game(filename):
     """Load a saved game state."""
     try:
-        filepath = os.path.join(SAVED_GAMES_DIR, filename)
-        if not os.path.exists(filepath):
+        saved = saved_games.load(filename)
+        if saved is None:
             return jsonify({"error": "Saved game not found"}), 404
-        with open(filepath, 'r') as f:
-            save_data = json.load(f)
-        def update_state(state):
-            loaded_state = save_data["game_state"]
-            state.update(loaded_state)
-        game_state.update_state(update_state)
+        header, loaded_state = saved
+        restore_game(loaded_state)
         return jsonify({
             "message": "Game loaded successfully",
             "game_info": {
-                "name": save_data["name"],
-                "description": save_data["description"],
-                "timestamp": save_data["timestamp"]
+                "name": header["name"],
+                "description": header["description"],
+                "timestamp": header["timestamp"]
             }
         })
     except Exception as e:
@@ -69,21 +60,36 @@ def load_game(filename):
 def list_saved_games():
     """Get list of all saved games."""
     try:
-        ensure_saved_games_dir()
-        saved_games = []
-        for filename in os.listdir(SAVED_GAMES_DIR):
-            if filename.endswith('.json'):
-                filepath = os.path.join(SAVED_GAMES_DIR, filename)
-                with open(filepath, 'r') as f:
-                    save_data = json.load(f)
-                    saved_games.append({
-                        "filename": filename,
-                        "name": save_data["name"],
-                        "description": save_data["description"],
-                        "timestamp": save_data["timestamp"]
-                    })
-        return jsonify({
-            "saved_games": sorted(saved_games, key=lambda x: x["timestamp"], reverse=True)
-        })
+        return jsonify({"saved_games": saved_games.list_games()})
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route("/api/checkpoints", methods=["GET"])
+def list_checkpoints():
+    """Get the autosave checkpoints, newest first."""
+    try:
+        return jsonify({"checkpoints": checkpointer.list_checkpoints()})
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route("/api/checkpoints", methods=["POST"])
+def create_checkpoint():
+    """Write a checkpoint of the current game right away."""
+    try:
+        return jsonify({"message": "Checkpoint written", "filename": checkpointer.checkpoint()})
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route("/api/restore_checkpoint", methods=["POST"])
+def restore_checkpoint():
+    """Restore a checkpoint, the newest one unless ``filename`` is given."""
+    try:
+        filename = (request.get_json(silent=True) or {}).get("filename")
+        saved = checkpointer.load(filename)
+        if saved is None:
+            return jsonify({"error": "Checkpoint not found"}), 404
+        header, loaded_state = saved
+        restore_game(loaded_state)
+        return jsonify({"message": "Checkpoint restored", "checkpoint": header})
     except Exception as e:
         return handle_error(e)
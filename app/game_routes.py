@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, current_app
 from app.state import game_state
 from app.helpers import handle_error
+from app.socket_handler import publish_delta
 
 bp = Blueprint("game", __name__)
 
@@ -8,7 +9,7 @@ bp = Blueprint("game", __name__)
 def api_new_round():
     """Start a new round by resetting the game state."""
     try:
-        game_state.reset_to_default()
+        game_state.reset_to_default(publish=lambda version: publish_delta(version, {"type": "reset"}))
         return jsonify({"message": "New round started"})
     except Exception as e:
         return handle_error(e)
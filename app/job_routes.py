@@ -0,0 +1,55 @@
+from flask import Blueprint, jsonify, send_file
+from io import BytesIO
+from app.jobs import job_manager, JOB_FINISHED
+from app.helpers import handle_error
+
+bp = Blueprint("jobs", __name__)
+
+@bp.route("/api/list", methods=["GET"])
+def api_list_jobs():
+    """List known background jobs."""
+    try:
+        return jsonify({"jobs": job_manager.list_jobs()})
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route("/api/<job_id>", methods=["GET"])
+def api_job_status(job_id):
+    """Get the status and progress of a background job."""
+    try:
+        job = job_manager.get(job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(job.to_dict())
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route("/api/<job_id>/cancel", methods=["POST"])
+def api_cancel_job(job_id):
+    """Request cancellation of a queued or running job."""
+    try:
+        job = job_manager.cancel(job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(job.to_dict())
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route("/api/<job_id>/download", methods=["GET"])
+def api_download_job_artifact(job_id):
+    """Download the artifact produced by a finished job."""
+    try:
+        job = job_manager.get(job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+        if job.status != JOB_FINISHED or job.artifact is None:
+            return jsonify({"error": f"Job has no downloadable result (status: {job.status})"}), 409
+        artifact = job.artifact
+        return send_file(
+            BytesIO(artifact["data"]),
+            mimetype=artifact["mimetype"],
+            as_attachment=True,
+            download_name=artifact["filename"],
+        )
+    except Exception as e:
+        return handle_error(e)
@@ -0,0 +1,154 @@
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock
+from flask import current_app
+from app.socket_handler import emitter, HOST_ROOM
+
+# Number of background jobs that may run at the same time
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Finished jobs (and their artifacts) kept around for download
+MAX_FINISHED_JOBS = 20
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_FINISHED = "finished"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINAL_STATUSES = (JOB_FINISHED, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation was requested."""
+
+
+class Job:
+    def __init__(self, kind, description=""):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.description = description
+        self.status = JOB_QUEUED
+        self.progress = 0.0
+        self.message = ""
+        self.error = None
+        self.result = None
+        self.artifact = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._cancel_event = Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        """Stop the job at a safe point if cancellation was requested."""
+        if self.cancelled:
+            raise JobCancelled()
+
+    def report(self, done, total, message=None):
+        """Record progress and push it to the dashboard. Also a cancellation point."""
+        self.check_cancelled()
+        self.progress = round(done / total, 3) if total else 0.0
+        if message is not None:
+            self.message = message
+        job_manager.emit_progress(self)
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "description": self.description,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "error": self.error,
+            "result": self.result,
+            "has_artifact": self.artifact is not None,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """Runs long operations on a bounded worker pool outside the request thread.
+
+    A job function receives the ``Job`` as its first argument, may call
+    ``job.report()`` to publish progress, and returns either a JSON-able result
+    or an artifact dict with ``data``, ``mimetype`` and ``filename`` keys.
+    """
+
+    def __init__(self, max_workers):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bingo-job")
+        self.jobs = {}
+        self.lock = Lock()
+
+    def submit(self, kind, func, *args, description="", **kwargs):
+        app = current_app._get_current_object()
+        job = Job(kind, description)
+        with self.lock:
+            self.jobs[job.id] = job
+            self._prune()
+        self.executor.submit(self._run, app, job, func, args, kwargs)
+        return job
+
+    def _run(self, app, job, func, args, kwargs):
+        with app.app_context():
+            if job.cancelled:
+                self._finish(job, JOB_CANCELLED)
+                return
+            job.status = JOB_RUNNING
+            self.emit_progress(job)
+            try:
+                result = func(job, *args, **kwargs)
+                if isinstance(result, dict) and "data" in result and "mimetype" in result:
+                    job.artifact = result
+                else:
+                    job.result = result
+                job.progress = 1.0
+                self._finish(job, JOB_FINISHED)
+            except JobCancelled:
+                self._finish(job, JOB_CANCELLED)
+            except Exception as e:
+                app.logger.error(f"Job {job.id} ({job.kind}) failed: {e}")
+                job.error = str(e)
+                self._finish(job, JOB_FAILED)
+
+    def _finish(self, job, status):
+        job.status = status
+        job.finished_at = time.time()
+        self.emit_progress(job)
+
+    def _prune(self):
+        """Drop the oldest finished jobs so artifacts do not pile up in memory."""
+        finished = sorted(
+            (j for j in self.jobs.values() if j.status in FINAL_STATUSES),
+            key=lambda j: j.finished_at,
+        )
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job.id]
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self):
+        with self.lock:
+            return [job.to_dict() for job in self.jobs.values()]
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job and job.status not in FINAL_STATUSES:
+            job.cancel()
+        return job
+
+    def emit_progress(self, job):
+        """Queue the job's progress for the host room; the worker never waits on a slow client."""
+        emitter.emit("job_progress", job.to_dict(), room=HOST_ROOM)
+
+
+job_manager = JobManager(JOB_WORKERS)
@@ -0,0 +1,147 @@
+import gzip
+import json
+import os
+import re
+from collections import OrderedDict
+from threading import Lock
+
+# orjson encodes several times faster than the standard library; optional, with a compact stdlib fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+# Brotli compresses JSON better than gzip at similar speed; used for clients that accept it, when installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies and Socket.IO polling payloads smaller than this many bytes are sent uncompressed
+COMPRESSION_THRESHOLD = int(os.getenv("COMPRESSION_THRESHOLD", "1024"))
+# Fast levels: the payloads are regenerated per request, so encode time matters more than the last few percent
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+# Response types worth compressing; audio, images and PDFs are already compressed
+COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "text/", "image/svg+xml")
+# The suffix compressed responses add to their ETag, stripped again from If-None-Match
+ENCODED_ETAG = re.compile(r'-(?:gzip|br)"')
+# Compressed bodies of responses with a strong ETag, kept so clients fetching the same version
+# of a large payload compress it once; (full path, etag, encoding) -> bytes, least recent first
+COMPRESSED_CACHE_SIZE = 16
+compressed_cache = OrderedDict()
+compressed_cache_lock = Lock()
+
+
+def dumpb(obj):
+    """Compact JSON as UTF-8 bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Types orjson does not know (and integers beyond 64 bits) go through the stdlib
+            pass
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+def dumps(obj, **kwargs):
+    """Compact JSON as a str.
+
+    Formatting arguments (``separators``, ``indent``...) are accepted for
+    drop-in compatibility with ``json.dumps`` and ignored: output is
+    always compact.
+    """
+    return dumpb(obj).decode("utf-8")
+
+
+def loads(data, **kwargs):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_file(path):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def dump_file(obj, path):
+    """Write ``obj`` to ``path`` as compact JSON; returns the number of bytes written."""
+    data = dumpb(obj)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def pick_encoding(accept_encoding):
+    """"br" or "gzip" for a request's Accept-Encoding header, or None."""
+    if brotli is not None and "br" in accept_encoding:
+        return "br"
+    if "gzip" in accept_encoding:
+        return "gzip"
+    return None
+
+
+def compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def compress_cached(key, data, encoding):
+    """``compress`` with the result kept under ``key``, or without caching when key is None."""
+    if key is None:
+        return compress(data, encoding)
+    with compressed_cache_lock:
+        body = compressed_cache.get(key)
+        if body is not None:
+            compressed_cache.move_to_end(key)
+            return body
+    body = compress(data, encoding)
+    with compressed_cache_lock:
+        compressed_cache[key] = body
+        while len(compressed_cache) > COMPRESSED_CACHE_SIZE:
+            compressed_cache.popitem(last=False)
+    return body
+
+
+def init_compression(app):
+    """Compress responses above COMPRESSION_THRESHOLD for clients that accept gzip or brotli."""
+    # Imported here so the codec itself works without Flask (python -m app.batch)
+    from flask import request
+
+    @app.before_request
+    def strip_encoding_from_etags():
+        # Routes compare If-None-Match with the ETag of the uncompressed body
+        header = request.environ.get("HTTP_IF_NONE_MATCH")
+        if header:
+            request.environ["bingo.if_none_match"] = header
+            request.environ["HTTP_IF_NONE_MATCH"] = ENCODED_ETAG.sub('"', header)
+
+    @app.after_request
+    def compress_response(response):
+        if (
+            response.direct_passthrough
+            or response.is_streamed
+            or response.status_code not in (200, 304)
+            or "Content-Encoding" in response.headers
+        ):
+            return response
+        encoding = pick_encoding(request.headers.get("Accept-Encoding", ""))
+        etag, weak = response.get_etag()
+        if response.status_code == 304:
+            # Answer with the ETag the client holds, which names the encoding it got
+            if etag and encoding and f'{etag}-{encoding}"' in request.environ.get("bingo.if_none_match", ""):
+                response.set_etag(f"{etag}-{encoding}", weak)
+            return response
+        if not (response.mimetype or "").startswith(COMPRESSIBLE_TYPES):
+            return response
+        response.vary.add("Accept-Encoding")
+        if encoding is None or (response.content_length or 0) < COMPRESSION_THRESHOLD:
+            return response
+        key = (request.full_path, etag, encoding) if etag and not weak else None
+        response.set_data(compress_cached(key, response.get_data(), encoding))
+        response.headers["Content-Encoding"] = encoding
+        if etag:
+            # The compressed body is a different byte sequence, so it gets its own validator
+            response.set_etag(f"{etag}-{encoding}", weak)
+        return response
@@ -0,0 +1,18 @@
+from flask.json.provider import JSONProvider
+from app.json_codec import dumpb, dumps, loads
+
+
+class CompactJSONProvider(JSONProvider):
+    """Flask JSON provider backed by ``app.json_codec``, for ``jsonify`` and ``request.get_json``."""
+
+    mimetype = "application/json"
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj)
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumpb(obj), mimetype=self.mimetype)
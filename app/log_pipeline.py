@@ -0,0 +1,166 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import time
+import traceback
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from app.metrics import current_operation, log_records_dropped_total
+
+LOG_DIR = "logs"
+LOG_FILE = os.path.join(LOG_DIR, "music_bingo.log")
+# Default: DEBUG in development, INFO in production
+LOG_LEVEL = os.getenv("LOG_LEVEL")
+# "json" writes one JSON object per line; "text" the classic one-line format
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# Rotate at 10 MB and keep five old files
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+# Records waiting for the writer; when it falls behind, new records are dropped and counted
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Fraction of records kept per category, e.g. "engineio=0.01,request_body=0";
+# warnings and errors are always kept
+DEFAULT_SAMPLE_RATES = {"engineio": 0.01, "socketio": 0.1, "request_body": 0.05}
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
+# Attributes every LogRecord has; anything else was passed as extra= and goes into the JSON
+STANDARD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "category", "operation"}
+
+listener = None
+
+
+def parse_sample_rates(spec):
+    rates = dict(DEFAULT_SAMPLE_RATES)
+    for item in spec.split(","):
+        if "=" in item:
+            category, rate = item.split("=", 1)
+            rates[category.strip()] = float(rate)
+    return rates
+
+
+def record_category(record):
+    """An explicit ``extra={"category": ...}``, else the top-level logger name (engineio, socketio, app, ...)."""
+    return getattr(record, "category", None) or record.name.split(".", 1)[0]
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a random fraction of the records of chatty categories."""
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        category = record_category(record)
+        rate = self.rates.get(category, 1.0)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        log_records_dropped_total.inc(category, "sampled")
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that never waits: records arriving while the queue is full are dropped.
+
+    Only the message is rendered on the calling thread (its arguments may
+    change after the call returns); formatting and file I/O happen on the
+    listener's thread.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        record.category = record_category(record)
+        record.operation = current_operation()
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped_total.inc(record.category, "queue_full")
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "category": getattr(record, "category", record.name),
+            "operation": getattr(record, "operation", None),
+            "message": record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in STANDARD_ATTRIBUTES)
+        if record.exc_info:
+            entry["exception"] = "".join(traceback.format_exception(*record.exc_info))
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(server_mode="development"):
+    """Send every log record through a queue to one background writer.
+
+    Application, Flask, Socket.IO and engine.io loggers all propagate to a
+    single queue handler on the root logger; the writer thread appends to a
+    rotating file and echoes to the console (only warnings in production).
+    Safe to call more than once.
+    """
+    global listener
+    if listener is not None:
+        return listener
+    os.makedirs(LOG_DIR, exist_ok=True)
+    level = LOG_LEVEL or ("INFO" if server_mode == "production" else "DEBUG")
+
+    file_handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT)
+    if LOG_FORMAT == "json":
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        file_handler.setFormatter(logging.Formatter(
+            "%(asctime)s %(levelname)s [%(category)s %(operation)s]: %(message)s [in %(pathname)s:%(lineno)d]"
+        ))
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    console_handler.setLevel(logging.WARNING if server_mode == "production" else logging.NOTSET)
+
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(parse_sample_rates(LOG_SAMPLE_RATES)))
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(LOG_LEVEL or logging.INFO)
+    # Debug records from the app itself, not from every library it uses
+    logging.getLogger("app").setLevel(level)
+    if server_mode == "production":
+        # The app's own access records replace werkzeug's per-request lines
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)
+
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    # Write out what is still queued when the process exits
+    atexit.register(stop_logging)
+    return listener
+
+
+def stop_logging():
+    """Write out the queued records and stop the writer thread."""
+    global listener
+    if listener is not None:
+        listener.stop()
+        listener = None
+
+
+def packet_logger(name, enabled):
+    """The logger to hand Socket.IO/engine.io instead of ``True``/``False``.
+
+    With a bool they attach their own console handler and write every
+    packet synchronously; this logger propagates into the queue instead.
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO if enabled else logging.ERROR)
+    return logger
@@ -0,0 +1,230 @@
+import re
+import time
+from bisect import bisect_left
+from functools import wraps
+from threading import Lock, current_thread, local
+
+# Latency buckets in seconds, from a fast in-memory route up to a long PDF render
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Lock waits and holds are mostly far below a millisecond
+LOCK_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+# Spotify object ids in API paths; replaced so each endpoint is one label value
+SPOTIFY_ID = re.compile(r"/[0-9A-Za-z]{22}(?=/|$)")
+
+# What the current thread (or greenlet, under gevent) is doing: "http:<endpoint>" during a
+# request, "socket:<event>" in a Socket.IO handler; used to attribute lock and save times
+operation = local()
+
+
+def current_operation():
+    name = getattr(operation, "name", None)
+    if name:
+        return name
+    # The app's own background threads are all named bingo-*
+    thread_name = current_thread().name
+    return thread_name if thread_name.startswith("bingo-") else "other"
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.values = {}
+        self.lock = Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            values = sorted(self.values.items())
+        for label_values, value in values:
+            lines.append(f"{self.name}{format_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Histogram:
+    """Bucketed observations per label set.
+
+    ``observe`` bumps one bucket; the cumulative counts Prometheus expects are
+    only summed up when the metrics are rendered.
+    """
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self.series = {}
+        self.lock = Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            series = sorted((label_values, (list(counts), total)) for label_values, (counts, total) in self.series.items())
+        for label_values, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                labels = format_labels(self.labels + ("le",), label_values + (str(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in zip(names, values)) + "}"
+
+
+http_request_seconds = Histogram(
+    "bingo_http_request_seconds", "HTTP request latency per route.", ("endpoint", "method"),
+)
+http_requests_total = Counter(
+    "bingo_http_requests_total", "HTTP responses per route and status.", ("endpoint", "method", "status"),
+)
+socketio_event_seconds = Histogram(
+    "bingo_socketio_event_seconds", "Socket.IO handler latency per event.", ("event",),
+)
+socketio_event_errors_total = Counter(
+    "bingo_socketio_event_errors_total", "Socket.IO handlers that raised, per event.", ("event",),
+)
+state_lock_wait_seconds = Histogram(
+    "bingo_state_lock_wait_seconds", "Time spent waiting to acquire the game state lock, per operation.",
+    ("operation",), buckets=LOCK_BUCKETS,
+)
+state_lock_hold_seconds = Histogram(
+    "bingo_state_lock_hold_seconds", "Time the game state lock was held, per operation.",
+    ("operation",), buckets=LOCK_BUCKETS,
+)
+state_save_seconds = Histogram(
+    "bingo_state_save_seconds", "Time to write game_state.json, per operation.", ("operation",),
+)
+state_save_bytes_total = Counter(
+    "bingo_state_save_bytes_total", "Bytes written to game_state.json.",
+)
+spotify_request_seconds = Histogram(
+    "bingo_spotify_request_seconds", "Spotify Web API latency per endpoint.", ("method", "endpoint"),
+)
+spotify_errors_total = Counter(
+    "bingo_spotify_errors_total", "Spotify Web API error responses per endpoint and status (429 is rate limiting).",
+    ("method", "endpoint", "status"),
+)
+pdf_card_render_seconds = Histogram(
+    "bingo_pdf_card_render_seconds", "Time to render one card page of a cards PDF.",
+)
+log_records_dropped_total = Counter(
+    "bingo_log_records_dropped_total", "Log records not written, per category and reason (sampled or queue_full).",
+    ("category", "reason"),
+)
+display_events_total = Counter(
+    "bingo_display_events_total", "Display stream events serialized, per type (once per change, not per client).",
+    ("type",),
+)
+display_stream_connections_total = Counter(
+    "bingo_display_stream_connections_total", "Display stream connections opened and closed; the difference is the number open.",
+    ("event",),
+)
+
+METRICS = (
+    http_request_seconds, http_requests_total, socketio_event_seconds, socketio_event_errors_total,
+    state_lock_wait_seconds, state_lock_hold_seconds, state_save_seconds, state_save_bytes_total,
+    spotify_request_seconds, spotify_errors_total, pdf_card_render_seconds, log_records_dropped_total,
+    display_events_total, display_stream_connections_total,
+)
+
+
+def render_metrics():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class TimedLock:
+    """A Lock that records how long callers wait for it and how long it is held.
+
+    Both are attributed to the caller's current operation. It has the plain
+    Lock interface, so a Condition can be built on it. ``lock`` replaces the
+    underlying Lock with anything that has the same interface.
+    """
+
+    def __init__(self, wait_histogram, hold_histogram, lock=None):
+        self.lock = lock or Lock()
+        self.wait_histogram = wait_histogram
+        self.hold_histogram = hold_histogram
+        self.acquired_at = 0.0
+        self.holder = None
+
+    def acquire(self, blocking=True, timeout=-1):
+        start = time.perf_counter()
+        acquired = self.lock.acquire(blocking, timeout)
+        if acquired:
+            self.acquired_at = time.perf_counter()
+            self.holder = current_operation()
+            self.wait_histogram.observe(self.acquired_at - start, self.holder)
+        return acquired
+
+    def release(self):
+        held = time.perf_counter() - self.acquired_at
+        holder = self.holder
+        self.lock.release()
+        self.hold_histogram.observe(held, holder)
+
+    def locked(self):
+        return self.lock.locked()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+def timed_socket_handler(event, handler):
+    """Wrap a Socket.IO handler so its latency and failures are recorded under ``event``."""
+    name = f"socket:{event}"
+
+    @wraps(handler)
+    def wrapper(*args):
+        start = time.perf_counter()
+        outer = getattr(operation, "name", None)
+        operation.name = name
+        try:
+            return handler(*args)
+        except Exception:
+            socketio_event_errors_total.inc(event)
+            raise
+        finally:
+            operation.name = outer
+            socketio_event_seconds.observe(time.perf_counter() - start, event)
+    return wrapper
+
+
+def record_spotify_response(response, *args, **kwargs):
+    """requests response hook for the Spotify client's session."""
+    request = response.request
+    path = request.path_url.split("?", 1)[0]
+    endpoint = SPOTIFY_ID.sub("/{id}", path)
+    spotify_request_seconds.observe(response.elapsed.total_seconds(), request.method, endpoint)
+    if response.status_code >= 400:
+        spotify_errors_total.inc(request.method, endpoint, str(response.status_code))
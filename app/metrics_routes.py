@@ -0,0 +1,34 @@
+import time
+from flask import Blueprint, g, request
+from app.metrics import render_metrics, http_request_seconds, http_requests_total, operation
+
+bp = Blueprint("metrics", __name__)
+
+
+@bp.route("/metrics", methods=["GET"])
+def metrics():
+    """All metrics in the Prometheus text format."""
+    return render_metrics(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+
+def init_request_metrics(app):
+    """Time every request and count responses per route and status."""
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+        # Lock and save times during the request are attributed to its route
+        operation.name = f"http:{request.endpoint or 'unmatched'}"
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop("request_started", None)
+        if started is not None:
+            # Unmatched URLs share one label so random paths cannot blow up the series count
+            endpoint = request.endpoint or "unmatched"
+            http_request_seconds.observe(time.perf_counter() - started, endpoint, request.method)
+            http_requests_total.inc(endpoint, request.method, str(response.status_code))
+        return response
+
+    @app.teardown_request
+    def clear_operation(exc=None):
+        operation.name = None
@@ -7,16 +7,23 @@ from reportlab.platypus import (
     TableStyle,
     Paragraph,
     PageBreak,
+    Image,
 )
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER
+import time
 from io import BytesIO
+from app.card_images import make_qr_png
+from app.metrics import pdf_card_render_seconds
+
+QR_SIZE = 64
 
 
 class BingoCardPDF:
-    def __init__(self, cards):
+    def __init__(self, cards, view_url=None):
         self.cards = cards
+        self.view_url = view_url
         self.buffer = BytesIO()
         self.page_width, self.page_height = landscape(A4)
         self.doc = SimpleDocTemplate(
@@ -108,21 +115,62 @@ class BingoCardPDF:
         table.setStyle(table_style)
         return table
 
-    def generate(self):
+    def create_title(self, card_id):
+        """Page title, with a QR code linking to the card's phone view when a view URL is set."""
+        title = Paragraph("Foute Muziek Bingo", self.title_style)
+        if not self.view_url:
+            return title
+        qr = Image(BytesIO(make_qr_png(self.view_url.format(card_id=card_id))), width=QR_SIZE, height=QR_SIZE)
+        content_width = self.page_width - 60
+        table = Table(
+            [["", title, qr]],
+            colWidths=[QR_SIZE, content_width - 2 * QR_SIZE, QR_SIZE],
+            rowHeights=[QR_SIZE + 8],
+        )
+        table.setStyle(TableStyle([
+            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
+        ]))
+        return table
+
+    def generate(self, progress=None):
+        """Build the PDF. ``progress(done, total)`` is called after each rendered card page."""
         elements = []
+        # Per card: time to build its flowables plus time to lay out its page
+        prepared = []
         for card_id, card_data in self.cards.items():
+            start = time.perf_counter()
             elements.extend(
                 [
-                    Paragraph("Foute Muziek Bingo", self.title_style),
+                    self.create_title(card_id),
                     self.create_card_table(card_id, card_data),
                     Paragraph(f"Card ID: {card_id}", self.title_style),
                     PageBreak(),
                 ]
             )
+            prepared.append(time.perf_counter() - start)
+        total = len(self.cards)
+        page_ends = []
+
+        def on_page_end():
+            # The doc template's afterPage hook runs once a page's flowables are drawn
+            page_ends.append(time.perf_counter())
+            if progress:
+                progress(min(len(page_ends), total), total)
+
+        self.doc.afterPage = on_page_end
+        page_start = time.perf_counter()
         self.doc.build(elements)
+        for i, seconds in enumerate(prepared):
+            if i < len(page_ends):
+                seconds += page_ends[i] - page_start
+                page_start = page_ends[i]
+            pdf_card_render_seconds.observe(seconds)
         return self.buffer.getvalue()
 
 
-def generate_pdf(cards):
-    pdf_generator = BingoCardPDF(cards)
-    return pdf_generator.generate()
+def generate_pdf(cards, progress=None, view_url=None):
+    """Render all cards. ``view_url`` is a format string with ``{card_id}`` used for QR codes."""
+    pdf_generator = BingoCardPDF(cards, view_url=view_url)
+    return pdf_generator.generate(progress=progress)
@@ -1,8 +1,8 @@
 from flask import Blueprint, jsonify, current_app
 from app.spotify import get_spotify_client, refresh_spotify_token, pause_playback
 from app.state import game_state
-import random
 from app.helpers import handle_error
+from app.socket_handler import publish_card_changes, publish_play
 
 bp = Blueprint("playback", __name__)
 
@@ -14,16 +14,11 @@ def api_play():
         if not sp:
             return jsonify({"error": "Not logged in"}), 401
         refresh_spotify_token()
-        state = game_state.get_state()
-        if not state.get("unplayed_tracks"):
+        play = game_state.play_track(publish=publish_play)
+        if not play:
             return jsonify({"error": "No unplayed tracks available"}), 400
-        track = random.choice(state["unplayed_tracks"])
-        def update_track_lists(state):
-            if track in state["unplayed_tracks"]:
-                state["unplayed_tracks"].remove(track)
-            if track not in state["played_tracks"]:
-                state["played_tracks"].append(track)
-        game_state.update_state(update_track_lists)
+        track = play["track"]
+        publish_card_changes(play["changed_cards"])
         devices = sp.devices()
         active_device = next((d for d in devices["devices"] if d["is_active"]), None)
         if not active_device:
@@ -1,8 +1,10 @@
 from flask import Blueprint, jsonify, request, current_app
 from app.spotify import get_spotify_client, refresh_spotify_token, load_playlist_tracks
 from app.state import game_state, load_playlists, save_playlists
-import random
+from app.utils import select_game_tracks
 from app.helpers import handle_error
+from app.jobs import job_manager
+from app.socket_handler import publish_delta
 
 bp = Blueprint("playlist", __name__)
 
@@ -64,9 +66,37 @@ def api_remove_playlist():
     except Exception as e:
         return handle_error(e)
 
+def commit_playlist_tracks(playlist_id, tracks):
+    """Select up to GAME_TRACKS random tracks for a fresh game and return how many were loaded."""
+    selected = select_game_tracks(tracks)
+    def update_game_state(state):
+        state["unplayed_tracks"] = list(selected)
+        state["played_tracks"] = []
+        state["cards"] = {}
+        state["current_playlist"] = playlist_id
+        state["num_tracks"] = len(state["unplayed_tracks"])
+        return state["num_tracks"]
+    _, num_tracks = game_state.mutate(update_game_state, event=lambda _: {
+        "type": "playlist_loaded", "playlist_id": playlist_id, "tracks": selected,
+    }, publish=lambda version, _: publish_delta(version, {"type": "reset"}))
+    return num_tracks
+
+def load_playlist_job(job, sp, playlist_id):
+    """Background job: fetch all playlist pages from Spotify and load them into the game."""
+    tracks = load_playlist_tracks(sp, playlist_id, progress=job.report)
+    if not tracks:
+        raise Exception("No tracks found in playlist")
+    job.check_cancelled()
+    tracks_loaded = commit_playlist_tracks(playlist_id, tracks)
+    return {
+        "message": f"Loaded {len(tracks)} tracks from playlist, selected {tracks_loaded} for the game",
+        "tracks_available": len(tracks),
+        "tracks_loaded": tracks_loaded,
+    }
+
 @bp.route("/api/load_playlist", methods=["POST"])
 def api_load_playlist():
-    """Load tracks from a playlist into the game state."""
+    """Load tracks from a playlist into the game state. Pass ``"background": true`` to run it as a job."""
     try:
         data = request.json
         playlist_id = data.get("playlist_id")
@@ -74,21 +104,20 @@ def api_load_playlist():
             return jsonify({"error": "No playlist_id provided"}), 400
         sp = get_spotify_client()
         refresh_spotify_token()
+        if data.get("background"):
+            job = job_manager.submit(
+                "load_playlist", load_playlist_job, sp, playlist_id,
+                description=f"Loading playlist {playlist_id}",
+            )
+            return jsonify({"message": "Playlist loading started", "job": job.to_dict()}), 202
         tracks = load_playlist_tracks(sp, playlist_id)
         if not tracks:
             return jsonify({"error": "No tracks found in playlist"}), 400
-        def update_game_state(state):
-            state["unplayed_tracks"] = random.sample(tracks, min(100, len(tracks)))
-            state["played_tracks"] = []
-            state["cards"] = {}
-            state["current_playlist"] = playlist_id
-            state["num_tracks"] = len(state["unplayed_tracks"])
-        game_state.update_state(update_game_state)
-        updated_state = game_state.get_state()
+        tracks_loaded = commit_playlist_tracks(playlist_id, tracks)
         return jsonify({
-            "message": f"Loaded {len(tracks)} tracks from playlist, selected {updated_state['num_tracks']} for the game",
+            "message": f"Loaded {len(tracks)} tracks from playlist, selected {tracks_loaded} for the game",
             "tracks_available": len(tracks),
-            "tracks_loaded": updated_state["num_tracks"],
+            "tracks_loaded": tracks_loaded,
         })
     except Exception as e:
         return handle_error(e)
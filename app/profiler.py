@@ -0,0 +1,98 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# Longest profile one request may ask for, and the sampling interval bounds in milliseconds
+MAX_PROFILE_SECONDS = 60
+DEFAULT_INTERVAL_MS = 10
+MIN_INTERVAL_MS = 1
+
+
+def _native_threading():
+    """start_new_thread, get_ident and sleep that bypass gevent/eventlet monkey patching.
+
+    The sampler must run on a real OS thread: a green thread would only get
+    to sample when the code being profiled yields.
+    """
+    try:
+        from gevent import monkey
+
+        if monkey.is_module_patched("threading"):
+            start_new_thread, get_ident = monkey.get_original("_thread", ["start_new_thread", "get_ident"])
+            return start_new_thread, get_ident, monkey.get_original("time", "sleep")
+    except ImportError:
+        pass
+    try:
+        from eventlet import patcher
+
+        if patcher.is_monkey_patched("thread"):
+            native_thread = patcher.original("_thread")
+            return native_thread.start_new_thread, native_thread.get_ident, patcher.original("time").sleep
+    except ImportError:
+        pass
+    import _thread
+
+    return _thread.start_new_thread, _thread.get_ident, time.sleep
+
+
+def frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples every thread's stack at a fixed interval for a limited time.
+
+    The result is in the folded-stack format (``thread;outer;...;inner count``
+    per line) read by flamegraph.pl, speedscope and most flamegraph viewers.
+    Only one profile runs at a time.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+    def profile(self, seconds, interval_ms=DEFAULT_INTERVAL_MS):
+        """Folded stacks and sample count for ``seconds`` of sampling, or None if a profile is already running."""
+        if not self.lock.acquire(blocking=False):
+            return None
+        try:
+            start_new_thread, get_ident, native_sleep = _native_threading()
+            result = {}
+            start_new_thread(self._sample, (seconds, interval_ms / 1000, get_ident, native_sleep, result))
+            # Waiting with the (possibly patched) sleep keeps other green threads running meanwhile
+            while "stacks" not in result:
+                time.sleep(0.05)
+            return result
+        finally:
+            self.lock.release()
+
+    def _sample(self, seconds, interval, get_ident, sleep, result):
+        own_id = get_ident()
+        stacks = Counter()
+        samples = 0
+        deadline = time.monotonic() + seconds
+        try:
+            while time.monotonic() < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_id:
+                        continue
+                    labels = []
+                    while frame is not None:
+                        labels.append(frame_label(frame.f_code))
+                        frame = frame.f_back
+                    labels.append(names.get(thread_id, f"thread-{thread_id}"))
+                    stacks[";".join(reversed(labels))] += 1
+                samples += 1
+                sleep(interval)
+        finally:
+            result["samples"] = samples
+            result["stacks"] = stacks
+
+    @staticmethod
+    def folded(stacks):
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+profiler = SamplingProfiler()
@@ -0,0 +1,113 @@
+"""Rebuild a game state from an event log.
+
+    python -m app.replay logs/events/night_20240101_200000.jsonl --until-version 120 --output state.json
+    python -m app.replay logs/events/night_20240101_200000.jsonl --verify game_state.json
+
+Events are applied with the same track registry and near-win logic the
+server uses, so replaying a whole log reproduces the saved state exactly.
+"""
+import argparse
+import copy
+import json
+import sys
+
+from app.card_status import NearWinIndex, mark_track
+from app.events import read_events
+from app.json_codec import dump_file, load_file
+from app.state import DEFAULT_GAME_STATE
+from app.tracks import TrackRegistry
+
+
+class Replayer:
+    """Applies logged events to a private state, registry and near-win index."""
+
+    def __init__(self):
+        self.state = None
+        self.tracks = TrackRegistry()
+        self.near_wins = NearWinIndex()
+
+    def apply(self, event):
+        handler = getattr(self, f"_apply_{event['type']}", None)
+        if handler is None:
+            raise ValueError(f"Unknown event type: {event['type']}")
+        handler(event)
+        self.state["version"] = event["version"]
+
+    def _apply_initial_state(self, event):
+        self.state = copy.deepcopy(event["state"])
+
+    def _apply_game_loaded(self, event):
+        self.state.update(copy.deepcopy(event["state"]))
+
+    def _apply_game_reset(self, event):
+        self.state = copy.deepcopy(DEFAULT_GAME_STATE)
+
+    def _apply_playlist_loaded(self, event):
+        self.state["unplayed_tracks"] = copy.deepcopy(event["tracks"])
+        self.state["played_tracks"] = []
+        self.state["cards"] = {}
+        self.state["current_playlist"] = event["playlist_id"]
+        self.state["num_tracks"] = len(event["tracks"])
+
+    def _apply_cards_generated(self, event):
+        self.state["cards"] = copy.deepcopy(event["cards"])
+
+    def _apply_track_played(self, event):
+        self.tracks.sync(self.state)
+        if self.tracks.play(event["track_id"]) is None:
+            raise ValueError(f"Track {event['track_id']} is not unplayed at version {event['version']}")
+        mark_track(self.state["cards"], event["track_id"], index=self.near_wins)
+
+    def _apply_card_checked(self, event):
+        card = self.state["cards"][event["card_id"]]
+        card["matches"] = list(event["matches"])
+        self.near_wins.set_matches(self.state["cards"], event["card_id"], card["matches"])
+        card["bingo_status"] = "BINGO!" if self.near_wins.cells_to_bingo(event["card_id"]) == 0 else "No bingo"
+
+
+def rebuild(events, until_version=None, until_time=None):
+    """The state after the last event at or before ``until_version``/``until_time``."""
+    replayer = Replayer()
+    for event in events:
+        if until_version is not None and event["version"] > until_version:
+            break
+        if until_time is not None and event["time"] > until_time:
+            break
+        replayer.apply(event)
+    return replayer.state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", help="event log file")
+    parser.add_argument("--until-version", type=int)
+    parser.add_argument("--until-time", type=float, help="unix timestamp")
+    parser.add_argument("--output", help="write the rebuilt state to this file")
+    parser.add_argument("--verify", help="compare the rebuilt state with this game_state.json")
+    args = parser.parse_args()
+
+    events = read_events(args.log)
+    state = rebuild(events, args.until_version, args.until_time)
+    counts = {}
+    for event in events:
+        counts[event["type"]] = counts.get(event["type"], 0) + 1
+    print(json.dumps({"events": counts, "version": state.get("version")}), file=sys.stderr)
+    if args.output:
+        dump_file(state, args.output)
+    if args.verify:
+        expected = load_file(args.verify)
+        if normalize(state) != normalize(expected):
+            print(f"Rebuilt state differs from {args.verify}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Rebuilt state matches {args.verify}", file=sys.stderr)
+
+
+def normalize(state):
+    """Comparable form: unplayed_tracks is a pool, not a sequence."""
+    state = copy.deepcopy(state)
+    state["unplayed_tracks"] = sorted(state.get("unplayed_tracks", []), key=lambda track: track["id"])
+    return state
+
+
+if __name__ == "__main__":
+    main()
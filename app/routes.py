@@ -1,19 +1,48 @@
-from flask import Blueprint, request, current_app
+import logging
+import time
+from flask import g, request, current_app
 from app.game_management import bp as game_management_bp
 
+# Request bodies are cut off at this many bytes in the log
+MAX_LOGGED_BODY = 2048
 
-def log_request_info():
-    """Centralized request logging for all routes."""
-    current_app.logger.info("Headers: %s", request.headers)
-    current_app.logger.info("Body: %s", request.get_data())
 
+class LoggedBody:
+    """The request body, read only if its record survives sampling."""
 
-bp = Blueprint("routes", __name__)
+    def __init__(self, req):
+        self.request = req
 
+    def __str__(self):
+        return repr(self.request.get_data()[:MAX_LOGGED_BODY])
 
-@bp.before_request
-def before_request():
-    log_request_info()
+
+def init_request_logging(app):
+    """Centralized request logging for all routes: one structured record per request.
+
+    Headers and bodies are logged at DEBUG under the sampled
+    ``request_body`` category.
+    """
+    @app.before_request
+    def log_request_info():
+        g.log_started = time.perf_counter()
+        if current_app.logger.isEnabledFor(logging.DEBUG):
+            current_app.logger.debug(
+                "Headers: %s Body: %s", dict(request.headers), LoggedBody(request), extra={"category": "request_body"},
+            )
+
+    @app.after_request
+    def log_response(response):
+        started = g.pop("log_started", None)
+        duration_ms = round((time.perf_counter() - started) * 1000, 2) if started is not None else None
+        current_app.logger.info(
+            "%s %s %s", request.method, request.path, response.status_code,
+            extra={
+                "category": "access", "method": request.method, "path": request.path,
+                "status": response.status_code, "duration_ms": duration_ms,
+            },
+        )
+        return response
 
 
 def register_blueprints(app):
@@ -28,6 +57,11 @@ def register_blueprints(app):
     from app.playback_routes import bp as playback_bp
     from app.game_routes import bp as game_bp
     from app.sound_routes import bp as sound_bp
+    from app.job_routes import bp as job_bp
+    from app.metrics_routes import bp as metrics_bp
+    from app.admin_routes import bp as admin_bp
+    from app.static_routes import bp as static_bp
+    from app.display_routes import bp as display_bp
 
     # Register all blueprints with their prefixes
     app.register_blueprint(auth_bp, url_prefix="/auth")
@@ -39,4 +73,12 @@ def register_blueprints(app):
     app.register_blueprint(playback_bp, url_prefix="/playback")
     app.register_blueprint(game_bp, url_prefix="/game")
     app.register_blueprint(game_management_bp, url_prefix='/game_management')
-    app.register_blueprint(sound_bp, url_prefix='/sound')
\ No newline at end of file
+    app.register_blueprint(sound_bp, url_prefix='/sound')
+    app.register_blueprint(job_bp, url_prefix='/jobs')
+    # Prometheus scrapes /metrics at the root
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(admin_bp, url_prefix='/admin')
+    # static/ is served from memory with content-hashed URLs instead of Flask's static route
+    app.register_blueprint(static_bp, url_prefix='/static')
+    # Server-Sent Events for read-only displays
+    app.register_blueprint(display_bp, url_prefix='/display')
\ No newline at end of file
@@ -0,0 +1,145 @@
+import gzip
+import json
+import os
+from datetime import datetime
+from threading import Lock
+from app.json_codec import compress, dumpb, loads
+
+SAVED_GAMES_DIR = "saved_games"
+# Sidecar index of save headers, kept next to the saves
+INDEX_FILE = ".index.json"
+SAVE_EXTENSION = ".bingo"
+# Saves written before the compressed format; still listed and loaded
+LEGACY_EXTENSION = ".json"
+SAVE_MAGIC = b"BINGOSAVE 1\n"
+HEADER_FIELDS = ("name", "description", "timestamp")
+
+
+class SavedGameStore:
+    """Saved games on disk plus a sidecar index of their headers.
+
+    A save is a magic line, one line of JSON header and then the game state
+    as gzip-compressed compact JSON, so the header is read without touching
+    the payload. The index maps file names to headers and is reconciled with
+    a directory listing, so listing never parses a payload; a legacy
+    ``.json`` save is parsed once, when it is first seen.
+    """
+
+    def __init__(self, directory=SAVED_GAMES_DIR):
+        self.directory = directory
+        self.lock = Lock()
+
+    def path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def save(self, name, description, state, filename=None):
+        """Write a compressed save and index it; returns the file name."""
+        os.makedirs(self.directory, exist_ok=True)
+        now = datetime.now()
+        header = {"name": name, "description": description, "timestamp": now.isoformat()}
+        if filename is None:
+            filename = f"{name.replace(' ', '_')}_{now.strftime('%Y%m%d_%H%M%S')}{SAVE_EXTENSION}"
+        payload = compress(dumpb(state), "gzip")
+        temp_path = self.path(filename + ".tmp")
+        with open(temp_path, "wb") as f:
+            f.write(SAVE_MAGIC)
+            f.write(dumpb(header) + b"\n")
+            f.write(payload)
+        os.replace(temp_path, self.path(filename))
+        with self.lock:
+            index = self._read_index()
+            index[filename] = header
+            self._write_index(index)
+        return filename
+
+    def delete(self, filenames):
+        """Remove saves and their index entries."""
+        with self.lock:
+            index = self._read_index()
+            for filename in filenames:
+                try:
+                    os.remove(self.path(filename))
+                except FileNotFoundError:
+                    pass
+                index.pop(filename, None)
+            self._write_index(index)
+
+    def read_header(self, filename):
+        with open(self.path(filename), "rb") as f:
+            if filename.endswith(SAVE_EXTENSION):
+                if f.readline() != SAVE_MAGIC:
+                    raise ValueError(f"{filename} is not a saved game")
+                return loads(f.readline())
+            save_data = loads(f.read())
+            return {field: save_data[field] for field in HEADER_FIELDS}
+
+    def is_save_name(self, filename):
+        """A plain save file name in this directory; rejects paths such as ``../x.bingo`` or ``/tmp/x.bingo``."""
+        return (
+            isinstance(filename, str)
+            and os.path.basename(filename) == filename
+            and filename.endswith((SAVE_EXTENSION, LEGACY_EXTENSION))
+            and filename != INDEX_FILE
+        )
+
+    def load(self, filename):
+        """Header and game state of a save, or None if there is no such save."""
+        if not self.is_save_name(filename):
+            return None
+        path = self.path(filename)
+        if not os.path.isfile(path):
+            return None
+        with open(path, "rb") as f:
+            if filename.endswith(SAVE_EXTENSION):
+                if f.readline() != SAVE_MAGIC:
+                    raise ValueError(f"{filename} is not a saved game")
+                header = loads(f.readline())
+                return header, loads(gzip.decompress(f.read()))
+            save_data = loads(f.read())
+            return {field: save_data[field] for field in HEADER_FIELDS}, save_data["game_state"]
+
+    def list_games(self):
+        """Headers of all saves, newest first, from the index."""
+        with self.lock:
+            index = self._read_index()
+            filenames = self._save_files()
+            changed = False
+            for filename in filenames - index.keys():
+                try:
+                    index[filename] = self.read_header(filename)
+                except (OSError, ValueError, KeyError):
+                    continue
+                changed = True
+            for filename in index.keys() - filenames:
+                del index[filename]
+                changed = True
+            if changed:
+                self._write_index(index)
+        games = [{"filename": filename, **header} for filename, header in index.items()]
+        return sorted(games, key=lambda game: game["timestamp"], reverse=True)
+
+    def _save_files(self):
+        if not os.path.isdir(self.directory):
+            return set()
+        with os.scandir(self.directory) as entries:
+            return {
+                entry.name for entry in entries
+                if entry.name != INDEX_FILE and entry.name.endswith((SAVE_EXTENSION, LEGACY_EXTENSION))
+            }
+
+    def _read_index(self):
+        try:
+            with open(self.path(INDEX_FILE), "rb") as f:
+                return loads(f.read())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_index(self, index):
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = self.path(INDEX_FILE + ".tmp")
+        with open(temp_path, "wb") as f:
+            f.write(dumpb(index))
+        os.replace(temp_path, self.path(INDEX_FILE))
+
+
+saved_games = SavedGameStore()
@@ -0,0 +1,141 @@
+import fcntl
+import json
+import os
+import time
+from threading import Lock, RLock
+
+# Several server processes can run one game together: with BINGO_SHARED_STATE=1 every
+# state access also takes an exclusive lock on a file next to game_state.json and
+# picks up what other processes wrote since
+SHARED_STATE = os.getenv("BINGO_SHARED_STATE") == "1"
+# How often a process waiting for the file lock retries, and how often state
+# watchers look for writes made by other processes (seconds)
+LOCK_RETRY_INTERVAL = 0.002
+SHARED_POLL_INTERVAL = float(os.getenv("BINGO_SHARED_POLL_INTERVAL", "0.1"))
+
+
+class SharedFileLock:
+    """An exclusive flock on ``path``, re-entrant within the thread holding it.
+
+    The lock file also holds a generation number that writers bump, so
+    readers can tell cheaply whether another process changed the data it
+    guards. The flock is taken without blocking and retried with sleep, so
+    under gevent or eventlet a wait only parks the waiting green thread.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.local = RLock()
+        self.depth = 0
+        self.fd = None
+
+    def acquire(self):
+        self.local.acquire()
+        try:
+            if self.depth == 0:
+                if self.fd is None:
+                    self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                while True:
+                    try:
+                        fcntl.flock(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        time.sleep(LOCK_RETRY_INTERVAL)
+            self.depth += 1
+        except BaseException:
+            self.local.release()
+            raise
+
+    def release(self):
+        self.depth -= 1
+        if self.depth == 0:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self.local.release()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def generation(self):
+        """The generation stored in the lock file; call with the lock held."""
+        data = os.pread(self.fd, 32, 0).strip()
+        return int(data) if data else 0
+
+    def bump_generation(self):
+        generation = self.generation() + 1
+        os.pwrite(self.fd, f"{generation:020d}".encode(), 0)
+        return generation
+
+
+class SharedStateLock:
+    """The state lock of a process sharing its game: a thread lock plus the file lock.
+
+    ``on_acquire`` runs once both are held, which is where the state reloads
+    writes made by other processes. It keeps the plain Lock interface so
+    the game state's TimedLock and Condition can wrap it.
+    """
+
+    def __init__(self, file_lock, on_acquire):
+        self.lock = Lock()
+        self.file_lock = file_lock
+        self.on_acquire = on_acquire
+
+    def acquire(self, blocking=True, timeout=-1):
+        if not self.lock.acquire(blocking, timeout):
+            return False
+        try:
+            self.file_lock.acquire()
+        except BaseException:
+            self.lock.release()
+            raise
+        try:
+            self.on_acquire()
+        except BaseException:
+            self.release()
+            raise
+        return True
+
+    def release(self):
+        self.file_lock.release()
+        self.lock.release()
+
+    def locked(self):
+        return self.lock.locked()
+
+
+class RoomSequences:
+    """Per-room delta sequence numbers.
+
+    Kept in a dict, or with ``path`` in a JSON file under a SharedFileLock
+    so that processes sharing a game hand out one sequence per room.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.file_lock = SharedFileLock(path + ".lock") if path else None
+        self.values = {}
+
+    def next(self, room):
+        if self.file_lock is None:
+            seq = self.values[room] = self.values.get(room, 0) + 1
+            return seq
+        with self.file_lock:
+            values = self._read()
+            seq = values[room] = values.get(room, 0) + 1
+            with open(self.path, "w") as f:
+                json.dump(values, f)
+            return seq
+
+    def get(self, room):
+        if self.file_lock is None:
+            return self.values.get(room, 0)
+        with self.file_lock:
+            return self._read().get(room, 0)
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
@@ -0,0 +1,96 @@
+import logging
+import os
+import queue
+import time
+from threading import Lock
+
+# How long the sender waits for more card updates before flushing a batch
+COALESCE_WINDOW = float(os.getenv("SOCKET_COALESCE_WINDOW", "0.05"))
+
+logger = logging.getLogger(__name__)
+
+
+class SocketEmitter:
+    """Sends outgoing Socket.IO events from one dedicated background task.
+
+    Request handlers only enqueue, so a slow client never blocks them.
+    ``emit`` events go out in order as they are queued. ``coalesce`` events
+    are merged per (event, room) for ``window`` seconds: the last payload
+    per key wins and the group is sent as a single message, together with a
+    summary that is computed once per flush and shared by every room.
+    """
+
+    def __init__(self, socketio, window=COALESCE_WINDOW):
+        self.socketio = socketio
+        self.window = window
+        self.queue = queue.Queue()
+        self.summary_func = None
+        self.started = False
+        self.lock = Lock()
+
+    def start(self):
+        with self.lock:
+            if not self.started:
+                self.started = True
+                self.socketio.start_background_task(self._run)
+
+    def emit(self, event, payload, room=None):
+        self.queue.put(("emit", event, room, None, payload))
+
+    def coalesce(self, event, room, key, payload):
+        self.queue.put(("coalesce", event, room, key, payload))
+
+    def flush(self):
+        """Block until everything queued so far has been sent."""
+        if self.started:
+            self.queue.join()
+
+    def _collect(self):
+        first = self.queue.get()
+        batch = [first]
+        if first[0] == "coalesce":
+            deadline = time.monotonic() + self.window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+        else:
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                self._send(batch)
+            except Exception:
+                logger.exception("Error sending socket events")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _send(self, batch):
+        # Keep the order of first appearance; coalesced groups merge into one slot
+        slots, groups = [], {}
+        for kind, event, room, key, payload in batch:
+            if kind == "emit":
+                slots.append((event, room, payload))
+                continue
+            group = groups.get((event, room))
+            if group is None:
+                group = groups[(event, room)] = {}
+                slots.append((event, room, group))
+            group[key] = payload
+        summary = self.summary_func() if groups and self.summary_func else None
+        for event, room, payload in slots:
+            if (event, room) in groups and payload is groups[(event, room)]:
+                payload = {"items": payload, "summary": summary}
+            self.socketio.emit(event, payload, to=room)
@@ -1,19 +1,138 @@
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from flask import current_app
+from threading import Lock
 from app.state import game_state
 from app.helpers import handle_error
+from app.card_status import near_win_summary, near_win_leaderboard
+from app.socket_emitter import SocketEmitter
+from app.metrics import timed_socket_handler
+from app.shared_state import SHARED_STATE, RoomSequences
+from app.socket_queue import client_manager
+from app.log_pipeline import packet_logger
+from app import json_codec
 
 # Create SocketIO instance without app yet
 socketio = SocketIO()
+# All server-originated events go out through this sender task
+emitter = SocketEmitter(socketio)
+emitter.summary_func = lambda: game_state.read_state(lambda state: near_win_summary(state["cards"]))
 
-def init_socketio(app):
+# Room layout: the host dashboard sees everything, displays/projectors see
+# game-wide events, and a card room only hears about that card. Player phones
+# join the display room plus the room of their own card.
+HOST_ROOM = "host"
+DISPLAY_ROOM = "display"
+CARD_ROOM_PREFIX = "card:"
+# Change types forwarded to the display room
+DISPLAY_CHANGE_TYPES = ("track_played", "winner", "cards_regenerated", "reset")
+
+# Per-room sequence numbers so subscribers that only see part of the deltas can still detect gaps;
+# shared through a file when several processes run the game
+room_sequences = RoomSequences("room_sequences.json" if SHARED_STATE else None)
+publish_lock = Lock()
+# Most cards a paged request_game_state returns at once
+MAX_RESYNC_CARDS = 500
+
+def on_event(event):
+    """``socketio.on`` that also records the handler's latency on /metrics."""
+    def decorator(handler):
+        socketio.on(event)(timed_socket_handler(event, handler))
+        return handler
+    return decorator
+
+def card_room(card_id):
+    return f"{CARD_ROOM_PREFIX}{card_id}"
+
+def is_valid_room(room):
+    if room in (HOST_ROOM, DISPLAY_ROOM):
+        return True
+    return room.startswith(CARD_ROOM_PREFIX) and len(room) > len(CARD_ROOM_PREFIX)
+
+def init_socketio(app, async_mode=None, packet_logging=True):
     """Initialize SocketIO with the app and configure event handlers."""
-    socketio.init_app(app, cors_allowed_origins="*", logger=True, engineio_logger=True)
+    socketio.init_app(
+        app,
+        cors_allowed_origins="*",
+        async_mode=async_mode,
+        logger=packet_logger("socketio.server", packet_logging),
+        engineio_logger=packet_logger("engineio.server", packet_logging),
+        # Packets are encoded with the app's JSON codec; long-polling payloads above the
+        # threshold are compressed (websocket frames go out as they are)
+        json=json_codec,
+        compression_threshold=json_codec.COMPRESSION_THRESHOLD,
+        **client_manager(),
+    )
+    emitter.start()
+
+def route_changes(changes):
+    """Split changes into per-room lists: host gets all, displays and cards a subset."""
+    routed = {HOST_ROOM: list(changes)}
+    display_changes = [c for c in changes if c["type"] in DISPLAY_CHANGE_TYPES]
+    if display_changes:
+        routed[DISPLAY_ROOM] = display_changes
+    for change in changes:
+        if "card_id" in change:
+            routed.setdefault(card_room(change["card_id"]), []).append(change)
+    return routed
+
+def publish_delta(version, *changes):
+    """Fan out one state mutation as small versioned deltas to the rooms that need it.
+
+    Each change is a dict with a ``type`` (track_played, card_matches, winner,
+    cards_regenerated or reset) plus only the fields that changed. Call it
+    from the ``publish`` callback of a state mutation, while the state lock
+    is held, so deltas are queued in version order. The host
+    room receives every delta and can detect gaps through ``version``; the
+    display and player rooms get a filtered subset and use the per-room
+    ``seq`` instead. On a gap, clients resync with ``request_game_state``.
+    """
+    with publish_lock:
+        for room, room_changes in route_changes(changes).items():
+            _emit_to_room(room, version, room_changes)
+
+def _emit_to_room(room, version, changes):
+    seq = room_sequences.next(room)
+    emitter.emit("state_delta", {"version": version, "room": room, "seq": seq, "changes": changes}, room=room)
+
+def publish_card_changes(changed_cards):
+    """Queue card status updates; the sender batches them per room into one card_status_batch.
+
+    Both the host room and each card's own room get the update, with the
+    near-win/winner summary attached once per batch.
+    """
+    for card_id, status in changed_cards:
+        emitter.coalesce("card_status_batch", HOST_ROOM, card_id, status)
+        emitter.coalesce("card_status_batch", card_room(card_id), card_id, status)
+    if changed_cards:
+        publish_near_wins()
+
+def publish_near_wins():
+    """Send the host the cards closest to bingo; an O(k) read of the near-win index."""
+    leaderboard = game_state.read_state(lambda state: near_win_leaderboard(state["cards"]))
+    emitter.emit("near_wins", leaderboard, room=HOST_ROOM)
+
+def track_played_change(play):
+    """The delta for a play returned by ``game_state.play_track``."""
+    return {
+        "type": "track_played",
+        "track": play["track"],
+        "played_count": play["played_count"],
+        "remaining_count": play["remaining_count"],
+    }
+
+def play_changes(play):
+    """The deltas for a play: the track, then a ``winner`` per card that reached bingo with it."""
+    return [track_played_change(play)] + [
+        {"type": "winner", "card_id": card_id} for card_id in play["new_winners"]
+    ]
+
+def publish_play(version, play):
+    """``publish`` callback for ``game_state.play_track``: queue the play's deltas under the state lock."""
+    publish_delta(version, *play_changes(play))
 
 def check_bingo_status(card_id):
     """Check if a card has achieved bingo."""
-    state = game_state.get_state()
-    card = state["cards"].get(card_id)
+    card = game_state.get_card(card_id)
     if not card:
         return False
     matches = card.get("matches", [])
@@ -27,25 +146,22 @@ def check_bingo_status(card_id):
             return True
     return False
 
-@socketio.on("connect")
-def handle_connect():
+@on_event("connect")
+def handle_connect(auth=None):
     current_app.logger.info("WebSocket client connected.")
-    print("Client connected")
     emit("connection_status", {"status": "connected"})
 
-@socketio.on("disconnect")
+@on_event("disconnect")
 def handle_disconnect():
     current_app.logger.info("WebSocket client disconnected.")
-    print("Client disconnected")
 
-@socketio.on("card_validated")
+@on_event("card_validated")
 def handle_card_validation(data):
     card_id = data.get("card_id")
     if not card_id:
         emit("error", {"error": "No card ID provided"})
         return
-    state = game_state.get_state()
-    card = state["cards"].get(card_id)
+    card = game_state.get_card(card_id)
     if card:
         emit("card_status_update", {
             "card_id": card_id,
@@ -53,7 +169,7 @@ def handle_card_validation(data):
             "matches": card.get("matches", []),
         })
 
-@socketio.on("check_bingo")
+@on_event("check_bingo")
 def handle_check_bingo(data):
     card_id = data.get("card_id")
     if not card_id:
@@ -62,54 +178,84 @@ def handle_check_bingo(data):
     result = check_bingo_status(card_id)
     emit("bingo_result", {"card_id": card_id, "result": result})
 
-@socketio.on("track_played")
+@on_event("track_played")
 def handle_track_played(track_data):
     if not track_data:
         emit("error", {"error": "No track data provided"})
         return
     current_app.logger.info(f"Track played: {track_data}")
+    # Only echoed to the caller: the data comes from the client, track announcements go out as track_played deltas
     emit("new_track", track_data)
 
-@socketio.on("join")
+@on_event("join")
 def handle_join(data):
     room = data.get("room")
-    if room:
-        join_room(room)
-        current_app.logger.info(f"Client joined room: {room}")
-        emit("room_joined", {"room": room}, room=room)
-    else:
+    if not room:
         emit("error", {"error": "No room specified"})
+        return
+    if not is_valid_room(room):
+        emit("error", {"error": f"Unknown room: {room}"})
+        return
+    join_room(room)
+    current_app.logger.info(f"Client joined room: {room}")
+    emit("room_joined", {
+        "room": room,
+        "seq": room_sequences.get(room),
+        "version": game_state.version,
+    })
 
-@socketio.on("leave")
+@on_event("leave")
 def handle_leave(data):
     room = data.get("room")
     if room:
         leave_room(room)
         current_app.logger.info(f"Client left room: {room}")
-        emit("room_left", {"room": room}, room=room)
+        emit("room_left", {"room": room})
     else:
         emit("error", {"error": "No room specified"})
 
-@socketio.on("request_game_state")
-def handle_request_game_state():
-    state = game_state.get_state()
-    emit("game_state", state)
+@on_event("request_game_state")
+def handle_request_game_state(data=None):
+    """Full resync, or a paged one when ``cards_offset``/``cards_limit`` are given."""
+    if data is not None and not isinstance(data, dict):
+        emit("error", {"error": "request_game_state expects an object"})
+        return
+    if not data or "cards_limit" not in data:
+        emit("game_state", game_state.get_state())
+        return
+    try:
+        offset = max(int(data.get("cards_offset", 0)), 0)
+        limit = min(max(int(data["cards_limit"]), 0), MAX_RESYNC_CARDS)
+    except (TypeError, ValueError, OverflowError):
+        emit("error", {"error": "cards_offset and cards_limit must be integers"})
+        return
+    def read_page(state):
+        card_ids = list(state["cards"])
+        page_ids = card_ids[offset:offset + limit]
+        return {
+            "version": state.get("version", 0),
+            "bingo_mode": state.get("bingo_mode"),
+            "current_playlist": state.get("current_playlist"),
+            "played_tracks": state["played_tracks"],
+            "remaining_count": len(state["unplayed_tracks"]),
+            "total_cards": len(card_ids),
+            "cards_offset": offset,
+            "has_more": offset + limit < len(card_ids),
+            "winners": near_win_summary(state["cards"])["winners"],
+            "cards": {card_id: state["cards"][card_id] for card_id in page_ids},
+        }
+    emit("game_state_page", game_state.read_state(read_page))
 
-@socketio.on("play_track")
+@on_event("play_track")
 def handle_play_track(data):
     track_id = data.get("track_id")
     if not track_id:
         emit("error", {"error": "No track ID provided"})
         return
     current_app.logger.info(f"Requested to play track: {track_id}")
-    state = game_state.get_state()
-    track = next((t for t in state["unplayed_tracks"] if t["id"] == track_id), None)
-    if track:
-        def update_track_lists(state):
-            if track in state["unplayed_tracks"]:
-                state["unplayed_tracks"].remove(track)
-            state["played_tracks"].append(track)
-        game_state.update_state(update_track_lists)
-        emit("track_played", {"track_id": track_id, "track": track})
+    play = game_state.play_track(track_id, publish=publish_play)
+    if play:
+        emit("track_played", {"track_id": track_id, "track": play["track"]})
+        publish_card_changes(play["changed_cards"])
     else:
         emit("error", {"error": "Track not found in unplayed tracks"})
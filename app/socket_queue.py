@@ -0,0 +1,73 @@
+import fcntl
+import os
+import time
+from threading import Lock
+from urllib.parse import unquote, urlparse
+
+import socketio
+
+# Message queue that relays Socket.IO events between server processes, so a client
+# connected to one worker hears events emitted by any other: a redis:// URL, or
+# file:///some/dir for the single-machine stand-in below. Unset: one process only.
+SOCKETIO_MESSAGE_QUEUE = os.getenv("SOCKETIO_MESSAGE_QUEUE", "")
+# How often the file queue's reader looks for new messages (seconds)
+FILE_QUEUE_POLL_INTERVAL = float(os.getenv("SOCKETIO_FILE_QUEUE_POLL", "0.02"))
+
+
+class FileQueueManager(socketio.PubSubManager):
+    """Socket.IO client manager that relays messages through an append-only file.
+
+    Every process appends its messages as JSON lines to ``<directory>/<channel>.log``
+    and tails the same file for everyone else's. It needs no broker, which
+    makes it the stand-in for Redis on one machine and in local multi-worker
+    checks; the file only grows, so production deployments use Redis.
+    """
+
+    name = "file"
+
+    def __init__(self, directory, channel="socketio", write_only=False, logger=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{channel}.log")
+        self.fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.write_lock = Lock()
+
+    def _publish(self, data):
+        line = self.json.dumps(data).encode("utf-8") + b"\n"
+        with self.write_lock:
+            # One locked write per message, so lines from different processes never interleave
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                os.write(self.fd, line)
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    def _listen(self):
+        with open(self.path, "rb") as f:
+            # Only messages published from now on
+            f.seek(0, os.SEEK_END)
+            pending = b""
+            while True:
+                chunk = f.read()
+                if not chunk:
+                    time.sleep(FILE_QUEUE_POLL_INTERVAL)
+                    continue
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                for line in lines:
+                    if line:
+                        yield line.decode("utf-8")
+
+
+def client_manager(url=SOCKETIO_MESSAGE_QUEUE):
+    """Keyword arguments for ``SocketIO.init_app`` that connect it to the queue at ``url``.
+
+    file:// URLs get a FileQueueManager; anything else is passed on as
+    Flask-SocketIO's ``message_queue`` (redis://, kafka://, ...).
+    """
+    if not url:
+        return {}
+    parsed = urlparse(url)
+    if parsed.scheme == "file":
+        return {"client_manager": FileQueueManager(unquote(parsed.path))}
+    return {"message_queue": url}
@@ -0,0 +1,112 @@
+import hashlib
+import logging
+import mimetypes
+import os
+from threading import Event, Lock, Thread
+from urllib.parse import quote
+
+# Get the absolute path to the sounds directory
+SOUNDS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sounds'))
+SOUND_EXTENSIONS = ('.mp3', '.wav', '.ogg')
+# Seconds between checks of the sounds directory for added, removed or replaced files; 0 stops watching
+SOUND_WATCH_INTERVAL = float(os.getenv("SOUND_WATCH_INTERVAL", "5"))
+
+# Ensure proper MIME type registration
+mimetypes.add_type('audio/mpeg', '.mp3')
+mimetypes.add_type('audio/wav', '.wav')
+mimetypes.add_type('audio/ogg', '.ogg')
+
+logger = logging.getLogger(__name__)
+
+
+class SoundAsset:
+    """One sound file held in memory with its strong (content hash) ETag."""
+
+    def __init__(self, filename, data, stat):
+        self.filename = filename
+        self.data = data
+        self.mime_type = mimetypes.guess_type(filename)[0]
+        self.etag = hashlib.sha1(data).hexdigest()[:16]
+        self.signature = (stat.st_size, stat.st_mtime_ns)
+
+    def describe(self):
+        return {
+            "filename": self.filename,
+            "mime_type": self.mime_type,
+            "size": len(self.data),
+            "etag": self.etag,
+            "url": f"/sound/api/sounds/{quote(self.filename)}?v={self.etag}",
+        }
+
+
+class SoundLibrary:
+    """Index and bytes of the sounds directory, kept in memory.
+
+    The directory is scanned once on first use and then re-checked by a
+    watcher thread; a file is only read again when its size or mtime moves.
+    A rescan swaps in a new ``(manifest_etag, assets)`` pair instead of
+    mutating the old one, so requests read it without taking the lock.
+    """
+
+    def __init__(self, directory=SOUNDS_DIR, watch_interval=SOUND_WATCH_INTERVAL):
+        self.directory = directory
+        self.watch_interval = watch_interval
+        self.index = None
+        self.lock = Lock()
+        self.stop_event = Event()
+        self.thread = None
+
+    def start(self):
+        """Keep watching the directory for changes; the first index is built by the warm-up or on first use."""
+        with self.lock:
+            if self.thread is None and self.watch_interval > 0:
+                self.thread = Thread(target=self._watch, name="bingo-sounds", daemon=True)
+                self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _watch(self):
+        while not self.stop_event.wait(self.watch_interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Error refreshing sound library")
+
+    def refresh(self):
+        """Rescan the directory, rereading only new or changed files; returns True if anything changed."""
+        with self.lock:
+            current = self.index[1] if self.index else {}
+            assets = {}
+            if os.path.isdir(self.directory):
+                with os.scandir(self.directory) as entries:
+                    for entry in entries:
+                        if not entry.is_file() or not entry.name.lower().endswith(SOUND_EXTENSIONS):
+                            continue
+                        stat = entry.stat()
+                        asset = current.get(entry.name)
+                        if asset is None or asset.signature != (stat.st_size, stat.st_mtime_ns):
+                            with open(entry.path, "rb") as f:
+                                asset = SoundAsset(entry.name, f.read(), stat)
+                        assets[entry.name] = asset
+            if self.index is not None and assets == current:
+                return False
+            tags = ",".join(f"{name}:{assets[name].etag}" for name in sorted(assets))
+            self.index = (hashlib.sha1(tags.encode()).hexdigest()[:16], assets)
+            return True
+
+    def _index(self):
+        if self.index is None:
+            self.refresh()
+        return self.index
+
+    def get(self, filename):
+        return self._index()[1].get(filename)
+
+    def manifest(self):
+        """``(etag, sounds)`` for every sound, sorted by file name."""
+        etag, assets = self._index()
+        return etag, [assets[name].describe() for name in sorted(assets)]
+
+
+sound_library = SoundLibrary()
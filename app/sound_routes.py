@@ -1,62 +1,57 @@
-from flask import Blueprint, send_from_directory, jsonify, current_app
-import os
-import mimetypes
+from flask import Blueprint, jsonify, current_app, request
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
+from app.sound_library import sound_library
 
 bp = Blueprint("sound", __name__)
 
-# Get the absolute path to the sounds directory
-SOUNDS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sounds'))
-
-# Ensure proper MIME type registration
-mimetypes.add_type('audio/mpeg', '.mp3')
-mimetypes.add_type('audio/wav', '.wav')
-mimetypes.add_type('audio/ogg', '.ogg')
+# Versioned sound URLs (?v=<etag>) never change content, so browsers may keep them for a year
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
 
 @bp.route("/api/list_sounds", methods=["GET"])
 def list_sounds():
     """List all available sound files with their MIME types."""
     try:
-        # Ensure the sounds directory exists
-        if not os.path.exists(SOUNDS_DIR):
-            current_app.logger.error(f"Sounds directory not found: {SOUNDS_DIR}")
-            return jsonify({"error": "Sounds directory not found"}), 500
-
-        sounds = []
-        for filename in os.listdir(SOUNDS_DIR):
-            if filename.lower().endswith(('.mp3', '.wav', '.ogg')):
-                mime_type = mimetypes.guess_type(filename)[0]
-                sounds.append({
-                    'filename': filename,
-                    'mime_type': mime_type
-                })
-        
-        current_app.logger.info(f"Found {len(sounds)} sound files in {SOUNDS_DIR}")
-        return jsonify({"sounds": sorted(sounds, key=lambda x: x['filename'])})
+        _, sounds = sound_library.manifest()
+        return jsonify({"sounds": [{'filename': s['filename'], 'mime_type': s['mime_type']} for s in sounds]})
     except Exception as e:
         current_app.logger.error(f"Error listing sounds: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@bp.route("/api/manifest", methods=["GET"])
+def sound_manifest():
+    """Every sound with its size, ETag and versioned URL, so players can preload in one round trip."""
+    try:
+        etag, sounds = sound_library.manifest()
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = jsonify({"version": etag, "sounds": sounds})
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+    except Exception as e:
+        current_app.logger.error(f"Error building sound manifest: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 @bp.route("/api/sounds/<filename>")
 def serve_sound(filename):
-    """Serve a sound file with proper MIME type."""
+    """Serve a sound file from memory with a strong ETag and Range support."""
     try:
-        if not os.path.exists(SOUNDS_DIR):
-            current_app.logger.error(f"Sounds directory not found: {SOUNDS_DIR}")
-            return jsonify({"error": "Sounds directory not found"}), 500
-
-        # Check if file exists
-        file_path = os.path.join(SOUNDS_DIR, filename)
-        if not os.path.exists(file_path):
-            current_app.logger.error(f"Sound file not found: {file_path}")
+        asset = sound_library.get(filename)
+        if asset is None:
+            current_app.logger.error(f"Sound file not found: {filename}")
             return jsonify({"error": "Sound file not found"}), 404
 
-        mime_type = mimetypes.guess_type(filename)[0]
-        current_app.logger.debug(f"Serving sound file: {filename} ({mime_type})")
-        
-        response = send_from_directory(SOUNDS_DIR, filename)
-        if mime_type:
-            response.headers['Content-Type'] = mime_type
-        return response
+        response = current_app.response_class(asset.data, mimetype=asset.mime_type)
+        response.set_etag(asset.etag)
+        if request.args.get("v") == asset.etag:
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE
+        else:
+            # Unversioned URL: the file may be replaced, so revalidate against the ETag
+            response.headers["Cache-Control"] = "no-cache"
+        return response.make_conditional(request, accept_ranges=True, complete_length=len(asset.data))
+    except RequestedRangeNotSatisfiable as e:
+        return e
     except Exception as e:
         current_app.logger.error(f"Error serving sound file {filename}: {str(e)}")
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
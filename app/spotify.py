@@ -1,13 +1,17 @@
 import os
-from spotipy import Spotify
-from spotipy.oauth2 import SpotifyOAuth
 from flask import Blueprint, session, current_app, redirect, jsonify
+from app.jobs import JobCancelled
+from app.metrics import record_spotify_response
+from app.tracks import track_from_playlist_item
 
 bp = Blueprint("spotify", __name__)
 
 
 def get_spotify_oauth():
     """Initialize SpotifyOAuth."""
+    # spotipy is imported on first use to keep it off the startup path
+    from spotipy.oauth2 import SpotifyOAuth
+
     return SpotifyOAuth(
         client_id=os.getenv("SPOTIFY_CLIENT_ID"),
         client_secret=os.getenv("SPOTIFY_CLIENT_SECRET"),
@@ -24,7 +28,13 @@ def get_spotify_client():
     if not token_info:
         raise Exception("Spotify authentication required. Please log in again.")
     refresh_spotify_token()
-    return Spotify(auth=session["token_info"]["access_token"])
+    import requests
+    from spotipy import Spotify
+
+    # Every API response is timed and error statuses (429 included) are counted on /metrics
+    api_session = requests.Session()
+    api_session.hooks["response"].append(record_spotify_response)
+    return Spotify(auth=session["token_info"]["access_token"], requests_session=api_session)
 
 
 def refresh_spotify_token():
@@ -54,23 +64,22 @@ def get_available_devices(sp):
         raise Exception("Failed to get Spotify devices. Please try again.")
 
 
-def load_playlist_tracks(sp, playlist_id):
-    """Load tracks from a Spotify playlist."""
+def load_playlist_tracks(sp, playlist_id, progress=None):
+    """Load tracks from a Spotify playlist. ``progress(done, total)`` is called per page."""
     try:
         results = sp.playlist_items(playlist_id)
         tracks = []
         while results:
             tracks.extend(
-                {
-                    "id": track["track"]["id"],
-                    "name": track["track"]["name"],
-                    "artist": ", ".join(a["name"] for a in track["track"]["artists"]),
-                }
-                for track in results.get("items", [])
-                if track["track"]
+                track for track in map(track_from_playlist_item, results.get("items", []))
+                if track is not None
             )
+            if progress:
+                progress(results.get("offset", 0) + len(results.get("items", [])), results.get("total", 0))
             results = sp.next(results)  # Handle pagination
         return tracks
+    except JobCancelled:
+        raise
     except Exception as e:
         current_app.logger.error(f"Error loading playlist: {e}")
         raise Exception("Failed to load playlist tracks. Please try again.")
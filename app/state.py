@@ -1,21 +1,23 @@
 import json
 import os
 import copy
-from threading import Lock
+import time
+from threading import Lock, Condition
+from app.tracks import track_registry
+from app.card_status import mark_track, near_wins
+from app.events import EventLog
+from app.json_codec import dump_file, load_file
+from app.utils import DEFAULT_GAME_STATE
+from app.shared_state import SHARED_STATE, SHARED_POLL_INTERVAL, SharedFileLock, SharedStateLock
+from app.metrics import (
+    TimedLock, current_operation, state_lock_wait_seconds, state_lock_hold_seconds, state_save_seconds,
+    state_save_bytes_total,
+)
 
 # Paths for storing playlists and game state
 PLAYLISTS_FILE = "playlists.json"
 GAME_STATE_FILE = "game_state.json"
 
-# Default game state structure
-DEFAULT_GAME_STATE = {
-    "played_tracks": [],
-    "unplayed_tracks": [],
-    "cards": {},
-    "bingo_mode": "rowcoldiag",
-    "current_playlist": None,
-    "num_tracks": 0,
-}
 
 class ThreadSafeGameState:
     _instance = None
@@ -31,55 +33,259 @@ class ThreadSafeGameState:
 
     def __init__(self):
         if not getattr(self, "__initialized", False):
-            self.state_lock = Lock()
-            self.state = self.load_state()
+            # With BINGO_SHARED_STATE=1 the lock also excludes other server processes,
+            # and taking it reloads the state if one of them saved a newer one
+            self.file_lock = SharedFileLock(GAME_STATE_FILE + ".lock") if SHARED_STATE else None
+            # The generation of the saved state this process last read or wrote
+            self.generation = None
+            shared_lock = SharedStateLock(self.file_lock, self._reload_if_changed) if SHARED_STATE else None
+            # Wait and hold times are exported on /metrics
+            self.state_lock = TimedLock(state_lock_wait_seconds, state_lock_hold_seconds, lock=shared_lock)
+            # Signalled (with state_lock held) whenever the version moves
+            self.version_changed = Condition(self.state_lock)
+            self.events = EventLog()
+            # The saved state is read on first use rather than at import time;
+            # the server's warm-up thread normally gets there first
+            self.state = None
+            self._version = 0
+            self.loaded = False
+            self.load_lock = Lock()
             self.__initialized = True
 
+    def _wait_loaded(self):
+        """Load the saved state unless it is already in memory; other callers wait for the first."""
+        if self.loaded:
+            return
+        with self.load_lock:
+            if self.loaded:
+                return
+            # Read under the state lock: when processes share the game, that keeps
+            # another one from being halfway through writing the file
+            with self.state_lock:
+                state = self.load_state()
+                if state is None:
+                    self.state = copy.deepcopy(DEFAULT_GAME_STATE)
+                    self._bump_version()
+                    self.save_state(self.state)
+                else:
+                    self.state = state
+                    self._version = state.get("version", 0)
+                    if self.file_lock is not None:
+                        self.generation = self.file_lock.generation()
+            self.loaded = True
+
+    def _reload_if_changed(self):
+        """Pick up a state another process saved; runs each time the shared state lock is taken."""
+        if not self.loaded:
+            return
+        generation = self.file_lock.generation()
+        if generation == self.generation:
+            return
+        state = self.load_state()
+        if state is not None:
+            # A new state object, so the track and near-win indexes rebuild on next use
+            self.state = state
+            self._version = state.get("version", 0)
+            self.version_changed.notify_all()
+        self.generation = generation
+
+    @property
+    def version(self):
+        self._wait_loaded()
+        return self._version
+
     def load_state(self):
-        """Load game state from file. If the file is missing or contains invalid JSON, reset to default."""
+        """Load game state from file. Returns None if the file is missing or contains invalid JSON."""
         try:
-            with open(GAME_STATE_FILE, "r") as f:
-                return json.load(f)
+            return load_file(GAME_STATE_FILE)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             # Log the error (you may also use the logging module)
             print(f"Warning: Unable to load game state from {GAME_STATE_FILE}: {e}. Resetting to default state.")
-            return self.reset_to_default()
+            return None
 
     def save_state(self, state):
-        """Save game state to file."""
-        with open(GAME_STATE_FILE, "w") as f:
-            json.dump(state, f, indent=4)
+        """Save game state to file as compact JSON."""
+        start = time.perf_counter()
+        written = dump_file(state, GAME_STATE_FILE)
+        if self.file_lock is not None:
+            self.generation = self.file_lock.bump_generation()
+        state_save_seconds.observe(time.perf_counter() - start, current_operation())
+        state_save_bytes_total.inc(amount=written)
+
+    def _bump_version(self):
+        """Advance the state version; every mutation gets its own version number."""
+        self._version += 1
+        self.state["version"] = self._version
+        self.version_changed.notify_all()
 
     def update_state(self, update_func):
         """Thread-safe state update."""
+        self._wait_loaded()
         with self.state_lock:
             update_func(self.state)
+            self._bump_version()
             self.save_state(self.state)
             return copy.deepcopy(self.state)
 
+    def mutate(self, mutate_func, event=None, publish=None):
+        """Run mutate_func against the live state under the lock; return (version, copy of its result).
+
+        Only the result is copied. A None result means nothing was changed:
+        the version is not bumped and the state is not saved. ``event`` turns
+        the result into the event dict recorded in the game's event log.
+        ``publish`` is called with the new version and the copied result
+        before the lock is released, so deltas are queued in version order.
+        """
+        self._wait_loaded()
+        with self.state_lock:
+            if event is not None:
+                self.events.begin(self.state)
+            result = mutate_func(self.state)
+            if result is None:
+                return self._version, None
+            self._bump_version()
+            if event is not None:
+                self.events.record(self.state, event(result))
+            self.save_state(self.state)
+            result = copy.deepcopy(result)
+            if publish is not None:
+                publish(self._version, result)
+            return self._version, result
+
+    def play_track(self, track_id=None, publish=None):
+        """Pick (at random unless track_id is given) and play an unplayed track in one step.
+
+        Returns the new version, the track, the play counts, the card
+        changes and the cards that reached bingo with this track, or None
+        when there is no such unplayed track. ``publish`` is passed on to
+        ``mutate``.
+        """
+        def play(state):
+            track_registry.sync(state)
+            chosen_id = track_id
+            if chosen_id is None:
+                track = track_registry.random_unplayed()
+                chosen_id = track["id"] if track else None
+            track = track_registry.play(chosen_id) if chosen_id else None
+            if track is None:
+                return None
+            new_winners = []
+            changed_cards = mark_track(state["cards"], chosen_id, new_winners=new_winners)
+            return {
+                "track": track,
+                "played_count": len(state["played_tracks"]),
+                "remaining_count": len(state["unplayed_tracks"]),
+                "changed_cards": changed_cards,
+                "new_winners": new_winners,
+            }
+        version, result = self.mutate(play, event=lambda result: {
+            "type": "track_played", "track_id": result["track"]["id"],
+        }, publish=publish)
+        if result is not None:
+            result["version"] = version
+        return result
+
+    def set_card_matches(self, card_id, matches=None, publish=None):
+        """Set a card's matches (or recompute them from the played tracks when None) and its status.
+
+        Returns the version, the card's matches and status before and after
+        and whether anything changed, or None for an unknown card. A check
+        that changes nothing does not bump the version, save, log an event
+        or call ``publish``, which is otherwise passed on to ``mutate``.
+        """
+        unchanged = {}
+
+        def set_matches(state):
+            card = state["cards"].get(card_id)
+            if card is None:
+                return None
+            if matches is None:
+                track_registry.sync(state)
+                new_matches = [pos for pos, track in enumerate(card["tracks"]) if track_registry.is_played(track["id"])]
+            else:
+                new_matches = sorted(set(matches))
+            if new_matches == card.get("matches", []):
+                near_wins.sync(state["cards"])
+                has_bingo = near_wins.cells_to_bingo(card_id) == 0
+                status = "BINGO!" if has_bingo else "No bingo"
+                if status == card.get("bingo_status"):
+                    unchanged.update(
+                        card_id=card_id, matches=list(new_matches), status=status, has_bingo=has_bingo,
+                        previous_status=status, previous_matches=list(new_matches), version=state.get("version", 0),
+                    )
+                    return None
+            outcome = {"previous_status": card.get("bingo_status"), "previous_matches": card.get("matches", [])}
+            card["matches"] = new_matches
+            near_wins.set_matches(state["cards"], card_id, new_matches)
+            has_bingo = near_wins.cells_to_bingo(card_id) == 0
+            card["bingo_status"] = "BINGO!" if has_bingo else "No bingo"
+            outcome.update(card_id=card_id, matches=new_matches, status=card["bingo_status"], has_bingo=has_bingo)
+            return outcome
+        version, result = self.mutate(set_matches, event=lambda result: {
+            "type": "card_checked", "card_id": card_id, "matches": result["matches"],
+        }, publish=publish)
+        if result is None:
+            return dict(unchanged, changed=False) if unchanged else None
+        result.update(version=version, changed=True)
+        return result
+
     def get_state(self):
         """Thread-safe state retrieval."""
+        self._wait_loaded()
         with self.state_lock:
             return copy.deepcopy(self.state)
 
-    def reset_to_default(self):
-        """Reset state to default values."""
-        self.state = DEFAULT_GAME_STATE.copy()
-        self.save_state(self.state)
-        return self.state
+    def read_state(self, read_func):
+        """Run read_func against the live state under the lock and copy only what it returns."""
+        self._wait_loaded()
+        with self.state_lock:
+            return copy.deepcopy(read_func(self.state))
+
+    def get_card(self, card_id):
+        """Thread-safe retrieval of a single card without copying the rest of the state."""
+        self._wait_loaded()
+        with self.state_lock:
+            return copy.deepcopy(self.state.get("cards", {}).get(card_id))
+
+    def wait_for_change(self, known_version, timeout):
+        """Block until the version differs from known_version or timeout; return the current version."""
+        self._wait_loaded()
+        with self.version_changed:
+            if self.file_lock is None:
+                self.version_changed.wait_for(lambda: self._version != known_version, timeout)
+                return self._version
+            # Saves by other processes only show up when the lock is taken again, so wake up regularly
+            deadline = time.monotonic() + timeout
+            while self._version == known_version:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.version_changed.wait(min(remaining, SHARED_POLL_INTERVAL))
+            return self._version
+
+    def reset_to_default(self, publish=None):
+        """Reset state to default values; ``publish`` is called with the new version under the lock."""
+        self._wait_loaded()
+        with self.state_lock:
+            self.events.begin(self.state)
+            self.state = copy.deepcopy(DEFAULT_GAME_STATE)
+            self._bump_version()
+            self.events.record(self.state, {"type": "game_reset"})
+            self.save_state(self.state)
+            if publish is not None:
+                publish(self._version)
+            return self.state
 
 def load_playlists():
     """Load playlists from the JSON file."""
     if not os.path.exists(PLAYLISTS_FILE):
         save_playlists([])
         return []
-    with open(PLAYLISTS_FILE, "r") as f:
-        return json.load(f)
+    return load_file(PLAYLISTS_FILE)
 
 def save_playlists(playlists):
     """Save playlists to the JSON file."""
-    with open(PLAYLISTS_FILE, "w") as f:
-        json.dump(playlists, f, indent=4)
+    dump_file(playlists, PLAYLISTS_FILE)
 
 # Create the singleton instance
 game_state = ThreadSafeGameState()
@@ -0,0 +1,112 @@
+import hashlib
+import mimetypes
+import os
+from threading import Lock
+from flask import render_template
+from app.json_codec import COMPRESSIBLE_TYPES, COMPRESSION_THRESHOLD, brotli, compress
+
+STATIC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'static'))
+
+
+class StaticAsset:
+    """One static file (or rendered page) in memory: its bytes, content-hash ETag and precompressed variants."""
+
+    def __init__(self, path, data, signature=None):
+        self.path = path
+        self.data = data
+        self.mime_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.etag = hashlib.sha1(data).hexdigest()[:16]
+        self.signature = signature
+        self.encoded = {}
+        if self.mime_type.startswith(COMPRESSIBLE_TYPES) and len(data) >= COMPRESSION_THRESHOLD:
+            for encoding in ("br", "gzip") if brotli is not None else ("gzip",):
+                self.encoded[encoding] = compress(data, encoding)
+
+    @property
+    def url(self):
+        return f"/static/{self.path}?v={self.etag}"
+
+
+def file_signature(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class StaticAssets:
+    """The static directory, read and compressed once.
+
+    Static files ship with the release, so they are loaded on first use (or
+    by the warm-up) and kept. With ``reload`` on, as in development, every
+    lookup re-checks the file's size and mtime so edits show up at once.
+    """
+
+    def __init__(self, directory=STATIC_DIR, reload=False):
+        self.directory = directory
+        self.reload = reload
+        self.assets = None
+        self.lock = Lock()
+
+    def load(self):
+        with self.lock:
+            assets = {}
+            for root, _, filenames in os.walk(self.directory):
+                for filename in filenames:
+                    full_path = os.path.join(root, filename)
+                    path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+                    with open(full_path, "rb") as f:
+                        assets[path] = StaticAsset(path, f.read(), file_signature(full_path))
+            self.assets = assets
+            return assets
+
+    def get(self, path):
+        assets = self.assets if self.assets is not None else self.load()
+        asset = assets.get(path)
+        if self.reload and asset is not None:
+            full_path = os.path.join(self.directory, path)
+            try:
+                signature = file_signature(full_path)
+            except OSError:
+                return None
+            if signature != asset.signature:
+                with open(full_path, "rb") as f:
+                    asset = assets[path] = StaticAsset(path, f.read(), signature)
+        return asset
+
+    def url(self, path):
+        """The content-hashed URL of a static file, for templates."""
+        asset = self.get(path)
+        return asset.url if asset is not None else f"/static/{path}"
+
+    def version(self):
+        """Changes whenever any static file does."""
+        assets = self.assets if self.assets is not None else self.load()
+        return hashlib.sha1(",".join(f"{path}:{assets[path].etag}" for path in sorted(assets)).encode()).hexdigest()
+
+
+class CachedPage:
+    """A template that takes no per-request data, rendered once and kept with its compressed variants.
+
+    It is rendered again only when the static assets it links to change, or
+    on every request when the assets reload (development).
+    """
+
+    def __init__(self, template, assets):
+        self.template = template
+        self.assets = assets
+        self.page = None
+        self.lock = Lock()
+
+    def get(self, app):
+        page = self.page
+        if page is not None and not self.assets.reload and page.assets_version == self.assets.version():
+            return page
+        with self.lock, app.app_context():
+            version = self.assets.version()
+            page = StaticAsset(self.template, render_template(self.template).encode("utf-8"))
+            page.assets_version = version
+            self.page = page
+        return page
+
+
+static_assets = StaticAssets()
+dashboard_shell = CachedPage("dashboard.html", static_assets)
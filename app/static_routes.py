@@ -0,0 +1,42 @@
+from flask import Blueprint, jsonify, current_app, request
+from app.helpers import handle_error
+from app.json_codec import pick_encoding
+from app.sound_routes import IMMUTABLE_CACHE
+from app.static_assets import static_assets
+
+bp = Blueprint("assets", __name__)
+
+@bp.app_template_global()
+def asset_url(path):
+    """Content-hashed URL of a file in static/, e.g. ``{{ asset_url('js/dashboard.js') }}``."""
+    return static_assets.url(path)
+
+def asset_response(asset, cache_control):
+    """Serve an in-memory asset, precompressed when the client accepts it, with a 304 on a matching ETag."""
+    encoding = pick_encoding(request.headers.get("Accept-Encoding", ""))
+    body = asset.encoded.get(encoding)
+    etag = f"{asset.etag}-{encoding}" if body is not None else asset.etag
+    # The compression layer strips the encoding suffix from If-None-Match
+    if request.if_none_match.contains(asset.etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(body if body is not None else asset.data, mimetype=asset.mime_type)
+        if body is not None:
+            response.headers["Content-Encoding"] = encoding
+    if asset.encoded:
+        response.vary.add("Accept-Encoding")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+@bp.route("/<path:filename>")
+def serve_static(filename):
+    """Serve a static file from memory; versioned URLs (?v=<etag>) may be cached forever."""
+    try:
+        asset = static_assets.get(filename)
+        if asset is None:
+            return jsonify({"error": "File not found"}), 404
+        cache_control = IMMUTABLE_CACHE if request.args.get("v") == asset.etag else "no-cache"
+        return asset_response(asset, cache_control)
+    except Exception as e:
+        return handle_error(e)
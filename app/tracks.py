@@ -0,0 +1,100 @@
+import random
+
+
+def track_from_playlist_item(item):
+    """The game's track record for one Spotify playlist item, or None for removed or local entries."""
+    track = item.get("track")
+    if not track or not track.get("id"):
+        return None
+    return {
+        "id": track["id"],
+        "name": track["name"],
+        "artist": ", ".join(a["name"] for a in track["artists"]),
+    }
+
+
+class TrackRegistry:
+    """Index over the track pool for O(1) lookup, random pick and play.
+
+    Tracks are keyed by id and given a slot; a bitmap over the slots says
+    which have been played. ``played_tracks`` in the state is the ordered
+    play log (append only) and ``unplayed_tracks`` is kept by swap-remove,
+    so both JSON views stay current without being rebuilt. The registry
+    follows the lists it was built from and rebuilds when the state swaps
+    in new ones (new playlist, new round, loaded game). Only use it with the
+    game state lock held.
+    """
+
+    def __init__(self):
+        self.unplayed = None
+        self.played = None
+        self.slots = {}
+        self.tracks = []
+        self.played_bits = bytearray()
+        self.unplayed_pos = {}
+
+    def sync(self, state):
+        """Rebuild from the state's track lists unless it already follows them."""
+        unplayed = state.setdefault("unplayed_tracks", [])
+        played = state.setdefault("played_tracks", [])
+        if unplayed is self.unplayed and played is self.played:
+            return
+        self.unplayed = unplayed
+        self.played = played
+        self.slots = {}
+        self.tracks = []
+        self.played_bits = bytearray()
+        self.unplayed_pos = {}
+        for track in played:
+            self._add(track, True)
+        # Duplicate or already played entries would break swap-remove; drop them
+        pool, seen = [], set()
+        for track in unplayed:
+            if track["id"] not in seen and not self.is_played(track["id"]):
+                seen.add(track["id"])
+                pool.append(track)
+        if len(pool) != len(unplayed):
+            unplayed[:] = pool
+        for pos, track in enumerate(unplayed):
+            self._add(track, False)
+            self.unplayed_pos[track["id"]] = pos
+
+    def _add(self, track, played):
+        slot = self.slots.get(track["id"])
+        if slot is None:
+            slot = self.slots[track["id"]] = len(self.tracks)
+            self.tracks.append(track)
+            self.played_bits.append(0)
+        if played:
+            self.played_bits[slot] = 1
+
+    def get(self, track_id):
+        slot = self.slots.get(track_id)
+        return self.tracks[slot] if slot is not None else None
+
+    def is_played(self, track_id):
+        slot = self.slots.get(track_id)
+        return slot is not None and self.played_bits[slot] == 1
+
+    def is_unplayed(self, track_id):
+        return track_id in self.unplayed_pos
+
+    def random_unplayed(self, rng=random):
+        return rng.choice(self.unplayed) if self.unplayed else None
+
+    def play(self, track_id):
+        """Move an unplayed track to the end of the play log; returns it, or None if not unplayed."""
+        pos = self.unplayed_pos.pop(track_id, None)
+        if pos is None:
+            return None
+        track = self.unplayed[pos]
+        last = self.unplayed.pop()
+        if last is not track:
+            self.unplayed[pos] = last
+            self.unplayed_pos[last["id"]] = pos
+        self.played_bits[self.slots[track_id]] = 1
+        self.played.append(track)
+        return track
+
+
+track_registry = TrackRegistry()
@@ -1,3 +1,47 @@
+import random
+
+# Card ids are three-digit numbers, so a game has at most this many cards
+MAX_CARDS = 900
+# Tracks drawn from a playlist for one game; cards are filled from these
+GAME_TRACKS = 100
+
+# Default game state structure
+DEFAULT_GAME_STATE = {
+    "played_tracks": [],
+    "unplayed_tracks": [],
+    "cards": {},
+    "bingo_mode": "rowcoldiag",
+    "current_playlist": None,
+    "num_tracks": 0,
+    "version": 0,
+}
+
+
+def select_game_tracks(tracks, count=GAME_TRACKS, rng=random):
+    """Up to ``count`` random tracks of a playlist for a fresh game."""
+    return rng.sample(tracks, min(count, len(tracks)))
+
+
+def build_cards(tracks, num_cards, progress=None, rng=random):
+    """Create ``num_cards`` cards of 25 random tracks with unique three-digit ids."""
+    if num_cards > MAX_CARDS:
+        raise ValueError(f"At most {MAX_CARDS} cards can be generated")
+    cards = {}
+    for i in range(num_cards):
+        while True:
+            card_id = str(rng.randint(100, 999))
+            if card_id not in cards:
+                break
+        cards[card_id] = {
+            "tracks": rng.sample(tracks, 25),
+            "bingo_status": "Not checked",
+            "matches": [],
+        }
+        if progress and (i + 1) % 50 == 0:
+            progress(i + 1, num_cards)
+    return cards
+
+
 def generate_bingo_cards(tracks, num_cards):
     """Generate Bingo cards with tracks."""
     cards = []
@@ -0,0 +1,45 @@
+import logging
+import time
+from threading import Thread
+from app.state import game_state
+from app.tracks import track_registry
+from app.card_status import near_wins
+from app.saved_games import saved_games
+from app.autosave import checkpointer
+from app.sound_library import sound_library
+from app.static_assets import dashboard_shell
+
+logger = logging.getLogger(__name__)
+
+
+def _sync_indexes(state):
+    track_registry.sync(state)
+    near_wins.sync(state.get("cards", {}))
+
+
+def warm_up(app):
+    """Load the saved state, then build the indexes and caches the first requests would otherwise build.
+
+    The state is loaded first, on its own, so requests waiting for it get
+    it as soon as it is parsed. The index build, which holds the state lock,
+    comes last so those requests are not queued behind it.
+    """
+    start = time.perf_counter()
+    steps = [
+        ("saved game state", lambda: game_state.version),
+        ("static assets and dashboard shell", lambda: dashboard_shell.get(app)),
+        ("saved games index", saved_games.list_games),
+        ("checkpoints index", checkpointer.list_checkpoints),
+        ("sound library", sound_library.refresh),
+        ("track and near-win indexes", lambda: game_state.read_state(_sync_indexes)),
+    ]
+    for name, step in steps:
+        try:
+            step()
+        except Exception:
+            logger.warning("Warm-up of %s failed", name, exc_info=True)
+    logger.info("Warm-up finished in %.0f ms", (time.perf_counter() - start) * 1000)
+
+
+def start_warm_up(app):
+    Thread(target=warm_up, args=(app,), name="bingo-warm-up", daemon=True).start()
@@ -0,0 +1,107 @@
+"""Cost of opening and reloading the dashboard on many tablets.
+
+Starts ``app.py`` on a saved game with ``--cards`` cards and lets
+``--tablets`` clients each do what a browser does: fetch the dashboard
+shell, its static scripts and the live snapshot. A first visit downloads
+everything; a reload revalidates the shell and snapshot with their ETags
+and skips the scripts, whose hashed URLs are cached as immutable. Reports
+per kind of visit the bytes transferred and request latency percentiles.
+
+    python -m benchmarks.bench_dashboard_load --tablets 12 --cards 1000
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_server_modes import MODES, free_port, start_server
+from benchmarks.bench_startup import write_state
+from benchmarks.common import percentile, use_scratch_dir
+
+IMMUTABLE = "immutable"
+
+
+class Tablet:
+    """A browser cache reduced to what matters here: ETags and immutable URLs."""
+
+    def __init__(self, base_url):
+        import requests
+
+        self.base_url = base_url
+        self.session = requests.Session()
+        self.etags = {}
+        self.immutable = set()
+        self.scripts = []
+
+    def get(self, path, timings):
+        if path in self.immutable:
+            return 0, None, None
+        headers = {"If-None-Match": self.etags[path]} if path in self.etags else {}
+        start = time.perf_counter()
+        response = self.session.get(self.base_url + path, headers=headers, stream=True, timeout=30)
+        # Bytes as sent, before any decompression
+        body = response.raw.read(decode_content=False)
+        timings.append(time.perf_counter() - start)
+        if "ETag" in response.headers:
+            self.etags[path] = response.headers["ETag"]
+        if IMMUTABLE in response.headers.get("Cache-Control", ""):
+            self.immutable.add(path)
+        return len(body), response, body
+
+    def visit(self, timings):
+        """Bytes on the wire for one page load."""
+        total, shell, body = self.get("/dashboard/", timings)
+        if shell is not None and shell.status_code == 200:
+            if shell.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            self.scripts = re.findall(r'src="(/static/[^"]+)"', body.decode("utf-8", "replace"))
+        for script in self.scripts:
+            total += self.get(script, timings)[0]
+        total += self.get("/dashboard/api/snapshot", timings)[0]
+        return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tablets", type=int, default=12)
+    parser.add_argument("--cards", type=int, default=1000)
+    parser.add_argument("--reloads", type=int, default=5, help="reloads per tablet after the first visit")
+    parser.add_argument("--mode", default="production", choices=list(MODES))
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    workdir = use_scratch_dir()
+    write_state(os.path.join(workdir, "game_state.json"), args.cards, 2000)
+    port = free_port()
+    proc = start_server(args.mode, port, workdir)
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        # The state loads in the background; wait until the snapshot answers
+        Tablet(base_url).visit([])
+        tablets = [Tablet(base_url) for _ in range(args.tablets)]
+        results = {"tablets": args.tablets, "cards": args.cards}
+        for kind, rounds in (("first_visit", 1), ("reload", args.reloads)):
+            timings, sizes = [], []
+            with ThreadPoolExecutor(args.tablets) as pool:
+                for _ in range(rounds):
+                    sizes.extend(pool.map(lambda tablet: tablet.visit(timings), tablets))
+            results[kind] = {
+                "bytes_per_visit": round(sum(sizes) / len(sizes)),
+                "requests_per_visit": round(len(timings) / len(sizes), 1),
+                "latency_ms": {f"p{p}": round(percentile(timings, p) * 1000, 2) for p in (50, 90, 99)},
+            }
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    print(json.dumps(results, indent=2))
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
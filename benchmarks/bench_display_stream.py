@@ -0,0 +1,252 @@
+"""Server cost of hundreds of read-only display clients, SSE against Socket.IO.
+
+Starts ``app.py`` on a saved game, connects ``--clients`` display clients
+and plays ``--plays`` tracks through a Socket.IO host client, one every
+``--interval`` seconds. Per transport it reports:
+
+- server CPU time per play, and per play per client
+- delivery latency from the play call to the last client receiving it
+- bytes each client received per play
+
+``sse`` clients hold ``GET /display/stream`` open on plain sockets, all read
+by one selector thread; ``socketio`` clients join the display room over
+websocket, as displays did before. After the plays one more SSE client
+reconnects with the ``Last-Event-ID`` of the first play and must get every
+later play back from the buffer.
+
+    python -m benchmarks.bench_display_stream --clients 300 --plays 30 --output display_stream.json
+
+Requires ``python-socketio[client]``, ``websocket-client`` and ``psutil``.
+"""
+import argparse
+import json
+import os
+import selectors
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_server_modes import MODES, free_port, server_cpu, start_server
+from benchmarks.bench_startup import write_state
+from benchmarks.common import percentile, use_scratch_dir
+
+
+def open_stream(port, last_event_id=None):
+    """A raw HTTP/1.0 request for the stream, so the body arrives without chunked framing."""
+    sock = socket.create_connection(("127.0.0.1", port), timeout=10)
+    headers = f"Last-Event-ID: {last_event_id}\r\n" if last_event_id is not None else ""
+    sock.sendall(f"GET /display/stream HTTP/1.0\r\nHost: 127.0.0.1\r\nAccept: text/event-stream\r\n{headers}\r\n".encode())
+    sock.setblocking(False)
+    return sock
+
+
+def parse_events(buffer):
+    """Complete SSE events in ``buffer`` as dicts, and the unparsed rest."""
+    events = []
+    while b"\n\n" in buffer:
+        block, buffer = buffer.split(b"\n\n", 1)
+        event = {}
+        for line in block.decode("utf-8").split("\n"):
+            field, _, value = line.partition(": ")
+            if field in ("id", "event", "data"):
+                event[field] = value
+        if "event" in event:
+            events.append(event)
+    return events, buffer
+
+
+class SSEClients:
+    """Display clients on the SSE stream, read by one selector thread."""
+
+    def __init__(self, port, count):
+        self.selector = selectors.DefaultSelector()
+        self.clients = []
+        for _ in range(count):
+            client = {"buffer": b"", "headers_done": False, "bytes": 0, "updates": []}
+            self.selector.register(open_stream(port), selectors.EVENT_READ, client)
+            self.clients.append(client)
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while self.running:
+            for key, _ in self.selector.select(timeout=0.1):
+                data = key.fileobj.recv(65536)
+                if not data:
+                    self.selector.unregister(key.fileobj)
+                    continue
+                client = key.data
+                now = time.perf_counter()
+                client["bytes"] += len(data)
+                client["buffer"] += data
+                if not client["headers_done"]:
+                    if b"\r\n\r\n" not in client["buffer"]:
+                        continue
+                    client["buffer"] = client["buffer"].split(b"\r\n\r\n", 1)[1]
+                    client["headers_done"] = True
+                events, client["buffer"] = parse_events(client["buffer"])
+                for event in events:
+                    if event["event"] == "update" and "track" in json.loads(event["data"]):
+                        client["updates"].append((int(event["id"]), now))
+
+    def arrivals(self):
+        return [[at for _, at in client["updates"]] for client in self.clients]
+
+    def close(self):
+        self.running = False
+        self.thread.join()
+        for key in list(self.selector.get_map().values()):
+            key.fileobj.close()
+
+
+class SocketIOClients:
+    """Display clients in the Socket.IO display room."""
+
+    def __init__(self, base_url, count):
+        import socketio
+
+        self.clients, self.received = [], []
+
+        def connect(_):
+            client = socketio.Client(reconnection=False)
+            record = {"bytes": 0, "arrivals": []}
+
+            @client.on("state_delta")
+            def on_delta(delta):
+                record["bytes"] += len(json.dumps(delta, separators=(",", ":")))
+                if any(change["type"] == "track_played" for change in delta["changes"]):
+                    record["arrivals"].append(time.perf_counter())
+
+            client.connect(base_url, transports=["websocket"], wait_timeout=10)
+            client.emit("join", {"room": "display"})
+            return client, record
+
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            for client, record in pool.map(connect, range(count)):
+                self.clients.append(client)
+                self.received.append(record)
+
+    def arrivals(self):
+        return [record["arrivals"] for record in self.received]
+
+    def close(self):
+        for client in self.clients:
+            try:
+                client.disconnect()
+            except Exception:
+                pass
+
+
+def check_resume(port, first_id, expected, timeout=10):
+    """Reconnect with Last-Event-ID and count the plays replayed from the buffer."""
+    sock = open_stream(port, first_id)
+    sock.setblocking(True)
+    sock.settimeout(timeout)
+    buffer, headers_done, received = b"", False, set()
+    deadline = time.time() + timeout
+    try:
+        while len(received) < expected and time.time() < deadline:
+            data = sock.recv(65536)
+            if not data:
+                break
+            buffer += data
+            if not headers_done:
+                if b"\r\n\r\n" not in buffer:
+                    continue
+                buffer = buffer.split(b"\r\n\r\n", 1)[1]
+                headers_done = True
+            events, buffer = parse_events(buffer)
+            received.update(int(event["id"]) for event in events if event["event"] == "update")
+    finally:
+        sock.close()
+    return len(received)
+
+
+def run_transport(transport, args, workdir, track_ids):
+    import psutil
+    import socketio
+
+    write_state(os.path.join(workdir, "game_state.json"), args.cards, max(200, args.plays * 2))
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    proc = start_server(args.mode, port, workdir)
+    server = psutil.Process(proc.pid)
+    clients = host = None
+    try:
+        host = socketio.Client(reconnection=False)
+        host.connect(base_url, transports=["websocket"], wait_timeout=10)
+        clients = SSEClients(port, args.clients) if transport == "sse" else SocketIOClients(base_url, args.clients)
+        time.sleep(2)
+        cpu_start = server_cpu(server)
+        wall_start = time.perf_counter()
+        sent_at = []
+        for track_id in track_ids:
+            sent_at.append(time.perf_counter())
+            host.call("play_track", {"track_id": track_id}, timeout=10)
+            time.sleep(args.interval)
+        deadline = time.time() + 15
+        while time.time() < deadline and any(len(a) < len(track_ids) for a in clients.arrivals()):
+            time.sleep(0.05)
+        cpu = server_cpu(server) - cpu_start
+        wall = time.perf_counter() - wall_start
+
+        arrivals = clients.arrivals()
+        complete = [a for a in arrivals if len(a) >= len(track_ids)]
+        delivery = [max(a[i] for a in complete) - sent for i, sent in enumerate(sent_at)] if complete else []
+        received_bytes = [c["bytes"] for c in clients.clients] if transport == "sse" else [r["bytes"] for r in clients.received]
+        result = {
+            "transport": transport,
+            "clients": args.clients,
+            "clients_with_every_play": len(complete),
+            "plays": len(track_ids),
+            "server_cpu_ms_per_play": round(cpu * 1000 / len(track_ids), 2),
+            "server_cpu_us_per_play_per_client": round(cpu * 1e6 / len(track_ids) / args.clients, 1),
+            "server_cpu_utilization": round(cpu / wall, 3),
+            "delivery_ms": {f"p{p}": round(percentile(delivery, p) * 1000, 1) for p in (50, 90, 99)} if delivery else None,
+            "bytes_per_client_per_play": round(sum(received_bytes) / len(received_bytes) / len(track_ids)),
+        }
+        if transport == "sse" and complete:
+            ids = [event_id for event_id, _ in clients.clients[0]["updates"]]
+            replayed = check_resume(port, ids[0], len(ids) - 1)
+            result["resume"] = {"last_event_id": ids[0], "replayed": replayed, "expected": len(ids) - 1}
+        return result
+    finally:
+        if clients is not None:
+            clients.close()
+        if host is not None:
+            host.disconnect()
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--plays", type=int, default=30)
+    parser.add_argument("--interval", type=float, default=0.2, help="seconds between plays")
+    parser.add_argument("--cards", type=int, default=500)
+    parser.add_argument("--transports", nargs="+", default=["sse", "socketio"], choices=["sse", "socketio"])
+    parser.add_argument("--mode", default="production", choices=list(MODES))
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    workdir = use_scratch_dir()
+    write_state(os.path.join(workdir, "game_state.json"), args.cards, max(200, args.plays * 2))
+    with open(os.path.join(workdir, "game_state.json")) as f:
+        track_ids = [track["id"] for track in json.load(f)["unplayed_tracks"][:args.plays]]
+
+    results = []
+    for transport in args.transports:
+        result = run_transport(transport, args, workdir, track_ids)
+        print(json.dumps(result), flush=True)
+        results.append(result)
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Caller-side cost of logging: the old synchronous file handler against the queue pipeline.
+
+Logs a mix shaped like a busy game night: engine.io packet lines, Socket.IO
+emits, request bodies at DEBUG and access records. Measures the time spent
+in the logging calls themselves (what a request or socket handler pays) and
+how long the writer needs afterwards to drain the queue. Setups:
+
+- sync: the previous configuration, a RotatingFileHandler rotating every
+  10 KB, written on the calling thread
+- queue: ``configure_logging`` with its default sampling and rotation
+
+    python -m benchmarks.bench_logging --records 50000
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from logging.handlers import RotatingFileHandler
+
+from benchmarks.common import use_scratch_dir
+
+# (logger, level, message, args, extra) in the proportions of a night with packet logging on
+MIX = (
+    ("engineio.server", logging.INFO, "%s: Sending packet %s data %s", ("sid", "MESSAGE", '2["state_delta",{}]'), None),
+    ("engineio.server", logging.INFO, "%s: Received packet %s data %s", ("sid", "MESSAGE", '2["join",{}]'), None),
+    ("socketio.server", logging.INFO, 'emitting event "%s" to %s [/]', ("state_delta", "display"), None),
+    ("app", logging.DEBUG, "Headers: %s Body: %s", ({"Host": "localhost"}, b'{"card_id": "101"}'), {"category": "request_body"}),
+    ("app", logging.INFO, "%s %s %s", ("GET", "/card/view/101", 200), {"category": "access"}),
+)
+
+
+def reset_logging():
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+
+def emit_mix(records):
+    loggers = [(logging.getLogger(name), level, msg, args, extra) for name, level, msg, args, extra in MIX]
+    start = time.perf_counter()
+    for i in range(records):
+        logger, level, msg, args, extra = loggers[i % len(loggers)]
+        logger.log(level, msg, *args, extra=extra)
+    return time.perf_counter() - start
+
+
+def run_sync(records):
+    reset_logging()
+    os.makedirs("logs", exist_ok=True)
+    handler = RotatingFileHandler(os.path.join("logs", "sync.log"), maxBytes=10240, backupCount=10)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]"))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(logging.DEBUG)
+    elapsed = emit_mix(records)
+    reset_logging()
+    return {"call_us": round(elapsed / records * 1e6, 2), "drain_ms": 0.0}
+
+
+def run_queue(records):
+    reset_logging()
+    from app import log_pipeline
+
+    listener = log_pipeline.configure_logging("development")
+    # The benchmark measures the file path, not terminal speed
+    listener.handlers = listener.handlers[:1]
+    elapsed = emit_mix(records)
+    start = time.perf_counter()
+    log_pipeline.stop_logging()
+    drain = time.perf_counter() - start
+    reset_logging()
+    return {"call_us": round(elapsed / records * 1e6, 2), "drain_ms": round(drain * 1000, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    use_scratch_dir()
+    results = {"records": args.records, "sync": run_sync(args.records), "queue": run_queue(args.records)}
+    print(json.dumps(results, indent=2))
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
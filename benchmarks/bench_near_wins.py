@@ -0,0 +1,82 @@
+"""Per-play cost of keeping the near-win leaderboard current.
+
+Plays a shuffled playlist against games of growing size and times, per
+play, marking the track plus reading the ten cards closest to bingo:
+
+- ``rescan``: the previous approach, scanning every card's 25 tracks to
+  mark the track and recomputing every card's distance from bingo
+- ``indexed``: ``mark_track`` with the near-win index, which visits only
+  the cells holding the track and reads the leaderboard in O(k)
+
+The indexed cost follows the number of cells holding the played track
+(about ``cards * 25 / tracks``), so ``per_cell_us`` stays flat while the
+rescan grows with the total card count.
+
+    python -m benchmarks.bench_near_wins --cards 100 1000 10000 --tracks 500
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks.common import make_cards, make_tracks, summarize, use_scratch_dir
+
+
+def rescan_play(cards, track_id, limit):
+    from app.card_status import cells_to_bingo
+
+    for card in cards.values():
+        positions = [pos for pos, track in enumerate(card["tracks"]) if track["id"] == track_id]
+        matches = card["matches"]
+        for pos in positions:
+            if pos not in matches:
+                matches.append(pos)
+    distances = sorted((cells_to_bingo(card["matches"]), card_id) for card_id, card in cards.items())
+    return distances[:limit]
+
+
+def indexed_play(cards, track_id, limit):
+    from app.card_status import mark_track, near_win_leaderboard
+
+    mark_track(cards, track_id)
+    return near_win_leaderboard(cards, limit)
+
+
+def run(play, num_cards, tracks, plays, limit):
+    from app.card_status import near_wins
+
+    cards = make_cards(tracks, num_cards)
+    near_wins.sync(cards)
+    order = random.Random(7).sample(tracks, plays)
+    timings, cells = [], 0
+    for track in order:
+        cells += len(near_wins.cells_for_track(track["id"]))
+        start = time.perf_counter()
+        play(cards, track["id"], limit)
+        timings.append(time.perf_counter() - start)
+    result = summarize(timings)
+    result["per_cell_us"] = round(sum(timings) / max(cells, 1) * 1e6, 3)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--tracks", type=int, default=500, help="playlist size")
+    parser.add_argument("--plays", type=int, default=60)
+    parser.add_argument("--limit", type=int, default=10, help="leaderboard size k")
+    args = parser.parse_args()
+
+    use_scratch_dir()
+    tracks = make_tracks(args.tracks)
+    results = {}
+    for num_cards in args.cards:
+        results[num_cards] = {
+            "rescan": run(rescan_play, num_cards, tracks, args.plays, args.limit),
+            "indexed": run(indexed_play, num_cards, tracks, args.plays, args.limit),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
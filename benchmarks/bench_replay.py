@@ -0,0 +1,135 @@
+"""Replay a recorded game night against a live server at accelerated speed.
+
+Rebuilds the state at the start of one stretch of play from an event log
+(see ``app/replay.py``), starts ``app.py`` on it in a scratch directory and
+re-issues the recorded plays (socket ``play_track``) and card checks (HTTP
+``check_card``) with the original gaps divided by ``--speed``, while display
+clients listen as they would on the night. Reports per-action latency and how
+far dispatch fell behind the recorded schedule.
+
+    python -m benchmarks.bench_replay logs/events/night_20240101_200000.jsonl --speed 20 --displays 50
+
+A stretch of play runs between setup events (playlist loaded, cards
+generated, game loaded or reset); ``--segment`` picks one, by default the
+one with the most events.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from benchmarks.bench_server_modes import MODES, free_port, start_server
+from benchmarks.common import percentile, use_scratch_dir
+
+PLAY_EVENTS = ("track_played", "card_checked")
+
+
+def split_segments(events):
+    """Runs of consecutive play events, each with the index of its first event."""
+    segments, current = [], None
+    for i, event in enumerate(events):
+        if event["type"] in PLAY_EVENTS:
+            if current is None:
+                current = (i, [])
+                segments.append(current)
+            current[1].append(event)
+        else:
+            current = None
+    return segments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", help="event log recorded by the server")
+    parser.add_argument("--speed", type=float, default=10.0, help="time compression factor")
+    parser.add_argument("--segment", type=int, help="index of the stretch of play to replay")
+    parser.add_argument("--displays", type=int, default=20, help="display clients listening")
+    parser.add_argument("--mode", default="production", choices=list(MODES))
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    log_path = os.path.abspath(args.log)
+    output = os.path.abspath(args.output) if args.output else None
+    workdir = use_scratch_dir()
+    import requests
+    import socketio
+    from app.events import read_events
+    from app.replay import rebuild
+
+    events = read_events(log_path)
+    segments = split_segments(events)
+    if not segments:
+        sys.exit("No plays or card checks in this log")
+    if args.segment is None:
+        start_index, plays = max(segments, key=lambda segment: len(segment[1]))
+    else:
+        start_index, plays = segments[args.segment]
+    with open(os.path.join(workdir, "game_state.json"), "w") as f:
+        json.dump(rebuild(events[:start_index]), f)
+
+    os.environ["EVENT_LOG_DIR"] = os.path.join(workdir, "events")
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    proc = start_server(args.mode, port, workdir)
+    clients = []
+    try:
+        for _ in range(args.displays):
+            client = socketio.Client(reconnection=False)
+            client.connect(base_url, transports=["websocket"], wait_timeout=10)
+            client.emit("join", {"room": "display"})
+            clients.append(client)
+        host = socketio.Client(reconnection=False)
+        host.connect(base_url, transports=["websocket"], wait_timeout=10)
+        host.emit("join", {"room": "host"})
+        clients.append(host)
+        session = requests.Session()
+
+        latencies = {event_type: [] for event_type in PLAY_EVENTS}
+        lags = []
+        recorded_start = plays[0]["time"]
+        replay_start = time.perf_counter()
+        for event in plays:
+            due = (event["time"] - recorded_start) / args.speed
+            wait = due - (time.perf_counter() - replay_start)
+            if wait > 0:
+                time.sleep(wait)
+            lags.append(max(0.0, -wait))
+            start = time.perf_counter()
+            if event["type"] == "track_played":
+                host.call("play_track", {"track_id": event["track_id"]}, timeout=10)
+            else:
+                session.get(f"{base_url}/card/api/check_card/{event['card_id']}", timeout=10)
+            latencies[event["type"]].append(time.perf_counter() - start)
+        elapsed = time.perf_counter() - replay_start
+
+        def pcts(values):
+            if not values:
+                return None
+            return {f"p{p}": round(percentile(values, p) * 1000, 2) for p in (50, 90, 99)}
+
+        results = {
+            "segment_events": len(plays),
+            "recorded_seconds": round(plays[-1]["time"] - recorded_start, 1),
+            "replay_seconds": round(elapsed, 1),
+            "speed": args.speed,
+            "displays": args.displays,
+            "latency_ms": {event_type: pcts(values) for event_type, values in latencies.items()},
+            "dispatch_lag_ms": pcts(lags),
+        }
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+        for client in clients:
+            try:
+                client.disconnect()
+            except Exception:
+                pass
+    print(json.dumps(results, indent=2))
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Emit throughput with hundreds of connected Socket.IO clients.
+
+Connects in-process test clients: one host, a number of displays and one
+phone per card (each phone in the display room plus its card room), then
+publishes a stream of deltas and reports events delivered per second.
+Compares room-scoped fan-out with the old pattern of broadcasting every
+delta to every client.
+
+    python -m benchmarks.bench_room_fanout --clients 500 --events 200
+"""
+import argparse
+import json
+import logging
+import time
+
+from benchmarks.common import use_scratch_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500, help="phone clients, one per card")
+    parser.add_argument("--displays", type=int, default=10)
+    parser.add_argument("--events", type=int, default=200, help="deltas to publish")
+    args = parser.parse_args()
+
+    use_scratch_dir()
+    from app import create_app
+    from app.socket_handler import socketio, emitter, publish_delta, card_room, HOST_ROOM, DISPLAY_ROOM
+
+    app = create_app()
+    app.logger.setLevel(logging.WARNING)
+    socketio.server.logger.setLevel(logging.WARNING)
+    socketio.server.eio.logger.setLevel(logging.WARNING)
+
+    def connect(rooms):
+        client = socketio.test_client(app)
+        for room in rooms:
+            client.emit("join", {"room": room})
+        client.get_received()
+        return client
+
+    host = connect([HOST_ROOM])
+    displays = [connect([DISPLAY_ROOM]) for _ in range(args.displays)]
+    phones = [connect([DISPLAY_ROOM, card_room(str(1000 + i))]) for i in range(args.clients)]
+    clients = [host] + displays + phones
+
+    # Realistic mix: every track play touches a handful of cards
+    def workload(publish):
+        version = 0
+        for i in range(args.events):
+            version += 1
+            publish(version, {"type": "track_played", "track": {"id": f"t{i}", "name": "Song", "artist": "Artist"},
+                              "played_count": i + 1, "remaining_count": 100 - i})
+            for j in range(5):
+                version += 1
+                card_id = str(1000 + (i * 5 + j) % args.clients)
+                publish(version, {"type": "card_matches", "card_id": card_id, "matches": [0, 1], "status": "No bingo"})
+
+    def broadcast_all(version, *changes):
+        socketio.emit("state_delta", {"version": version, "changes": list(changes)})
+
+    results = {"connected_clients": len(clients)}
+    for label, publish in (("broadcast_all", broadcast_all), ("room_scoped", publish_delta)):
+        for client in clients:
+            client.get_received()
+        start = time.perf_counter()
+        workload(publish)
+        emitter.flush()
+        elapsed = time.perf_counter() - start
+        delivered = sum(len(client.get_received()) for client in clients)
+        results[label] = {
+            "published": args.events * 6,
+            "delivered": delivered,
+            "seconds": round(elapsed, 3),
+            "published_per_sec": round(args.events * 6 / elapsed, 1),
+            "delivered_per_sec": round(delivered / elapsed, 1),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
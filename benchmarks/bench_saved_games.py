@@ -0,0 +1,96 @@
+"""Listing and loading cost with many saved games.
+
+Writes ``--games`` saves of a realistic game (playlist pool plus cards) in
+the legacy pretty-printed JSON format and in the compressed format, then
+times:
+
+- ``legacy_scan``: the previous listing, opening and parsing every file
+- ``index_cold``: the first listing, building the index from save headers
+- ``index_warm``: later listings, served from the index
+- loading one game in each format, and the average file size
+
+    python -m benchmarks.bench_saved_games --games 1000 --cards 100
+"""
+import argparse
+import json
+import os
+import time
+
+from benchmarks.common import make_cards, make_tracks, summarize, timed, use_scratch_dir
+
+
+def legacy_scan(directory):
+    games = []
+    for filename in os.listdir(directory):
+        if filename.endswith(".json") and not filename.startswith("."):
+            with open(os.path.join(directory, filename)) as f:
+                save_data = json.load(f)
+            games.append({field: save_data[field] for field in ("name", "description", "timestamp")})
+    return sorted(games, key=lambda game: game["timestamp"], reverse=True)
+
+
+def average_size(directory, extension):
+    sizes = [entry.stat().st_size for entry in os.scandir(directory) if entry.name.endswith(extension)]
+    return round(sum(sizes) / max(len(sizes), 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--cards", type=int, default=100)
+    parser.add_argument("--tracks", type=int, default=100)
+    args = parser.parse_args()
+
+    use_scratch_dir()
+    from app.saved_games import SavedGameStore
+
+    tracks = make_tracks(args.tracks)
+    state = {
+        "played_tracks": tracks[:30],
+        "unplayed_tracks": tracks[30:],
+        "cards": make_cards(tracks, args.cards),
+        "bingo_mode": "rowcoldiag",
+        "current_playlist": "bench",
+        "num_tracks": len(tracks),
+        "version": 1,
+    }
+
+    legacy = SavedGameStore("legacy_games")
+    compressed = SavedGameStore("compressed_games")
+    os.makedirs(legacy.directory)
+    for i in range(args.games):
+        save_data = {"name": f"Game {i}", "description": "", "timestamp": f"2024-01-01T00:00:{i:06d}", "game_state": state}
+        with open(legacy.path(f"game_{i}.json"), "w") as f:
+            json.dump(save_data, f, indent=4)
+        compressed.save(f"Game {i}", "", state)
+
+    results = {
+        "games_written": {
+            "legacy": sum(1 for name in os.listdir(legacy.directory) if name.endswith(".json")),
+            "compressed": sum(1 for name in os.listdir(compressed.directory) if name.endswith(".bingo")),
+        },
+        "average_file_bytes": {
+            "legacy": average_size(legacy.directory, ".json"),
+            "compressed": average_size(compressed.directory, ".bingo"),
+        },
+        "list_ms": {
+            "legacy_scan": summarize(timed(lambda: legacy_scan(legacy.directory), repeat=3)),
+        },
+    }
+    os.remove(compressed.path(".index.json"))
+    start = time.perf_counter()
+    compressed.list_games()
+    results["list_ms"]["index_cold"] = round((time.perf_counter() - start) * 1000, 3)
+    results["list_ms"]["index_warm"] = summarize(timed(compressed.list_games))
+
+    legacy_file = sorted(os.listdir(legacy.directory))[0]
+    compressed_file = compressed.list_games()[0]["filename"]
+    results["load_ms"] = {
+        "legacy": summarize(timed(lambda: legacy.load(legacy_file))),
+        "compressed": summarize(timed(lambda: compressed.load(compressed_file))),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
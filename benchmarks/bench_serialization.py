@@ -0,0 +1,156 @@
+"""Bytes on the wire and serialization CPU time of the largest payloads, before and after.
+
+Payloads, per ``--cards`` count:
+
+- get_cards: the ``/card/api/get_cards`` response
+- generate_cards: the ``/card/api/generate_cards`` response (every card)
+- game_state: the ``game_state`` Socket.IO event (the full state); its
+  ``wire_bytes`` apply to long-polling clients, websocket frames are sent
+  uncompressed
+- game_state_file: ``game_state.json`` on disk (encode and parse)
+- saved_game: the gzipped state inside a ``.bingo`` save (encode plus gzip)
+
+"before" is what the app did previously: Flask's stdlib provider (sorted
+keys, ASCII escapes) for HTTP, stdlib ``json`` for Socket.IO and saves,
+``indent=4`` for game_state.json, nothing compressed on the wire. "after"
+is ``app.json_codec``; ``wire_bytes`` is the body as sent to a client that
+accepts gzip (or brotli when installed). Timings are the best of
+``--repeat`` runs.
+
+    python -m benchmarks.bench_serialization --cards 100 1000 10000 --output serialization.json
+"""
+import argparse
+import gzip
+import json
+import os
+
+from benchmarks.common import make_cards, make_tracks, summarize, timed, use_scratch_dir
+
+
+def best_ms(func, repeat):
+    return summarize(timed(func, repeat))["min_ms"]
+
+
+def game(num_cards, num_tracks=2000):
+    tracks = make_tracks(num_tracks)
+    return {
+        "played_tracks": tracks[:num_tracks // 4],
+        "unplayed_tracks": tracks[num_tracks // 4:],
+        "cards": make_cards(tracks, num_cards),
+        "bingo_mode": "rowcoldiag",
+        "current_playlist": "bench",
+        "num_tracks": num_tracks,
+        "version": 1,
+    }
+
+
+def wire(payload, repeat):
+    """Compressed size and time as sent by ``init_compression``."""
+    from app.json_codec import COMPRESSION_THRESHOLD, brotli, compress
+
+    if len(payload) < COMPRESSION_THRESHOLD:
+        return {"wire_bytes": len(payload), "compress_ms": 0.0}
+    encoding = "br" if brotli is not None else "gzip"
+    return {
+        "encoding": encoding,
+        "wire_bytes": len(compress(payload, encoding)),
+        "compress_ms": best_ms(lambda: compress(payload, encoding), repeat),
+    }
+
+
+def http_before(obj):
+    # Flask's DefaultJSONProvider outside debug mode
+    return json.dumps(obj, separators=(",", ":"), sort_keys=True, ensure_ascii=True).encode("utf-8")
+
+
+def compare(name, obj, encode_before, repeat):
+    from app.json_codec import dumpb
+
+    before = encode_before(obj)
+    after = dumpb(obj)
+    return {
+        "payload": name,
+        "before": {"bytes": len(before), "wire_bytes": len(before), "encode_ms": best_ms(lambda: encode_before(obj), repeat)},
+        "after": {"bytes": len(after), "encode_ms": best_ms(lambda: dumpb(obj), repeat), **wire(after, repeat)},
+    }
+
+
+def saved_game(state, repeat):
+    """Saves were already gzipped, at the default level 9; now at the codec's GZIP_LEVEL."""
+    from app.json_codec import compress, dumpb
+
+    def encode_before():
+        return json.dumps(state, separators=(",", ":")).encode("utf-8")
+
+    def save_before():
+        return gzip.compress(encode_before())
+
+    def save_after():
+        return compress(dumpb(state), "gzip")
+    return {
+        "payload": "saved_game",
+        "before": {"bytes": len(save_before()), "encode_ms": best_ms(save_before, repeat)},
+        "after": {"bytes": len(save_after()), "encode_ms": best_ms(save_after, repeat)},
+    }
+
+
+def state_file(state, repeat):
+    from app.json_codec import dump_file, load_file
+
+    def write_before():
+        with open("before.json", "w") as f:
+            json.dump(state, f, indent=4)
+
+    def read_before():
+        with open("before.json") as f:
+            return json.load(f)
+    write_before()
+    dump_file(state, "after.json")
+    return {
+        "payload": "game_state_file",
+        "before": {
+            "bytes": os.path.getsize("before.json"),
+            "encode_ms": best_ms(write_before, repeat),
+            "decode_ms": best_ms(read_before, repeat),
+        },
+        "after": {
+            "bytes": os.path.getsize("after.json"),
+            "encode_ms": best_ms(lambda: dump_file(state, "after.json"), repeat),
+            "decode_ms": best_ms(lambda: load_file("after.json"), repeat),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    use_scratch_dir()
+    from app.json_codec import orjson
+
+    results = []
+    for num_cards in args.cards:
+        state = game(num_cards)
+        cards = state["cards"]
+        rows = [
+            compare("get_cards", {"cards": cards}, http_before, args.repeat),
+            compare("generate_cards", {"message": f"Generated {num_cards} cards", "cards": cards}, http_before, args.repeat),
+            compare("game_state", state, lambda obj: json.dumps(obj, separators=(",", ":")).encode("utf-8"), args.repeat),
+            state_file(state, args.repeat),
+            saved_game(state, args.repeat),
+        ]
+        for row in rows:
+            row["cards"] = num_cards
+            print(json.dumps(row), flush=True)
+        results.extend(rows)
+    if output:
+        with open(output, "w") as f:
+            json.dump({"orjson": orjson is not None, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Concurrency benchmark for the Socket.IO server in each serving mode.
+
+Starts ``app.py`` in a subprocess for every mode, connects hundreds of
+simulated Socket.IO clients (python-socketio client over websocket), and
+while they are connected drives concurrent HTTP requests. Reports per mode:
+
+- connections sustained: clients connected at the start and at the end
+- event round-trip latency percentiles (emit with acknowledgement)
+- broadcast fan-out latency (server-side delta to every display client)
+- HTTP request latency percentiles
+- server CPU seconds per connected client over the measurement window
+
+    python -m benchmarks.bench_server_modes --clients 300 --output server_modes.json
+
+Modes: ``development`` (threading, packet logging on), ``production-threading``
+and ``production`` (gevent or eventlet when installed, packet logging off).
+Requires ``python-socketio[client]``, ``websocket-client`` and ``psutil``.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import REPO_ROOT, percentile, use_scratch_dir
+
+MODES = {
+    "development": {"BINGO_SERVER_MODE": "development", "FLASK_DEBUG": "0"},
+    # Production settings on the threaded server, to separate logging cost from the worker type
+    "production-threading": {"BINGO_SERVER_MODE": "production", "BINGO_ASYNC_MODE": "threading"},
+    "production": {"BINGO_SERVER_MODE": "production"},
+}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(mode, port, workdir, extra_env=None):
+    env = dict(os.environ, BINGO_HOST="127.0.0.1", BINGO_PORT=str(port), PYTHONPATH=REPO_ROOT, **MODES[mode])
+    env.update(extra_env or {})
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_ROOT, "app.py")],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"Server for mode {mode} did not start")
+
+
+def server_cpu(server):
+    """User+system CPU seconds of the server, including a debug reloader's child process."""
+    total = 0.0
+    for proc in [server] + server.children(recursive=True):
+        try:
+            total += sum(proc.cpu_times()[:2])
+        except Exception:
+            pass
+    return total
+
+
+def seed_state(base_url):
+    """Load a realistic game so the server has something to serialize."""
+    import requests
+
+    requests.post(f"{base_url}/game/api/new_round", timeout=10)
+
+
+def run_mode(mode, args, workdir):
+    import psutil
+    import requests
+    import socketio
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    proc = start_server(mode, port, workdir)
+    server = psutil.Process(proc.pid)
+    clients, received = [], []
+    try:
+        seed_state(base_url)
+
+        def connect(i):
+            client = socketio.Client(reconnection=False)
+            arrivals = []
+
+            @client.on("state_delta")
+            def on_delta(data):
+                arrivals.append(time.perf_counter())
+
+            try:
+                client.connect(base_url, transports=["websocket"], wait_timeout=10)
+                client.emit("join", {"room": "display"})
+                return client, arrivals
+            except Exception:
+                return None, arrivals
+
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            for client, arrivals in pool.map(connect, range(args.clients)):
+                if client:
+                    clients.append(client)
+                    received.append(arrivals)
+        connected_at_start = len(clients)
+        time.sleep(1)
+
+        cpu_start = server_cpu(server)
+        wall_start = time.perf_counter()
+
+        # Round trips: every client emits with an acknowledgement
+        rtts = []
+        rtt_lock = threading.Lock()
+
+        def round_trips(client):
+            for _ in range(args.events):
+                start = time.perf_counter()
+                try:
+                    client.call("check_bingo", {"card_id": "100"}, timeout=10)
+                except Exception:
+                    continue
+                with rtt_lock:
+                    rtts.append(time.perf_counter() - start)
+
+        # HTTP load running alongside the socket traffic
+        http_latencies = []
+
+        def http_load(_):
+            session = requests.Session()
+            for _ in range(args.http_requests // args.http_concurrency):
+                start = time.perf_counter()
+                try:
+                    session.get(f"{base_url}/dashboard/api/dashboard_stats", timeout=10)
+                except Exception:
+                    continue
+                http_latencies.append(time.perf_counter() - start)
+
+        with ThreadPoolExecutor(max_workers=64) as pool:
+            futures = [pool.submit(round_trips, c) for c in clients]
+            futures += [pool.submit(http_load, i) for i in range(args.http_concurrency)]
+            for future in futures:
+                future.result()
+
+        # Broadcast fan-out: one server-side delta reaching every display client
+        fanout = []
+        for _ in range(args.broadcasts):
+            for arrivals in received:
+                arrivals.clear()
+            start = time.perf_counter()
+            requests.post(f"{base_url}/game/api/new_round", timeout=10)
+            deadline = time.time() + 10
+            while time.time() < deadline and not all(received):
+                time.sleep(0.005)
+            fanout.extend(arrivals[0] - start for arrivals in received if arrivals)
+
+        wall = time.perf_counter() - wall_start
+        cpu = server_cpu(server) - cpu_start
+        connected_at_end = sum(1 for c in clients if c.connected)
+
+        def pcts(values):
+            if not values:
+                return None
+            return {f"p{p}": round(percentile(values, p) * 1000, 2) for p in (50, 90, 99)}
+
+        return {
+            "clients_requested": args.clients,
+            "connected_at_start": connected_at_start,
+            "connected_at_end": connected_at_end,
+            "event_rtt_ms": pcts(rtts),
+            "broadcast_fanout_ms": pcts(fanout),
+            "http_latency_ms": pcts(http_latencies),
+            "http_requests": len(http_latencies),
+            "server_cpu_seconds": round(cpu, 3),
+            "server_cpu_ms_per_client": round(cpu * 1000 / max(connected_at_end, 1), 3),
+            "server_cpu_utilization": round(cpu / wall, 3),
+        }
+    finally:
+        # Stop the server first: a graceful client-side disconnect waits for the close handshake
+        proc.terminate()
+        proc.wait(timeout=10)
+        for client in clients:
+            try:
+                client.disconnect()
+            except Exception:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--events", type=int, default=10, help="acknowledged emits per client")
+    parser.add_argument("--broadcasts", type=int, default=10)
+    parser.add_argument("--http-requests", type=int, default=2000)
+    parser.add_argument("--http-concurrency", type=int, default=20)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    workdir = use_scratch_dir()
+    results = {}
+    for mode in args.modes:
+        print(f"Running {mode} with {args.clients} clients...", file=sys.stderr)
+        results[mode] = run_mode(mode, args, workdir)
+    print(json.dumps(results, indent=2))
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Startup time of the server with small and large saved game states.
+
+Writes a ``game_state.json`` of each size into a scratch directory, starts
+``app.py`` on it and polls until the first request is served. Reports per
+state size (median of ``--runs`` starts):
+
+- first_request_ms: launch to the first answered page that needs no game state
+- first_state_ms: launch to the first answered dashboard snapshot, which
+  needs the saved state to be loaded
+- state_file_mb: size of the saved state
+
+    python -m benchmarks.bench_startup --cards 100 10000 --runs 3 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.bench_server_modes import MODES, free_port
+from benchmarks.common import REPO_ROOT, make_cards, make_tracks, use_scratch_dir
+
+
+def write_state(path, num_cards, num_tracks):
+    tracks = make_tracks(num_tracks)
+    state = {
+        "played_tracks": tracks[:num_tracks // 4],
+        "unplayed_tracks": tracks[num_tracks // 4:],
+        "cards": make_cards(tracks, num_cards),
+        "bingo_mode": "rowcoldiag",
+        "current_playlist": "bench",
+        "num_tracks": num_tracks,
+        "version": 1,
+    }
+    with open(path, "w") as f:
+        json.dump(state, f, indent=4)
+    return os.path.getsize(path)
+
+
+def wait_for(session, url, start, deadline):
+    """Milliseconds from ``start`` until ``url`` answers 200."""
+    while time.perf_counter() < deadline:
+        try:
+            if session.get(url, timeout=30).status_code == 200:
+                return (time.perf_counter() - start) * 1000
+        except Exception:
+            pass
+        time.sleep(0.01)
+    raise RuntimeError(f"{url} did not answer in time")
+
+
+def start_once(mode, workdir):
+    import requests
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, BINGO_HOST="127.0.0.1", BINGO_PORT=str(port), PYTHONPATH=REPO_ROOT, **MODES[mode])
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_ROOT, "app.py")],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        session = requests.Session()
+        deadline = start + 120
+        first_request = wait_for(session, f"{base_url}/auth/", start, deadline)
+        first_state = wait_for(session, f"{base_url}/dashboard/api/snapshot", start, deadline)
+        return first_request, first_state
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, nargs="+", default=[100, 10000])
+    parser.add_argument("--tracks", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--mode", default="production-threading", choices=list(MODES))
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    workdir = use_scratch_dir()
+    results = []
+    for num_cards in args.cards:
+        size = write_state(os.path.join(workdir, "game_state.json"), num_cards, args.tracks)
+        runs = [start_once(args.mode, workdir) for _ in range(args.runs)]
+        results.append({
+            "cards": num_cards,
+            "state_file_mb": round(size / 1e6, 1),
+            "first_request_ms": round(statistics.median(run[0] for run in runs), 1),
+            "first_state_ms": round(statistics.median(run[1] for run in runs), 1),
+        })
+        print(json.dumps(results[-1]), flush=True)
+    if output:
+        with open(output, "w") as f:
+            json.dump({"mode": args.mode, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
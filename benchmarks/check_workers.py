@@ -0,0 +1,162 @@
+"""Multi-process check: several server workers run one game together.
+
+Starts ``--workers`` copies of ``app.py`` on one scratch directory with the
+shared state store (``BINGO_SHARED_STATE=1``) and a Socket.IO message queue
+(the file queue by default, or ``--queue redis://...``). Display clients and
+one host client connect to every worker; the hosts then play tracks
+concurrently, each through its own worker. Checks that:
+
+- every client received a ``track_played`` delta for every play, whichever
+  worker handled it
+- each display client's ``seq`` numbers are gap-free and unique
+- no track was played twice and every worker reports the same final state
+
+Exits non-zero if any check fails. Reports the delivery latency from the
+play call to the last client receiving its delta.
+
+    python -m benchmarks.check_workers --workers 3 --displays 5 --plays 30
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_server_modes import MODES, free_port, start_server
+from benchmarks.bench_startup import write_state
+from benchmarks.common import percentile, use_scratch_dir
+
+
+class Listener:
+    """A Socket.IO client in one room that records the state deltas it receives."""
+
+    def __init__(self, base_url, room):
+        import socketio
+
+        self.client = socketio.Client(reconnection=False)
+        self.deltas = []
+        self.received_at = {}
+        joined = threading.Event()
+        self.client.on("room_joined", lambda data: joined.set())
+        self.client.on("state_delta", self.on_delta)
+        self.client.connect(base_url, transports=["websocket"], wait_timeout=10)
+        self.client.emit("join", {"room": room})
+        if not joined.wait(10):
+            raise RuntimeError(f"Could not join {room} on {base_url}")
+
+    def on_delta(self, delta):
+        self.deltas.append(delta)
+        for change in delta["changes"]:
+            if change["type"] == "track_played":
+                self.received_at[change["track"]["id"]] = time.perf_counter()
+
+    def played(self):
+        return set(self.received_at)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--displays", type=int, default=5, help="display clients per worker")
+    parser.add_argument("--plays", type=int, default=30)
+    parser.add_argument("--cards", type=int, default=100)
+    parser.add_argument("--mode", default="production", choices=list(MODES))
+    parser.add_argument("--queue", help="message queue URL (default: a file queue in the scratch directory)")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    workdir = use_scratch_dir()
+    import requests
+
+    write_state(os.path.join(workdir, "game_state.json"), args.cards, max(200, args.plays * 2))
+    with open(os.path.join(workdir, "game_state.json")) as f:
+        state = json.load(f)
+    initial_played = len(state["played_tracks"])
+    track_ids = [track["id"] for track in state["unplayed_tracks"][:args.plays]]
+
+    queue = args.queue or f"file://{os.path.join(workdir, 'socketio_queue')}"
+    procs, urls, listeners = [], [], []
+    try:
+        for i in range(args.workers):
+            port = free_port()
+            procs.append(start_server(args.mode, port, workdir, {
+                "BINGO_SHARED_STATE": "1",
+                "SOCKETIO_MESSAGE_QUEUE": queue,
+                "EVENT_LOG_DIR": os.path.join(workdir, f"events_{i}"),
+                # Only the first worker writes autosave checkpoints
+                "AUTOSAVE_INTERVAL": "60" if i == 0 else "0",
+            }))
+            urls.append(f"http://127.0.0.1:{port}")
+        hosts = [Listener(url, "host") for url in urls]
+        displays = [Listener(url, "display") for url in urls for _ in range(args.displays)]
+        listeners = hosts + displays
+
+        sent_at = {}
+
+        def play_through(host_index):
+            host = hosts[host_index]
+            for track_id in track_ids[host_index::args.workers]:
+                sent_at[track_id] = time.perf_counter()
+                host.client.call("play_track", {"track_id": track_id}, timeout=10)
+
+        with ThreadPoolExecutor(args.workers) as pool:
+            list(pool.map(play_through, range(args.workers)))
+
+        expected = set(track_ids)
+        deadline = time.time() + 15
+        while time.time() < deadline and any(listener.played() != expected for listener in listeners):
+            time.sleep(0.05)
+
+        failures = []
+        for index, listener in enumerate(listeners):
+            missing = expected - listener.played()
+            if missing:
+                failures.append(f"client {index} missed {len(missing)} of {len(expected)} plays")
+        for index, display in enumerate(displays):
+            seqs = sorted(delta["seq"] for delta in display.deltas)
+            if seqs and seqs != list(range(seqs[0], seqs[0] + len(seqs))):
+                failures.append(f"display {index} got seq numbers with gaps or duplicates: {seqs}")
+        session = requests.Session()
+        for url in urls:
+            played = session.get(f"{url}/playback/api/played_tracks", timeout=10).json()["played_tracks"]
+            played_ids = [track["id"] for track in played]
+            if len(played_ids) != len(set(played_ids)):
+                failures.append(f"{url} has tracks played twice")
+            if len(played_ids) != initial_played + len(track_ids):
+                failures.append(f"{url} reports {len(played_ids)} played tracks, expected {initial_played + len(track_ids)}")
+
+        delivery = [
+            max(listener.received_at.get(track_id, 0) for listener in listeners) - sent_at[track_id]
+            for track_id in track_ids
+        ]
+        results = {
+            "workers": args.workers,
+            "clients": len(listeners),
+            "plays": len(track_ids),
+            "queue": "file" if not args.queue else args.queue.split(":", 1)[0],
+            "delivery_ms": {f"p{p}": round(percentile(delivery, p) * 1000, 1) for p in (50, 90, 99)},
+            "failures": failures,
+        }
+    finally:
+        for listener in listeners:
+            try:
+                listener.client.disconnect()
+            except Exception:
+                pass
+        for proc in procs:
+            proc.terminate()
+            proc.wait(timeout=10)
+    print(json.dumps(results, indent=2))
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+    if results["failures"]:
+        sys.exit(1)
+    print(f"OK: all {len(listeners)} clients on {args.workers} workers saw all {len(track_ids)} plays")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Shared helpers for the offline benchmarks.
+
+Benchmarks are run from the repository root as modules, e.g.
+``python -m benchmarks.bench_room_fanout``. They switch to a scratch
+directory before importing the app so the real ``game_state.json``,
+``playlists.json`` and ``saved_games/`` are never touched.
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def use_scratch_dir():
+    """Chdir into a fresh temp directory; call before importing ``app``."""
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    workdir = tempfile.mkdtemp(prefix="bingo-bench-")
+    os.chdir(workdir)
+    return workdir
+
+
+def make_tracks(count, seed=42):
+    """Fake Spotify tracks in the shape stored in the game state."""
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"track{i:05d}{rng.randint(0, 9999):04d}",
+            "name": f"Song number {i}",
+            "artist": f"Artist {rng.randint(1, 500)}",
+        }
+        for i in range(count)
+    ]
+
+
+def make_cards(tracks, num_cards, seed=42):
+    """Cards in the game state format; ids are not limited to three digits here."""
+    rng = random.Random(seed)
+    return {
+        str(1000 + i): {
+            "tracks": rng.sample(tracks, 25),
+            "bingo_status": "Not checked",
+            "matches": [],
+        }
+        for i in range(num_cards)
+    }
+
+
+def timed(func, repeat=5):
+    """Run ``func`` ``repeat`` times and return per-run seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summarize(timings):
+    return {
+        "min_ms": round(min(timings) * 1000, 3),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "max_ms": round(max(timings) * 1000, 3),
+    }
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
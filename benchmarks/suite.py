@@ -0,0 +1,261 @@
+"""Offline benchmark suite for the hot paths, at growing card counts.
+
+Runs every case against the real app modules in a scratch directory and
+writes machine-readable results; with ``--baseline`` it compares them
+against a stored run and exits non-zero on a regression.
+
+Cases (each at every ``--scales`` card count):
+
+- generate_cards: ``build_cards``, the body of ``api_generate_cards``
+- check_card: ``game_state.set_card_matches`` recomputing a card from the
+  played tracks, as ``api_check_card`` does (includes saving the state when the card changed)
+- summarize_cards: ``card_status.summarize_card_statuses`` over all cards
+- update_state / get_state: ``ThreadSafeGameState`` write (bump + save)
+  and full copy
+- list_saved_games: ``SavedGameStore.list_games`` over 20 saves of that
+  size, from a cold index and a warm one
+- generate_pdf: ``BingoCardPDF.generate`` for all cards
+- game_state_payload: size and encode time of the ``game_state`` socket
+  event, and of one 50-card ``game_state_page``
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --threshold 0.25
+    python -m benchmarks.suite --cases check_card get_state --scales 1000 10000
+
+Timings are machine dependent: record a baseline on the machine that
+checks against it (``--output benchmarks/baseline.json``).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.common import REPO_ROOT, make_cards, make_tracks, summarize, use_scratch_dir
+
+SCALES = (10, 100, 1000, 10000)
+NUM_TRACKS = 2000
+SAVED_GAMES = 20
+# Metrics compared against the baseline: best-of-n timings, which are far steadier than
+# medians on a busy machine, and sizes, so payload growth shows up too
+COMPARED = ("min_ms", "cold_min_ms", "warm_min_ms", "payload_bytes", "page_bytes")
+
+
+def measure(func, repeat, budget):
+    """Per-run seconds of ``func``: ``repeat`` runs, fewer if they exceed ``budget`` seconds (at least one)."""
+    timings = []
+    spent = 0.0
+    while len(timings) < repeat and (not timings or spent < budget):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+        spent += timings[-1]
+    return timings
+
+
+def game(num_cards, seed=42):
+    """A game a quarter of the way through, with ``num_cards`` cards."""
+    tracks = make_tracks(NUM_TRACKS, seed)
+    played = tracks[:NUM_TRACKS // 4]
+    cards = make_cards(tracks, num_cards, seed)
+    played_ids = {track["id"] for track in played}
+    for card in cards.values():
+        card["matches"] = [pos for pos, track in enumerate(card["tracks"]) if track["id"] in played_ids]
+    return {
+        "played_tracks": played,
+        "unplayed_tracks": tracks[NUM_TRACKS // 4:],
+        "cards": cards,
+        "bingo_mode": "rowcoldiag",
+        "current_playlist": "bench",
+        "num_tracks": NUM_TRACKS,
+        "version": 1,
+    }
+
+
+def load_game(state):
+    from app.state import game_state
+
+    def replace(live):
+        live.clear()
+        live.update(state)
+    game_state.update_state(replace)
+
+
+def case_generate_cards(num_cards, args):
+    from app.card_routes import build_cards
+
+    if num_cards > 900:
+        return {"skipped": "build_cards gives out three-digit card ids, so at most 900 cards"}
+    tracks = make_tracks(NUM_TRACKS)
+    return summarize(measure(lambda: build_cards(tracks, num_cards), args.repeat, args.budget))
+
+
+def case_check_card(num_cards, args):
+    from app.state import game_state
+
+    state = game(num_cards)
+    load_game(state)
+    card_ids = random.Random(1).choices(list(state["cards"]), k=args.repeat)
+    checks = iter(card_ids)
+    return summarize(measure(lambda: game_state.set_card_matches(next(checks)), args.repeat, args.budget))
+
+
+def case_summarize_cards(num_cards, args):
+    from app.card_status import summarize_card_statuses
+
+    state = game(num_cards)
+    return summarize(measure(
+        lambda: summarize_card_statuses(state["cards"], state["played_tracks"]), args.repeat, args.budget,
+    ))
+
+
+def case_update_state(num_cards, args):
+    from app.state import game_state
+
+    load_game(game(num_cards))
+    return summarize(measure(lambda: game_state.update_state(lambda state: None), args.repeat, args.budget))
+
+
+def case_get_state(num_cards, args):
+    from app.state import game_state
+
+    load_game(game(num_cards))
+    return summarize(measure(game_state.get_state, args.repeat, args.budget))
+
+
+def case_list_saved_games(num_cards, args):
+    from app.saved_games import INDEX_FILE, SavedGameStore
+
+    directory = os.path.abspath(f"saved_games_{num_cards}")
+    shutil.rmtree(directory, ignore_errors=True)
+    store = SavedGameStore(directory)
+    state = game(num_cards)
+    for i in range(SAVED_GAMES):
+        store.save(f"Game {i}", "benchmark", state, filename=f"game_{i:03d}.bingo")
+
+    def cold():
+        os.remove(store.path(INDEX_FILE))
+        store.list_games()
+    store.list_games()
+    cold_timings = measure(cold, args.repeat, args.budget)
+    warm_timings = measure(store.list_games, args.repeat, args.budget)
+    shutil.rmtree(directory, ignore_errors=True)
+    result = {"saves": SAVED_GAMES}
+    for name, timings in (("cold", cold_timings), ("warm", warm_timings)):
+        summary = summarize(timings)
+        result[f"{name}_min_ms"] = summary["min_ms"]
+        result[f"{name}_median_ms"] = summary["median_ms"]
+    return result
+
+
+def case_generate_pdf(num_cards, args):
+    from app.pdf_generator import BingoCardPDF
+
+    cards = game(num_cards)["cards"]
+    result = summarize(measure(
+        lambda: BingoCardPDF(cards, view_url="http://localhost:1313/card/view/{card_id}").generate(),
+        args.repeat, args.budget,
+    ))
+    result["per_card_ms"] = round(result["median_ms"] / num_cards, 3)
+    return result
+
+
+def case_game_state_payload(num_cards, args):
+    from app.json_codec import dumpb
+    from app.state import game_state
+
+    load_game(game(num_cards))
+    state = game_state.get_state()
+    # game_state_page carries the played tracks and one page of cards, not the unplayed pool
+    page = dict(state, cards=dict(list(state["cards"].items())[:50]), remaining_count=len(state["unplayed_tracks"]))
+    del page["unplayed_tracks"]
+    # Encoded as Socket.IO sends it, with the app's JSON codec
+    result = summarize(measure(lambda: dumpb(game_state.get_state()), args.repeat, args.budget))
+    result["payload_bytes"] = len(dumpb(state))
+    result["page_bytes"] = len(dumpb(page))
+    return result
+
+
+CASES = {
+    name[len("case_"):]: func for name, func in globals().items() if name.startswith("case_")
+}
+
+
+def compare(results, baseline, threshold):
+    """Rows of (case, scale, metric, baseline, current, change) whose change exceeds ``threshold``."""
+    regressions = []
+    for case, scales in results.items():
+        for scale, metrics in scales.items():
+            before = baseline.get(case, {}).get(scale)
+            if not before:
+                continue
+            for metric in COMPARED:
+                if metric in metrics and before.get(metric):
+                    change = metrics[metric] / before[metric] - 1
+                    if change > threshold:
+                        regressions.append((case, scale, metric, before[metric], metrics[metric], change))
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True,
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES), help="card counts")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case and scale")
+    parser.add_argument("--budget", type=float, default=5.0, help="stop repeating a case after this many seconds")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before failing, 0.2 = 20%%")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+    use_scratch_dir()
+    results = {}
+    for case in args.cases:
+        results[case] = {}
+        for num_cards in args.scales:
+            # JSON object keys are strings, so scales are stored as strings too
+            results[case][str(num_cards)] = metrics = CASES[case](num_cards, args)
+            print(json.dumps({"case": case, "cards": num_cards, **metrics}), flush=True)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline["results"], args.threshold)
+        for case, scale, metric, before, after, change in regressions:
+            print(f"REGRESSION {case} @ {scale} cards: {metric} {before} -> {after} (+{change:.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
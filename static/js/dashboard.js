@@ -2,9 +2,18 @@
 let socket = null;
 const dashboardState = {
     isConnected: false,
-    fallbackPollingInterval: null
+    fallbackPolling: false,
+    snapshotEtag: null,
+    version: null,
+    cardsEtag: null,
+    cardsLoaded: 0,
+    cardIds: '',
+    winners: []
 };
 
+// Cards fetched per page for the card grid; more are loaded as the grid scrolls
+const CARDS_PAGE_SIZE = 40;
+
 const socketConfig = {
     reconnection: true,
     reconnectionAttempts: 5,
@@ -21,13 +30,12 @@ function initializeWebSocket() {
         console.log('Connected to websocket');
         dashboardState.isConnected = true;
         updateConnectionStatus('Connected');
+        // The host room receives every state delta and job progress event
+        socket.emit('join', { room: 'host' });
         forceUpdateAll();
-        socket.emit('request_game_state');
+        requestResync();
         // Stop fallback polling if running
-        if (dashboardState.fallbackPollingInterval) {
-            clearInterval(dashboardState.fallbackPollingInterval);
-            dashboardState.fallbackPollingInterval = null;
-        }
+        dashboardState.fallbackPolling = false;
     });
 
     socket.on('disconnect', (reason) => {
@@ -49,6 +57,23 @@ function initializeWebSocket() {
         updateDashboardUIFromState(data);
     });
 
+    socket.on('game_state_page', (page) => {
+        console.log('Socket: Game state resync received', page);
+        handleGameStatePage(page);
+    });
+
+    socket.on('state_delta', (delta) => {
+        applyStateDelta(delta);
+    });
+
+    socket.on('card_status_batch', (batch) => {
+        handleCardStatusBatch(batch);
+    });
+
+    socket.on('near_wins', (leaderboard) => {
+        renderNearWins(leaderboard);
+    });
+
     socket.on('new_track', (data) => {
         console.log('Socket: New track event received', data);
         handleNewTrack(data);
@@ -60,19 +85,60 @@ function initializeWebSocket() {
     });
 }
 
-// Start fallback polling if the WebSocket is not connected.
-// The interval here is set to 30 seconds.
-function startFallbackPolling() {
-    if (!dashboardState.fallbackPollingInterval) {
-        console.log('Starting fallback polling (every 30 seconds) because socket is disconnected.');
-        dashboardState.fallbackPollingInterval = setInterval(async () => {
-            try {
-                await forceUpdateAll();
-            } catch (error) {
-                console.error('Error during fallback update:', error);
-            }
-        }, 30000);
+// Start fallback polling if the WebSocket is not connected. This long-polls
+// the snapshot endpoint: the server holds the request until the game state
+// changes and answers 304 when nothing did, so an idle dashboard costs little.
+async function startFallbackPolling() {
+    if (dashboardState.fallbackPolling) return;
+    console.log('Starting fallback long-polling because socket is disconnected.');
+    dashboardState.fallbackPolling = true;
+    while (dashboardState.fallbackPolling) {
+        try {
+            await pollSnapshot(25);
+        } catch (error) {
+            console.error('Error during fallback update:', error);
+            await new Promise(resolve => setTimeout(resolve, 5000));
+        }
+    }
+}
+
+async function pollSnapshot(waitSeconds) {
+    const headers = {};
+    if (dashboardState.snapshotEtag) {
+        headers['If-None-Match'] = dashboardState.snapshotEtag;
+    }
+    const response = await fetch(`/dashboard/api/snapshot?wait=${waitSeconds}`, { headers, cache: 'no-store' });
+    if (response.status === 304) return;
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    dashboardState.snapshotEtag = response.headers.get('ETag');
+    applySnapshot(await response.json());
+}
+
+function applySnapshot(snapshot) {
+    dashboardState.version = snapshot.version;
+    setWinners(snapshot.winners);
+    renderPlaylists(snapshot.playlists);
+    renderPlayedTracks(snapshot.played_tracks);
+    updateElement('numTracks', snapshot.stats.remaining_tracks);
+    updateElement('playedTracks', snapshot.stats.played_tracks);
+    updateElement('totalCards', snapshot.stats.total_cards);
+    updateStatisticsDisplay(snapshot.stats);
+
+    // Update cards in place; only rebuild the grid when the set of cards changed
+    const shownIds = Array.from(document.querySelectorAll('.card-container'))
+        .map(el => el.getAttribute('data-card-id'));
+    const snapshotIds = Object.keys(snapshot.cards);
+    const sameCards = shownIds.length === snapshotIds.length &&
+        snapshotIds.every(cardId => shownIds.includes(cardId));
+    if (!sameCards) {
+        loadCards();
+        return;
     }
+    Object.entries(snapshot.cards).forEach(([cardId, card]) => {
+        updateCardDisplay(cardId, card.bingo_status, card.matches);
+    });
 }
 
 // Force update all components by making AJAX calls.
@@ -84,6 +150,7 @@ async function forceUpdateAll() {
             loadDevices(),
             loadPlayedTracks(),
             loadCards(),
+            loadNearWins(),
             updateGameStats(),
             updateDashboardData()
         ]);
@@ -108,6 +175,109 @@ function updateDashboardUIFromState(state) {
     // you can compute them here or add additional event handling.
 }
 
+// Ask the server for a compact resync (counts and played tracks, no cards).
+function requestResync() {
+    if (socket && socket.connected) {
+        socket.emit('request_game_state', { cards_offset: 0, cards_limit: 0 });
+    }
+}
+
+function handleGameStatePage(page) {
+    dashboardState.version = page.version;
+    setWinners(page.winners);
+    updateElement('numTracks', page.remaining_count);
+    updateElement('playedTracks', page.played_tracks.length);
+    updateElement('totalCards', page.total_cards);
+    renderPlayedTracks(page.played_tracks);
+    loadCards();
+    updateGameStats();
+}
+
+// Apply a versioned delta. Deltas must arrive in order; on a gap we resync.
+function applyStateDelta(delta) {
+    if (dashboardState.version !== null && delta.version <= dashboardState.version) {
+        return;  // Already applied
+    }
+    if (dashboardState.version === null || delta.version !== dashboardState.version + 1) {
+        console.log(`State version gap (have ${dashboardState.version}, got ${delta.version}), resyncing`);
+        requestResync();
+        return;
+    }
+    dashboardState.version = delta.version;
+    delta.changes.forEach(change => {
+        switch (change.type) {
+            case 'track_played':
+                updateElement('playedTracks', change.played_count);
+                updateElement('numTracks', change.remaining_count);
+                updateElement('playedTracksCount', change.played_count);
+                updateElement('remainingTracksCount', change.remaining_count);
+                prependPlayedTrack(change.track, change.played_count);
+                break;
+            case 'card_matches':
+                updateCardDisplay(change.card_id, change.status, change.matches);
+                break;
+            case 'winner':
+                if (!dashboardState.winners.includes(change.card_id)) {
+                    setWinners(dashboardState.winners.concat([change.card_id]));
+                }
+                showSuccess(`BINGO! Card ${change.card_id} has won!`);
+                break;
+            case 'cards_regenerated':
+                updateElement('totalCards', change.total_cards);
+                loadCards();
+                loadNearWins();
+                break;
+            case 'reset':
+                requestResync();
+                loadNearWins();
+                break;
+        }
+    });
+}
+
+// The cards that have bingo; new ones are announced by their 'winner' delta, not here
+function setWinners(winners) {
+    dashboardState.winners = winners || [];
+    updateElement('bingoCount', dashboardState.winners.length);
+}
+
+// Card changes from a track play arrive batched, with one shared summary.
+function handleCardStatusBatch(batch) {
+    Object.entries(batch.items).forEach(([cardId, change]) => {
+        updateCardDisplay(cardId, change.status, change.matches);
+    });
+    if (batch.summary) {
+        setWinners(batch.summary.winners);
+    }
+}
+
+// Cards one or two cells from bingo, nearest first, for the host to build suspense
+function renderNearWins(leaderboard) {
+    const listElem = document.getElementById('nearWinsList');
+    if (!listElem) return;
+    listElem.innerHTML = '';
+    if (!leaderboard.closest.length) {
+        listElem.innerHTML = '<li class="text-gray-500">No cards close to bingo yet</li>';
+        return;
+    }
+    leaderboard.closest.forEach(({ card_id, away }) => {
+        const li = document.createElement('li');
+        li.className = 'flex justify-between';
+        const label = away === 0 ? 'BINGO!' : `${away} away`;
+        li.innerHTML = `<button class="hover:text-blue-600" onclick="showCardModal('${card_id}')">Card ${card_id}</button>
+            <span class="${away === 0 ? 'text-green-600 font-bold' : 'text-gray-600'}">${label}</span>`;
+        listElem.appendChild(li);
+    });
+}
+
+async function loadNearWins() {
+    try {
+        renderNearWins(await fetchJSON('/card/api/near_wins'));
+    } catch (error) {
+        console.error('Error loading near wins:', error);
+    }
+}
+
 // Standard DOMContentLoaded initialization
 document.addEventListener('DOMContentLoaded', () => {
     if (typeof io !== 'undefined') {
@@ -152,9 +322,15 @@ document.addEventListener('DOMContentLoaded', () => {
 });
 
 // Card Management Functions
-function showCardModal(cardId) {
-    const card = document.querySelector(`[data-card-id="${cardId}"]`).closest('.card-container');
-    const modalContent = createCardModalContent(cardId, card._cardData);
+async function showCardModal(cardId) {
+    const card = document.querySelector(`[data-card-id="${cardId}"]`)?.closest('.card-container');
+    const cardData = card ? card._cardData : {};
+    // The grid only holds matches and status (and may not have paged this card in yet)
+    if (!cardData.tracks) {
+        const data = await fetchJSON(`/card/api/get_cards?ids=${encodeURIComponent(cardId)}&fields=tracks,matches,bingo_status`);
+        Object.assign(cardData, data.cards[cardId] || { tracks: [] });
+    }
+    const modalContent = createCardModalContent(cardId, cardData);
     
     const modal = document.createElement('div');
     modal.className = 'fixed inset-0 bg-black bg-opacity-50 flex items-center justify-center z-50';
@@ -163,14 +339,14 @@ function showCardModal(cardId) {
             <div class="flex justify-between items-center mb-4">
                 <div>
                     <h2 class="text-2xl font-bold">Card ${cardId}</h2>
-                    <p class="text-gray-600">${card._cardData.matches?.length || 0} matches</p>
+                    <p class="text-gray-600">${cardData.matches?.length || 0} matches</p>
                 </div>
                 <button class="text-gray-600 hover:text-gray-800 text-xl" onclick="this.closest('.fixed').remove()">×</button>
             </div>
             ${modalContent}
             <div class="mt-4 flex justify-end">
                 <button onclick="validateCard('${cardId}')" 
-                        class="${card._cardData.bingo_status === 'BINGO!' ? 'bg-green-500' : 'bg-blue-500'} text-white px-4 py-2 rounded hover:opacity-90">
+                        class="${cardData.bingo_status === 'BINGO!' ? 'bg-green-500' : 'bg-blue-500'} text-white px-4 py-2 rounded hover:opacity-90">
                     Check Card
                 </button>
             </div>
@@ -308,20 +484,25 @@ async function validateCardPosition(cardId, trackId, position) {
 async function loadPlaylists() {
     try {
         const data = await fetchJSON('/playlist/api/get_playlists');
-        const sel = document.getElementById('playlistSelect');
-        sel.innerHTML = '';
-        data.playlists.forEach(pl => {
-            const opt = document.createElement('option');
-            opt.value = pl.id;
-            opt.textContent = pl.name;
-            if (pl.is_default) opt.selected = true;
-            sel.appendChild(opt);
-        });
+        renderPlaylists(data.playlists);
     } catch (error) {
         console.error('Error loading playlists:', error);
     }
 }
 
+function renderPlaylists(playlists) {
+    const sel = document.getElementById('playlistSelect');
+    const selected = sel.value;
+    sel.innerHTML = '';
+    playlists.forEach(pl => {
+        const opt = document.createElement('option');
+        opt.value = pl.id;
+        opt.textContent = pl.name;
+        if (selected ? pl.id === selected : pl.is_default) opt.selected = true;
+        sel.appendChild(opt);
+    });
+}
+
 async function loadDevices() {
     try {
         const data = await fetchJSON('/device/api/get_devices');
@@ -349,51 +530,118 @@ async function loadDevices() {
 async function loadPlayedTracks() {
     try {
         const data = await fetchJSON('/playback/api/played_tracks');
-        const listElem = document.getElementById('playedTracksList');
-        listElem.innerHTML = '';
-        
-        // Reverse the array to show newest tracks first
-        const reversedTracks = [...data.played_tracks].reverse();
-        
-        reversedTracks.forEach((t, index) => {
-            const li = document.createElement('li');
-            li.className = 'py-1 px-2 hover:bg-gray-50 rounded';
-            li.innerHTML = `
-                <span class="text-gray-500">#${data.played_tracks.length - index}.</span>
-                <span class="font-medium">${t.artist}</span> - 
-                <span>${t.name}</span>
-            `;
-            listElem.appendChild(li);
-        });
+        renderPlayedTracks(data.played_tracks);
     } catch (error) {
         console.error('Error loading played tracks:', error);
     }
 }
 
+function createPlayedTrackItem(track, number) {
+    const li = document.createElement('li');
+    li.className = 'py-1 px-2 hover:bg-gray-50 rounded';
+    li.innerHTML = `
+        <span class="text-gray-500">#${number}.</span>
+        <span class="font-medium">${track.artist}</span> - 
+        <span>${track.name}</span>
+    `;
+    return li;
+}
+
+function renderPlayedTracks(playedTracks) {
+    const listElem = document.getElementById('playedTracksList');
+    listElem.innerHTML = '';
+
+    // Reverse the array to show newest tracks first
+    const reversedTracks = [...playedTracks].reverse();
+
+    reversedTracks.forEach((t, index) => {
+        listElem.appendChild(createPlayedTrackItem(t, playedTracks.length - index));
+    });
+}
+
+function prependPlayedTrack(track, number) {
+    const listElem = document.getElementById('playedTracksList');
+    if (listElem) {
+        listElem.prepend(createPlayedTrackItem(track, number));
+    }
+}
+
+// Fetch one page of cards with only what the grid shows; resolves to null on 304
+async function fetchCardsPage(limit, cursor = null, etag = null) {
+    let url = `/card/api/get_cards?fields=matches,bingo_status&limit=${limit}`;
+    if (cursor) {
+        url += `&cursor=${encodeURIComponent(cursor)}`;
+    }
+    const response = await fetch(url, { headers: etag ? { 'If-None-Match': etag } : {} });
+    if (response.status === 304) {
+        return null;
+    }
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    const data = await response.json();
+    data.etag = response.headers.get('ETag');
+    return data;
+}
+
+function appendCardsPage(gridContainer, cards) {
+    Object.entries(cards).forEach(([cardId, cardData]) => {
+        // Ensure cardData has all required properties
+        cardData.bingo_status = cardData.bingo_status || 'Not checked';
+        cardData.matches = cardData.matches || [];
+        gridContainer.appendChild(createBingoCardDisplay(cardId, cardData));
+    });
+    dashboardState.cardsLoaded = gridContainer.children.length;
+}
+
+// Load the next page when the end of the grid scrolls into view
+function setCardsCursor(cardsContainer, gridContainer, cursor) {
+    cardsContainer.querySelector('.cards-more')?.remove();
+    if (!cursor) return;
+    const sentinel = document.createElement('div');
+    sentinel.className = 'cards-more text-center text-gray-500 text-sm py-2';
+    sentinel.textContent = 'Loading more cards...';
+    cardsContainer.appendChild(sentinel);
+    const observer = new IntersectionObserver(async (entries) => {
+        if (!entries.some(entry => entry.isIntersecting)) return;
+        observer.disconnect();
+        try {
+            const data = await fetchCardsPage(CARDS_PAGE_SIZE, cursor);
+            appendCardsPage(gridContainer, data.cards);
+            setCardsCursor(cardsContainer, gridContainer, data.next_cursor);
+        } catch (error) {
+            console.error('Error loading more cards:', error);
+        }
+    }, { root: cardsContainer });
+    observer.observe(sentinel);
+}
+
 async function loadCards() {
     console.log('Loading cards...');
     try {
-        const data = await fetchJSON('/card/api/get_cards');
+        // Refetch as many cards as are already shown, and nothing if the state has not moved
+        const limit = Math.max(CARDS_PAGE_SIZE, dashboardState.cardsLoaded);
+        const data = await fetchCardsPage(limit, null, dashboardState.cardsEtag);
+        if (!data) return;
         console.log('Received cards data:', data);
         const cardsContainer = document.getElementById('cardsContainer');
         if (cardsContainer && data.cards) {
+            dashboardState.cardsEtag = data.etag;
             cardsContainer.innerHTML = '';
             // Add grid container
             const gridContainer = document.createElement('div');
             gridContainer.className = 'grid grid-cols-1 sm:grid-cols-2 md:grid-cols-3 lg:grid-cols-4 gap-4';
-            
-            Object.entries(data.cards).forEach(([cardId, cardData]) => {
-                // Ensure cardData has all required properties
-                cardData.bingo_status = cardData.bingo_status || 'Not checked';
-                cardData.matches = cardData.matches || [];
-                gridContainer.appendChild(createBingoCardDisplay(cardId, cardData));
-            });
-            
+            appendCardsPage(gridContainer, data.cards);
             cardsContainer.appendChild(gridContainer);
+            setCardsCursor(cardsContainer, gridContainer, data.next_cursor);
             console.log('Cards display updated');
-            
-            // Automatically validate all cards after loading
-            await validateAllCards();
+
+            // Validate the shown cards when a different set of cards was loaded
+            const cardIds = Object.keys(data.cards).join(',');
+            if (cardIds !== dashboardState.cardIds) {
+                dashboardState.cardIds = cardIds;
+                await validateAllCards();
+            }
         }
     } catch (error) {
         console.error('Error loading cards:', error);
@@ -566,8 +814,11 @@ function setupPlaybackControls() {
             try {
                 const res = await fetchJSON('/playback/api/play', { method: 'POST' });
                 showSuccess(`Playing: ${res.track.artist} - ${res.track.name}`);
-                await loadPlayedTracks();
-                await loadCards();
+                // With a live socket the track_played delta updates the lists
+                if (!dashboardState.isConnected) {
+                    await loadPlayedTracks();
+                    await loadCards();
+                }
             } catch (error) {
                 showError(error.message);
             }
@@ -683,26 +934,63 @@ function createBingoCardDisplay(cardId, cardData) {
 
 
 async function handleDownloadPdf() {
+    const msgEl = document.getElementById('cardsMsg');
     try {
-        const response = await fetch('/card/api/download_cards_pdf');
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
+        const res = await fetchJSON('/card/api/download_cards_pdf', { method: 'POST' });
+        const job = await waitForJob(res.job.job_id, (update) => {
+            if (msgEl) {
+                msgEl.textContent = `Rendering PDF... ${Math.round(update.progress * 100)}%`;
+            }
+        });
+        if (msgEl) msgEl.textContent = '';
+        if (job.status !== 'finished') {
+            throw new Error(job.error || `PDF job ${job.status}`);
         }
-        const blob = await response.blob();
-        const url = window.URL.createObjectURL(blob);
         const a = document.createElement('a');
         a.style.display = 'none';
-        a.href = url;
+        a.href = `/jobs/api/${job.job_id}/download`;
         a.download = 'bingo_cards.pdf';
         document.body.appendChild(a);
         a.click();
-        window.URL.revokeObjectURL(url);
+        a.remove();
     } catch (error) {
         console.error('Error downloading PDF:', error);
+        if (msgEl) msgEl.textContent = '';
         showError('Failed to download the PDF. Please try again.');
     }
 }
 
+// Resolve once a background job reaches a final state. Progress arrives over
+// the socket; when it is not connected we fall back to polling the jobs API.
+function waitForJob(jobId, onProgress) {
+    const finalStatuses = ['finished', 'failed', 'cancelled'];
+    return new Promise((resolve) => {
+        let pollTimer = null;
+        const done = (job) => {
+            if (pollTimer) clearInterval(pollTimer);
+            if (socket) socket.off('job_progress', onSocketProgress);
+            resolve(job);
+        };
+        const handleUpdate = (job) => {
+            if (job.job_id !== jobId) return;
+            if (onProgress) onProgress(job);
+            if (finalStatuses.includes(job.status)) done(job);
+        };
+        const onSocketProgress = (job) => handleUpdate(job);
+        if (socket) socket.on('job_progress', onSocketProgress);
+        pollTimer = setInterval(async () => {
+            if (dashboardState.isConnected) return;
+            try {
+                handleUpdate(await fetchJSON(`/jobs/api/${jobId}`));
+            } catch (error) {
+                console.error('Error polling job status:', error);
+            }
+        }, 1000);
+        // The job may already be done before the socket listener was attached.
+        fetchJSON(`/jobs/api/${jobId}`).then(handleUpdate).catch(() => {});
+    });
+}
+
 function updateConnectionStatus(status) {
     const statusEl = document.getElementById('connectionStatus');
     if (statusEl) {
@@ -886,10 +1174,11 @@ function setupDashboardUpdates() {
 async function validateAllCards() {
     console.log('Validating all cards...');
     try {
-        const state = await fetchJSON('/card/api/get_cards');
-        if (!state.cards) return;
-        
-        const validationPromises = Object.keys(state.cards).map(cardId => validateCard(cardId));
+        // Only the cards loaded into the grid
+        const cardIds = [...document.querySelectorAll('#cardsContainer .card-container')]
+            .map(card => card.getAttribute('data-card-id'));
+
+        const validationPromises = cardIds.map(cardId => validateCard(cardId));
         await Promise.all(validationPromises);
         await updateGameStats();
         console.log('All cards validated');
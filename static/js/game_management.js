@@ -22,6 +22,53 @@ class GameManagement {
         if (savedGamesSelect) {
             savedGamesSelect.addEventListener('focus', () => this.loadSavedGames());
         }
+
+        const btnRestoreCheckpoint = document.getElementById('btnRestoreCheckpoint');
+        if (btnRestoreCheckpoint) {
+            btnRestoreCheckpoint.addEventListener('click', () => this.restoreCheckpoint());
+        }
+
+        const checkpointsSelect = document.getElementById('checkpointsSelect');
+        if (checkpointsSelect) {
+            checkpointsSelect.addEventListener('focus', () => this.loadCheckpoints());
+        }
+    }
+
+    async loadCheckpoints() {
+        try {
+            const response = await this.fetchJSON('/game_management/api/checkpoints');
+            const checkpointsSelect = document.getElementById('checkpointsSelect');
+            checkpointsSelect.innerHTML = '<option value="">Latest checkpoint</option>';
+
+            response.checkpoints.forEach(checkpoint => {
+                const option = document.createElement('option');
+                option.value = checkpoint.filename;
+                const date = new Date(checkpoint.timestamp).toLocaleString();
+                option.textContent = `${date} (${checkpoint.description})`;
+                checkpointsSelect.appendChild(option);
+            });
+        } catch (error) {
+            showError('Failed to load checkpoints: ' + error.message);
+        }
+    }
+
+    async restoreCheckpoint() {
+        const filename = document.getElementById('checkpointsSelect').value;
+        if (!confirm('Replace the current game with this checkpoint?')) {
+            return;
+        }
+
+        try {
+            const response = await this.fetchJSON('/game_management/api/restore_checkpoint', {
+                method: 'POST',
+                body: JSON.stringify(filename ? { filename } : {})
+            });
+
+            showSuccess(`Checkpoint restored: ${response.checkpoint.description}`);
+            await this.forceFullUpdate();
+        } catch (error) {
+            showError('Failed to restore checkpoint: ' + error.message);
+        }
     }
 
     async saveGame() {
@@ -105,7 +152,8 @@ class GameManagement {
         // Wait a short moment for the cards to load before validating
         setTimeout(async () => {
             try {
-                const cardsResponse = await this.fetchJSON('/card/api/get_cards');
+                // Card ids only, without their tracks
+                const cardsResponse = await this.fetchJSON('/card/api/get_cards?fields=');
                 if (cardsResponse.cards) {
                     const validationPromises = Object.keys(cardsResponse.cards).map(cardId => 
                         this.fetchJSON(`/card/api/check_card/${cardId}`)
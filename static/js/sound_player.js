@@ -11,7 +11,8 @@ class SoundPlayer {
             // Initialize Web Audio API
             this.initializeAudioContext();
             
-            const response = await fetch('/sound/api/list_sounds');
+            // One request describes every sound; the versioned URLs it returns are cached for good
+            const response = await fetch('/sound/api/manifest');
             const data = await response.json();
             if (data.sounds) {
                 await this.createSoundButtons(data.sounds);
@@ -50,7 +51,7 @@ class SoundPlayer {
             const audio = new Audio();
             audio.preload = 'auto';
             const sourceElement = document.createElement('source');
-            sourceElement.src = `/sound/api/sounds/${sound.filename}`;
+            sourceElement.src = sound.url;
             sourceElement.type = sound.mime_type;
             audio.appendChild(sourceElement);
 